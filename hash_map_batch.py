@@ -0,0 +1,164 @@
+# Course: CS261 - Data Structures
+# Description: Batch hashing of many keys at once. batch_hash computes the
+#              hashes of a whole DynamicArray (or sequence) of keys with
+#              vectorized NumPy code and batch_index turns them into bucket
+#              indices. Results are identical to calling the scalar hash
+#              functions and HashMap index computations one key at a time,
+#              so they can be mixed freely with the existing maps. NumPy is
+#              optional: without it, and for hash functions that have no
+#              vectorized version, the scalar functions are used.
+
+
+from hash_map_include import (DynamicArray, FIBONACCI_MULTIPLIER,
+                              fnv1a_hash, hash_function_1, hash_function_2,
+                              mix_hash)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Largest code point, used to check that weighted sums fit in 63 bits
+_MAX_CODE_POINT = 0x10FFFF
+
+
+def as_list(items) -> list:
+    """
+    Returns the items of a DynamicArray or any sequence as a list.
+    """
+    if isinstance(items, DynamicArray):
+        return [items[index] for index in range(items.length())]
+    return list(items)
+
+
+def _code_points(keys: list):
+    """
+    Returns an (n, longest key) uint32 matrix of the keys' code points,
+    padded with zeros. Zero code points add nothing to the sample hash
+    functions, so padding does not change their sums.
+    """
+    width = max(1, max(len(key) for key in keys))
+    return np.array(keys, dtype=f'<U{width}').view(np.uint32).reshape(len(keys), width)
+
+
+def _utf8_words(keys: list, word_size: int) -> tuple:
+    """
+    Encodes the keys as UTF-8 and returns a tuple of the byte lengths and
+    an (n, padded width) uint8 matrix of the bytes, zero padded to a
+    multiple of word_size.
+    """
+    encoded = [key.encode('utf-8') for key in keys]
+    lengths = np.array([len(data) for data in encoded], dtype=np.uint64)
+    width = max(word_size, -(-int(lengths.max()) // word_size) * word_size)
+    matrix = np.array(encoded, dtype=f'S{width}').view(np.uint8).reshape(len(keys), width)
+    return lengths, matrix
+
+
+def _batch_hash_function_1(keys: list):
+    """Vectorized hash_function_1: sum of code points."""
+    return _code_points(keys).sum(axis=1, dtype=np.uint64)
+
+
+def _batch_hash_function_2(keys: list):
+    """Vectorized hash_function_2: code points weighted by position."""
+    points = _code_points(keys)
+    width = points.shape[1]
+    if _MAX_CODE_POINT * width * (width + 1) // 2 >= 2 ** 63:
+        return None
+    weights = np.arange(1, width + 1, dtype=np.uint64)
+    return (points.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def _batch_fnv1a_hash(keys: list):
+    """Vectorized fnv1a_hash, one byte column at a time across all keys."""
+    lengths, matrix = _utf8_words(keys, 1)
+    prime = np.uint64(0x100000001B3)
+    hashes = np.full(len(keys), 0xCBF29CE484222325, dtype=np.uint64)
+    for column in range(matrix.shape[1]):
+        active = lengths > column
+        mixed = (hashes ^ matrix[:, column].astype(np.uint64)) * prime
+        hashes = np.where(active, mixed, hashes)
+    return hashes
+
+
+def _fmix64(hashes):
+    """Vectorized hash_map_include._fmix64."""
+    hashes = hashes ^ (hashes >> np.uint64(33))
+    hashes = hashes * np.uint64(0xFF51AFD7ED558CCD)
+    hashes = hashes ^ (hashes >> np.uint64(33))
+    hashes = hashes * np.uint64(0xC4CEB9FE1A85EC53)
+    return hashes ^ (hashes >> np.uint64(33))
+
+
+def _batch_mix_hash(keys: list):
+    """Vectorized mix_hash, one 64-bit word column at a time."""
+    lengths, matrix = _utf8_words(keys, 8)
+    words = matrix.view('<u8')
+    word_counts = (lengths + np.uint64(7)) // np.uint64(8)
+    hashes = lengths * np.uint64(0xC4CEB9FE1A85EC53)
+    for column in range(words.shape[1]):
+        active = word_counts > column
+        mixed = (hashes ^ words[:, column]) * np.uint64(0xFF51AFD7ED558CCD)
+        mixed = mixed ^ (mixed >> np.uint64(32))
+        hashes = np.where(active, mixed, hashes)
+    return _fmix64(hashes ^ lengths)
+
+
+# Vectorized versions of the hash functions in hash_map_include
+_BATCH_FUNCTIONS = {
+    hash_function_1: _batch_hash_function_1,
+    hash_function_2: _batch_hash_function_2,
+    fnv1a_hash: _batch_fnv1a_hash,
+    mix_hash: _batch_mix_hash,
+}
+
+
+def batch_hash(keys, function) -> DynamicArray:
+    """
+    Returns the hashes of all keys, equal to calling function on each key.
+    :param keys:        DynamicArray or sequence of string keys
+    :param function:    hash function to apply
+    :return:            DynamicArray of integer hashes in key order
+    """
+    keys = as_list(keys)
+    hashes = None
+    if np is not None and keys and function in _BATCH_FUNCTIONS:
+        with np.errstate(over='ignore'):
+            hashes = _BATCH_FUNCTIONS[function](keys)
+
+    if hashes is None:
+        return DynamicArray([function(key) for key in keys])
+    return DynamicArray(hashes.tolist())
+
+
+def batch_index(hashes, capacity: int, power_of_two: bool = False) -> DynamicArray:
+    """
+    Returns the bucket index of every hash in a table of the given capacity,
+    equal to the index HashMap computes: hash % capacity, or Fibonacci
+    hashing when power_of_two is True.
+    :param hashes:          DynamicArray or sequence of integer hashes
+    :param capacity:        integer representing table capacity
+    :param power_of_two:    True for power-of-two capacity tables
+    :return:                DynamicArray of integer bucket indices
+    """
+    hashes = as_list(hashes)
+    shift = 65 - capacity.bit_length()
+
+    if np is None or not hashes or min(hashes) < 0 or max(hashes) >= 2 ** 64:
+        if power_of_two:
+            return DynamicArray([((hash * FIBONACCI_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> shift
+                                 for hash in hashes])
+        return DynamicArray([hash % capacity for hash in hashes])
+
+    values = np.array(hashes, dtype=np.uint64)
+    if power_of_two:
+        # A shift of 64 bits is undefined for uint64, and a table of one
+        # bucket has only index 0
+        if shift >= 64:
+            return DynamicArray([0] * len(hashes))
+        with np.errstate(over='ignore'):
+            values = (values * np.uint64(FIBONACCI_MULTIPLIER)) >> np.uint64(shift)
+    else:
+        values = values % np.uint64(capacity)
+    return DynamicArray(values.tolist())
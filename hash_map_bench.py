@@ -0,0 +1,638 @@
+# Course: CS261 - Data Structures
+# Description: Benchmarks for the hash maps. Run as a script with the name
+#              of a benchmark, for example:
+#                  python hash_map_bench.py capacity --size 1000000
+#              capacity   - prime modulus vs power-of-two Fibonacci
+#                           hashing and prime ladder vs prime search
+#              collisions - chain and probe length distributions of the
+#                           hash functions on realistic key sets
+#              wal        - write-ahead log throughput for fsync batch
+#                           sizes, replay and compaction
+#              suite      - throughput and latency percentiles of both maps
+#                           across sizes, hash functions and workloads,
+#                           written as JSON
+#              compare    - regressions between two suite JSON files
+#              The module can also be run as python -m hash_map_bench.
+
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from itertools import islice, permutations
+
+import hash_map_oa
+import hash_map_sc
+import hash_map_wal
+from hash_map_include import (DynamicArray, HASH_FUNCTIONS, fibonacci_index,
+                              grow_prime, make_seeded_hash, next_power_of_two,
+                              next_prime)
+
+
+def crc32_hash(key: str) -> int:
+    """
+    Well distributed hash computed in C, so that benchmarks of the table
+    itself are not dominated by collisions from the sample hash functions.
+    """
+    return zlib.crc32(key.encode())
+
+
+def make_keys(size: int) -> DynamicArray:
+    """
+    Returns a DynamicArray of size distinct string keys.
+    :param size:    integer representing number of keys
+    :return:        DynamicArray of keys
+    """
+    return DynamicArray(['key' + str(i) for i in range(size)])
+
+
+def _timed(function, *args) -> float:
+    """
+    Calls function with the given arguments and returns elapsed seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _trial_division_next_prime(capacity: int) -> int:
+    """
+    The original prime search of both maps, kept as a baseline: odd
+    candidates tested by trial division.
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+    while True:
+        factor, prime = 3, capacity > 2
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                prime = False
+                break
+            factor += 2
+        if prime:
+            return capacity
+        capacity += 2
+
+
+# ------------------- CAPACITY POLICY -------------------------------------- #
+
+def bench_capacity(size: int) -> DynamicArray:
+    """
+    Compares the prime and power-of-two capacity policies at the given size:
+    bucket index computation for size hashes, computing every capacity of a
+    table growing to size, and building and querying both maps.
+    :param size:    integer representing number of keys
+    :return:        DynamicArray of (benchmark, policy, seconds) tuples
+    """
+    results = DynamicArray()
+    keys = make_keys(size)
+    hashes = [crc32_hash(keys[i]) for i in range(size)]
+
+    prime_capacity = grow_prime(size)
+    power_capacity = next_power_of_two(2 * size)
+
+    def index_prime():
+        for hash in hashes:
+            hash % prime_capacity
+
+    def index_power_of_two():
+        for hash in hashes:
+            fibonacci_index(hash, power_capacity)
+
+    results.append(('index', 'prime', _timed(index_prime)))
+    results.append(('index', 'power_of_two', _timed(index_power_of_two)))
+
+    def grow_search():
+        capacity = 11
+        while capacity < size:
+            capacity = _trial_division_next_prime(2 * capacity)
+
+    def grow_ladder():
+        capacity = 11
+        while capacity < size:
+            capacity = grow_prime(capacity)
+
+    def grow_power_of_two():
+        capacity = 16
+        while capacity < size:
+            capacity = 2 * capacity
+
+    results.append(('grow', 'prime_search', _timed(grow_search)))
+    results.append(('grow', 'prime_ladder', _timed(grow_ladder)))
+    results.append(('grow', 'power_of_two', _timed(grow_power_of_two)))
+
+    maps = (
+        ('sc', 'prime', lambda: hash_map_sc.HashMap(11, crc32_hash)),
+        ('sc', 'power_of_two',
+         lambda: hash_map_sc.HashMap(11, crc32_hash, power_of_two=True)),
+        ('oa', 'prime', lambda: hash_map_oa.HashMap(11, crc32_hash)),
+        ('oa', 'power_of_two',
+         lambda: hash_map_oa.HashMap(11, crc32_hash, power_of_two=True)),
+    )
+    for name, policy, make_map in maps:
+        m = make_map()
+
+        def put_all():
+            for i in range(size):
+                m.put(keys[i], i)
+
+        def get_all():
+            for i in range(size):
+                m.get(keys[i])
+
+        results.append((name + '_put', policy, _timed(put_all)))
+        results.append((name + '_get', policy, _timed(get_all)))
+
+    return results
+
+
+# ------------------- HASH FUNCTION QUALITY -------------------------------- #
+
+def make_key_set(kind: str, size: int, seed: int = 0) -> DynamicArray:
+    """
+    Returns a DynamicArray of size distinct keys of the given kind:
+    sequential - 'str0', 'str1', ... as used by the examples
+    anagram    - permutations of the same letters
+    words      - random lowercase words of 4 to 12 letters
+    session    - 'session:' followed by 32 random hex digits
+    :param kind:    string naming the key set
+    :param size:    integer representing number of keys
+    :param seed:    integer seed for the random key sets
+    :return:        DynamicArray of keys
+    """
+    rng = random.Random(seed)
+    if kind == 'sequential':
+        return DynamicArray(['str' + str(i) for i in range(size)])
+    if kind == 'anagram':
+        letters = 'abcdefghijkl'
+        return DynamicArray([''.join(p) for p in islice(permutations(letters), size)])
+
+    keys = set()
+    while len(keys) < size:
+        if kind == 'words':
+            length = rng.randint(4, 12)
+            keys.add(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz')
+                             for _ in range(length)))
+        elif kind == 'session':
+            keys.add('session:' + '%032x' % rng.getrandbits(128))
+        else:
+            raise ValueError(f"unknown key set: {kind!r}")
+    return DynamicArray(sorted(keys))
+
+
+def _percentile(sorted_values: list, fraction: float) -> int:
+    """
+    Returns the value at the given fraction of a sorted list.
+    """
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def collision_report(keys: DynamicArray, function) -> dict:
+    """
+    Measures how well a hash function spreads the given keys.
+    Separate chaining is measured at load factor 1.0 and open addressing
+    (quadratic probing) at load factor 0.5, both with prime capacities.
+    :param keys:        DynamicArray of string keys
+    :param function:    hash function to measure
+    :return:            dictionary of distribution statistics
+    """
+    size = keys.length()
+    hashes = [function(keys[i]) for i in range(size)]
+
+    # Chain lengths with one bucket per key
+    capacity = next_prime(size)
+    chains = [0] * capacity
+    for hash in hashes:
+        chains[hash % capacity] += 1
+
+    # Length of the chain each key sits in, as seen by a lookup
+    chain_lengths = sorted(chains[hash % capacity] for hash in hashes)
+
+    # Probe lengths when inserting every key into a half full table
+    capacity = next_prime(2 * size)
+    occupied = bytearray(capacity)
+    probes = []
+    for hash in hashes:
+        index = hash % capacity
+        new_index, j = index, 0
+        while occupied[new_index]:
+            j += 1
+            new_index = (index + j ** 2) % capacity
+        occupied[new_index] = 1
+        probes.append(j + 1)
+    probes.sort()
+
+    return {
+        'distinct_hashes': len(set(hashes)),
+        'empty_buckets': chains.count(0) / len(chains),
+        'chain_mean': sum(chain_lengths) / size,
+        'chain_p99': _percentile(chain_lengths, 0.99),
+        'chain_max': chain_lengths[-1],
+        'probe_mean': sum(probes) / size,
+        'probe_p99': _percentile(probes, 0.99),
+        'probe_max': probes[-1],
+    }
+
+
+def bench_collisions(size: int) -> DynamicArray:
+    """
+    Runs collision_report for every registered hash function and a seeded
+    hash on every key set.
+    :param size:    integer representing number of keys per key set
+    :return:        DynamicArray of (key set, function name, report) tuples
+    """
+    functions = dict(HASH_FUNCTIONS)
+    functions['seeded_hash'] = make_seeded_hash(b'hash_map_bench!!')
+
+    results = DynamicArray()
+    for kind in ('sequential', 'anagram', 'words', 'session'):
+        keys = make_key_set(kind, size)
+        for name, function in functions.items():
+            results.append((kind, name, collision_report(keys, function)))
+    return results
+
+
+def print_collisions(results: DynamicArray) -> None:
+    """
+    Prints the collision reports as an aligned table.
+    """
+    print(f"{'keys':<11} {'function':<16} {'distinct':>8} {'empty':>6} "
+          f"{'chain':>6} {'c_p99':>5} {'c_max':>5} "
+          f"{'probe':>7} {'p_p99':>5} {'p_max':>6}")
+    for index in range(results.length()):
+        kind, name, report = results[index]
+        print(f"{kind:<11} {name:<16} {report['distinct_hashes']:>8} "
+              f"{report['empty_buckets']:>6.2f} {report['chain_mean']:>6.2f} "
+              f"{report['chain_p99']:>5} {report['chain_max']:>5} "
+              f"{report['probe_mean']:>7.2f} {report['probe_p99']:>5} "
+              f"{report['probe_max']:>6}")
+
+
+# ------------------- WRITE-AHEAD LOG --------------------------------------- #
+
+def bench_wal(size: int, sync_batches: tuple = (1, 16, 256, 0)) -> DynamicArray:
+    """
+    Measures put throughput of hash_map_wal.HashMap for each fsync batch
+    size (0 leaves syncing to the operating system), then replaying the
+    log of size puts, compacting it, and reopening from the snapshot.
+    :param size:            integer representing number of puts
+    :param sync_batches:    sync_every values to compare
+    :return:                DynamicArray of (benchmark, variant, seconds)
+                            tuples
+    """
+    results = DynamicArray()
+    keys = make_keys(size)
+    directory = tempfile.mkdtemp()
+    try:
+        for sync_every in sync_batches:
+            path = os.path.join(directory, 'sync' + str(sync_every) + '.log')
+            m = hash_map_wal.HashMap(path, crc32_hash, sync_every=sync_every,
+                                     compact_every=None)
+
+            def put_all():
+                for i in range(size):
+                    m.put(keys[i], i)
+                m.sync()
+
+            results.append(('wal_put', 'sync_every=' + str(sync_every),
+                            _timed(put_all)))
+            m.close()
+
+        def reopen():
+            hash_map_wal.HashMap(path, crc32_hash, compact_every=None).close()
+
+        results.append(('wal_open', 'replay_log', _timed(reopen)))
+        m = hash_map_wal.HashMap(path, crc32_hash, compact_every=None)
+        results.append(('wal_compact', 'snapshot', _timed(m.compact)))
+        m.close()
+        results.append(('wal_open', 'snapshot', _timed(reopen)))
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+# ------------------- SUITE ------------------------------------------------- #
+
+SUITE_MAPS = {
+    'sc': hash_map_sc.HashMap,
+    'oa': hash_map_oa.HashMap,
+}
+SUITE_SIZES = (100, 1000, 10000, 100000, 1000000)
+SUITE_FUNCTIONS = ('hash_function_1', 'hash_function_2')
+SUITE_WORKLOADS = ('uniform', 'zipfian', 'churn')
+
+# Exponent of the Zipf distribution of the zipfian workload's lookups
+ZIPF_EXPONENT = 1.1
+
+
+def _run_phase(operation, arguments, budget: float) -> list:
+    """
+    Calls operation on each argument in turn, timing every call, and stops
+    early once the phase has run for budget seconds.
+    :param operation:   callable taking one argument
+    :param arguments:   iterable of arguments
+    :param budget:      float maximum seconds for the phase
+    :return:            list of integer latencies in nanoseconds
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(budget * 1e9)
+    for argument in arguments:
+        start = clock()
+        operation(argument)
+        end = clock()
+        latencies.append(end - start)
+        if end > deadline:
+            break
+    return latencies
+
+
+def _summarize(latencies: list) -> dict:
+    """
+    Returns the operation count, total seconds, throughput and p50, p99
+    and maximum latencies of a phase. Throughput is computed from the
+    timed calls only, excluding the loop around them.
+    """
+    ordered = sorted(latencies)
+    seconds = sum(ordered) / 1e9
+    return {
+        'ops': len(ordered),
+        'seconds': seconds,
+        'ops_per_sec': len(ordered) / seconds if seconds else 0.0,
+        'p50_ns': _percentile(ordered, 0.50),
+        'p99_ns': _percentile(ordered, 0.99),
+        'max_ns': ordered[-1] if ordered else 0,
+    }
+
+
+def _zipfian_keys(keys: list, count: int, rng: random.Random) -> list:
+    """
+    Returns count keys drawn from keys with Zipf distributed popularity,
+    the most popular keys chosen at random rather than by insertion order.
+    """
+    ranked = list(keys)
+    rng.shuffle(ranked)
+    weights, total = [], 0.0
+    for rank in range(1, len(ranked) + 1):
+        total += 1 / rank ** ZIPF_EXPONENT
+        weights.append(total)
+    return rng.choices(ranked, cum_weights=weights, k=count)
+
+
+def bench_case(map_name: str, function_name: str, workload: str, size: int,
+               budget: float = 10.0, seed: int = 0) -> list:
+    """
+    Runs one workload on an empty map that grows from its default capacity,
+    and measures each phase:
+    put     - inserting size new keys, including the resizes they cause
+    get     - size lookups of present keys, uniform or Zipf distributed;
+              after the churn phase for the churn workload
+    churn   - size steps at a constant size, each removing the oldest key,
+              adding a new key and looking up a random present key
+    miss    - size lookups of absent keys
+    resize  - doubling the loaded table's capacity once
+    remove  - removing every key in random order
+    A phase that exceeds budget seconds stops early, so later phases run
+    on the keys loaded so far; the put phase's ops give the size reached.
+    :param map_name:        key of SUITE_MAPS
+    :param function_name:   name of a hash function in HASH_FUNCTIONS
+    :param workload:        'uniform', 'zipfian' or 'churn'
+    :param size:            integer representing number of keys
+    :param budget:          float maximum seconds per phase
+    :param seed:            integer seed for the generated operations
+    :return:                list of result dictionaries, one per phase
+    """
+    if workload not in SUITE_WORKLOADS:
+        raise ValueError(f"unknown workload: {workload!r}")
+    rng = random.Random(seed)
+    m = SUITE_MAPS[map_name](11, HASH_FUNCTIONS[function_name])
+    keys = ['key' + str(i) for i in range(size)]
+    phases = []
+
+    latencies = _run_phase(lambda key: m.put(key, key), keys, budget)
+    phases.append(('put', latencies))
+    keys = keys[:len(latencies)]
+    if not keys:
+        keys = ['key0']
+        m.put('key0', 'key0')
+
+    if workload == 'churn':
+        live = list(keys)
+
+        def churn(step: int) -> None:
+            slot = step % len(live)
+            m.remove(live[slot])
+            live[slot] = 'churn' + str(step)
+            m.put(live[slot], step)
+            m.get(live[rng.randrange(len(live))])
+
+        phases.append(('churn', _run_phase(churn, range(size), budget)))
+        keys = live
+
+    if workload == 'zipfian':
+        lookups = _zipfian_keys(keys, size, rng)
+    else:
+        lookups = [keys[rng.randrange(len(keys))] for _ in range(size)]
+    phases.append(('get', _run_phase(m.get, lookups, budget)))
+
+    misses = ['miss' + str(i) for i in range(size)]
+    phases.append(('miss', _run_phase(m.get, misses, budget)))
+
+    phases.append(('resize', _run_phase(m.resize_table,
+                                        [2 * m.get_capacity()], budget)))
+
+    rng.shuffle(keys)
+    phases.append(('remove', _run_phase(m.remove, keys, budget)))
+
+    results = []
+    for operation, latencies in phases:
+        result = {'map': map_name, 'function': function_name,
+                  'workload': workload, 'size': size, 'operation': operation}
+        result.update(_summarize(latencies))
+        results.append(result)
+    return results
+
+
+def bench_suite(sizes=SUITE_SIZES, functions=SUITE_FUNCTIONS,
+                workloads=SUITE_WORKLOADS, maps=tuple(SUITE_MAPS),
+                budget: float = 10.0, seed: int = 0, progress=None) -> dict:
+    """
+    Runs bench_case for every combination of map, hash function, workload
+    and size.
+    :param sizes:       integer numbers of keys
+    :param functions:   names of hash functions in HASH_FUNCTIONS
+    :param workloads:   workload names
+    :param maps:        keys of SUITE_MAPS
+    :param budget:      float maximum seconds per phase
+    :param seed:        integer seed for the generated operations
+    :param progress:    callable given each case's results, or None
+    :return:            dictionary with the run's settings and environment
+                        under 'meta' and the result dictionaries under
+                        'results', ready to be written as JSON
+    """
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'budget': budget,
+            'seed': seed,
+        },
+        'results': [],
+    }
+    for map_name in maps:
+        for function_name in functions:
+            for workload in workloads:
+                for size in sizes:
+                    results = bench_case(map_name, function_name, workload,
+                                         size, budget, seed)
+                    report['results'].extend(results)
+                    if progress is not None:
+                        progress(results)
+    return report
+
+
+def print_suite(results: list) -> None:
+    """
+    Prints suite result dictionaries as an aligned table.
+    """
+    for result in results:
+        print(f"{result['map']:<3} {result['function']:<16} "
+              f"{result['workload']:<8} {result['size']:>8} "
+              f"{result['operation']:<7} {result['ops']:>8} ops "
+              f"{result['ops_per_sec']:>12.0f} ops/s "
+              f"p50 {result['p50_ns']:>9} ns  p99 {result['p99_ns']:>10} ns")
+
+
+def compare_suites(baseline: dict, current: dict,
+                   threshold: float = 1.2) -> list:
+    """
+    Finds regressions between two suite reports: phases whose throughput
+    fell, or whose p99 latency rose, by more than a factor of threshold.
+    Phases are matched by map, function, workload, size and operation.
+    :param baseline:    report returned by bench_suite
+    :param current:     later report returned by bench_suite
+    :param threshold:   float factor tolerated as noise
+    :return:            list of (result, metric, baseline value, current
+                        value) tuples
+    """
+    def case(result: dict) -> tuple:
+        return (result['map'], result['function'], result['workload'],
+                result['size'], result['operation'])
+
+    previous = {case(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(case(result))
+        if old is None:
+            continue
+        if result['ops_per_sec'] * threshold < old['ops_per_sec']:
+            regressions.append((result, 'ops_per_sec', old['ops_per_sec'],
+                                result['ops_per_sec']))
+        if result['p99_ns'] > old['p99_ns'] * threshold:
+            regressions.append((result, 'p99_ns', old['p99_ns'],
+                                result['p99_ns']))
+    return regressions
+
+
+# ------------------- COMMAND LINE ----------------------------------------- #
+
+def print_results(results: DynamicArray) -> None:
+    """
+    Prints (benchmark, variant, seconds) tuples as an aligned table.
+    """
+    for index in range(results.length()):
+        benchmark, variant, seconds = results[index]
+        print(f"{benchmark:<12} {variant:<16} {seconds:10.4f} s")
+
+
+def main(argv: list = None) -> int:
+    """
+    Runs the benchmark named on the command line.
+    :param argv:    list of command line arguments, or None for sys.argv
+    :return:        integer exit status, 1 if compare found regressions
+    """
+    parser = argparse.ArgumentParser(prog="hash_map_bench",
+                                     description="Hash map benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    capacity_parser = subparsers.add_parser(
+        "capacity", help="prime vs power-of-two capacity policies")
+    capacity_parser.add_argument("--size", type=int, default=1000000)
+
+    collisions_parser = subparsers.add_parser(
+        "collisions", help="hash function chain and probe lengths")
+    collisions_parser.add_argument("--size", type=int, default=10000)
+
+    wal_parser = subparsers.add_parser(
+        "wal", help="write-ahead log fsync batching, replay and compaction")
+    wal_parser.add_argument("--size", type=int, default=10000)
+
+    suite_parser = subparsers.add_parser(
+        "suite", help="SC and OA throughput and latency as JSON")
+    suite_parser.add_argument("--sizes", type=int, nargs="+",
+                              default=list(SUITE_SIZES))
+    suite_parser.add_argument("--functions", nargs="+",
+                              choices=sorted(HASH_FUNCTIONS),
+                              default=list(SUITE_FUNCTIONS))
+    suite_parser.add_argument("--workloads", nargs="+",
+                              choices=SUITE_WORKLOADS,
+                              default=list(SUITE_WORKLOADS))
+    suite_parser.add_argument("--maps", nargs="+", choices=sorted(SUITE_MAPS),
+                              default=list(SUITE_MAPS))
+    suite_parser.add_argument("--budget", type=float, default=10.0,
+                              help="maximum seconds per phase")
+    suite_parser.add_argument("--seed", type=int, default=0)
+    suite_parser.add_argument("--output", "-o",
+                              help="JSON file to write instead of stdout")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="regressions between two suite JSON files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=1.2)
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "capacity":
+        print_results(bench_capacity(args.size))
+    elif args.benchmark == "collisions":
+        print_collisions(bench_collisions(args.size))
+    elif args.benchmark == "wal":
+        print_results(bench_wal(args.size))
+    elif args.benchmark == "suite":
+        # The table goes to stdout only when the JSON does not
+        progress = print_suite if args.output else None
+        report = bench_suite(args.sizes, args.functions, args.workloads,
+                             args.maps, args.budget, args.seed, progress)
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(report, file, indent=1)
+        else:
+            json.dump(report, sys.stdout, indent=1)
+            print()
+    elif args.benchmark == "compare":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        regressions = compare_suites(baseline, current, args.threshold)
+        for result, metric, old, new in regressions:
+            print(f"{result['map']:<3} {result['function']:<16} "
+                  f"{result['workload']:<8} {result['size']:>8} "
+                  f"{result['operation']:<7} {metric:<11} "
+                  f"{old:>14.0f} -> {new:>14.0f}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
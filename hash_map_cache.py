@@ -0,0 +1,520 @@
+# Course: CS261 - Data Structures
+# Description: Defines class Cache, a bounded cache built on the separate
+#              chaining HashMap. The map's chain nodes are CacheNodes that
+#              are also linked into doubly linked lists that order them
+#              for eviction, so each key costs a single node and lookups,
+#              updates and evictions are all O(1). Three eviction policies are supported:
+#              lru  - evicts the least recently used key
+#              slru - segmented LRU: new keys enter a probation segment and
+#                     move to a protected segment when hit again, so keys
+#                     used once cannot flush out frequently used ones
+#              lfu  - evicts the least frequently used key, the least
+#                     recently used among equally frequent ones
+#              Entries may expire after a time to live; expired entries are
+#              removed lazily when they are next looked up. Hits, misses,
+#              evictions and expirations are counted.
+
+
+import time
+
+import hash_map_sc
+from hash_map_include import DynamicArray, SLNode, hash_function_1
+
+
+POLICIES = ('lru', 'slru', 'lfu')
+
+
+class CacheNode(SLNode):
+    """
+    Hash map chain node that is also a doubly linked list node in the
+    cache's eviction order
+    """
+
+    def __init__(self, key: str, value: object, next: SLNode = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key, value, next node of its chain and the
+        key's full hash. expires is the expiry time (None if the entry never
+        expires), prev_use and next_use link the node into the NodeList
+        owner, and frequency is its FrequencyNode under the lfu policy.
+        """
+        super().__init__(key, value, next, hash)
+        self.expires = None
+        self.prev_use = None
+        self.next_use = None
+        self.owner = None
+        self.frequency = None
+
+
+class CacheMap(hash_map_sc.HashMap):
+    """
+    Separate chaining HashMap whose chain nodes are CacheNodes
+    """
+
+    _node_class = CacheNode
+
+    def key_hash(self, key: str) -> int:
+        """
+        Returns the full hash of the given key.
+        """
+        return self._hash_function(key)
+
+    def find_node(self, key: str, hash: int) -> CacheNode:
+        """
+        Returns the node of the given key given its precomputed hash, or
+        None if the key is not in the map.
+        """
+        return self._buckets[self._index(hash)].contains(key, hash)
+
+    def add_node(self, key: str, hash: int, value: object) -> CacheNode:
+        """
+        Adds a key that is not in the map given its precomputed hash and
+        returns its new node.
+        """
+        node, _ = self._node_for(key, hash, value)
+        return node
+
+    def remove_node(self, node: CacheNode) -> None:
+        """
+        Removes the given node from the map without rehashing its key.
+        """
+        self._remove(node.key, node.hash)
+
+
+class NodeList:
+    """
+    Circular doubly linked list of CacheNodes around a sentinel node, most
+    recently added at the front
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty list."""
+        self._sentinel = CacheNode(None, None)
+        self._sentinel.prev_use = self._sentinel.next_use = self._sentinel
+        self._length = 0
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        nodes, node = [], self._sentinel.next_use
+        while node is not self._sentinel:
+            nodes.append(str(node))
+            node = node.next_use
+        return 'DLL [' + ' <-> '.join(nodes) + ']'
+
+    def length(self) -> int:
+        """Return the number of nodes in the list."""
+        return self._length
+
+    def push_front(self, node: CacheNode) -> None:
+        """Inserts a node that is not in any list at the front."""
+        sentinel = self._sentinel
+        node.prev_use, node.next_use = sentinel, sentinel.next_use
+        sentinel.next_use.prev_use = node
+        sentinel.next_use = node
+        node.owner = self
+        self._length += 1
+
+    def unlink(self, node: CacheNode) -> None:
+        """Removes a node of this list."""
+        node.prev_use.next_use = node.next_use
+        node.next_use.prev_use = node.prev_use
+        node.prev_use = node.next_use = node.owner = None
+        self._length -= 1
+
+    def back(self) -> CacheNode:
+        """Return the node at the back of the list, or None if empty."""
+        if self._length == 0:
+            return None
+        return self._sentinel.prev_use
+
+    def __iter__(self):
+        """Yields the nodes from front to back."""
+        node = self._sentinel.next_use
+        while node is not self._sentinel:
+            yield node
+            node = node.next_use
+
+
+class FrequencyNode:
+    """
+    Node of the lfu policy's list of use counts, holding the NodeList of
+    cache nodes used that many times
+    """
+
+    def __init__(self, count: int) -> None:
+        """Initialize node for the given use count."""
+        self.count = count
+        self.items = NodeList()
+        self.prev = None
+        self.next = None
+
+
+class Cache:
+    def __init__(self, capacity: int, function=hash_function_1,
+                 policy: str = 'lru', ttl: float = None,
+                 protected_ratio: float = 0.8, clock=time.monotonic) -> None:
+        """
+        Initialize new Cache holding at most capacity keys, evicting by the
+        given policy ('lru', 'slru' or 'lfu'). function is the hash function
+        of the underlying HashMap, which is sized for capacity keys up front
+        so it never resizes. ttl is the default time to live of an entry
+        in seconds of clock (None keeps entries until evicted). Under slru,
+        the protected segment holds up to protected_ratio of the capacity.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy: {policy!r}")
+        if not 0 <= protected_ratio < 1:
+            raise ValueError("protected_ratio must be between 0 and 1")
+
+        self._map = CacheMap(capacity, function)
+        self._capacity = capacity
+        self._policy = policy
+        self._ttl = ttl
+        self._clock = clock
+
+        # lru uses only the probation list; slru also the protected list
+        self._probation = NodeList()
+        self._protected = NodeList()
+        self._protected_capacity = int(capacity * protected_ratio)
+
+        # lfu keeps FrequencyNodes in increasing count order after this one
+        self._frequencies = FrequencyNode(0)
+        self._frequencies.prev = self._frequencies.next = self._frequencies
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        if self._policy == 'lfu':
+            out = ''
+            frequency = self._frequencies.next
+            while frequency is not self._frequencies:
+                out += str(frequency.count) + ': ' + str(frequency.items) + '\n'
+                frequency = frequency.next
+            return out
+        if self._policy == 'slru':
+            return ('protected: ' + str(self._protected) + '\n'
+                    + 'probation: ' + str(self._probation) + '\n')
+        return str(self._probation) + '\n'
+
+    def get_size(self) -> int:
+        """
+        Return number of cached keys, including expired keys not yet removed
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return the most keys the cache holds
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _expired(self, node: CacheNode) -> bool:
+        """
+        Returns True if the node's time to live has passed.
+        """
+        return node.expires is not None and self._clock() >= node.expires
+
+    def _link(self, node: CacheNode) -> None:
+        """
+        Adds a new node to the eviction order: the front of the probation
+        list, or the count 1 list under lfu.
+        """
+        if self._policy != 'lfu':
+            self._probation.push_front(node)
+            return
+
+        first = self._frequencies.next
+        if first.count != 1:
+            first = self._insert_frequency(self._frequencies, 1)
+        first.items.push_front(node)
+        node.frequency = first
+
+    def _unlink(self, node: CacheNode) -> None:
+        """
+        Removes a node from the eviction order.
+        """
+        frequency = node.frequency
+        node.owner.unlink(node)
+        if frequency is not None:
+            node.frequency = None
+            if frequency.items.length() == 0:
+                frequency.prev.next = frequency.next
+                frequency.next.prev = frequency.prev
+
+    def _insert_frequency(self, previous: FrequencyNode, count: int) -> FrequencyNode:
+        """
+        Returns a new FrequencyNode for count linked after previous.
+        """
+        frequency = FrequencyNode(count)
+        frequency.prev, frequency.next = previous, previous.next
+        previous.next.prev = frequency
+        previous.next = frequency
+        return frequency
+
+    def _touch(self, node: CacheNode) -> None:
+        """
+        Records a use of a cached node: moves it to the front of its list
+        under lru, promotes it to the protected segment under slru, and
+        moves it to the list of the next use count under lfu.
+        """
+        if self._policy == 'lru':
+            self._probation.unlink(node)
+            self._probation.push_front(node)
+
+        elif self._policy == 'slru':
+            node.owner.unlink(node)
+            if self._protected_capacity == 0:
+                self._probation.push_front(node)
+                return
+            self._protected.push_front(node)
+            if self._protected.length() > self._protected_capacity:
+                demoted = self._protected.back()
+                self._protected.unlink(demoted)
+                self._probation.push_front(demoted)
+
+        else:
+            frequency = node.frequency
+            following = frequency.next
+            if following.count != frequency.count + 1:
+                following = self._insert_frequency(frequency, frequency.count + 1)
+            self._unlink(node)
+            following.items.push_front(node)
+            node.frequency = following
+
+    def _victim(self) -> CacheNode:
+        """
+        Returns the node the policy evicts next.
+        """
+        if self._policy == 'lfu':
+            return self._frequencies.next.items.back()
+        if self._probation.length() > 0:
+            return self._probation.back()
+        return self._protected.back()
+
+    def _delete(self, node: CacheNode) -> None:
+        """
+        Removes a node from the map and the eviction order.
+        """
+        self._unlink(node)
+        self._map.remove_node(node)
+
+    def _node(self, key: str) -> CacheNode:
+        """
+        Returns the node of the given key, or None if it is not cached.
+        """
+        return self._map.find_node(key, self._map.key_hash(key))
+
+    def _lookup(self, key: str) -> CacheNode:
+        """
+        Returns the live node of the given key, counting a hit and
+        recording the use, or None after counting a miss. An expired node
+        is removed and counted as a miss.
+        """
+        node = self._node(key)
+        if node is not None and self._expired(node):
+            self._delete(node)
+            self._expirations += 1
+            node = None
+
+        if node is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._touch(node)
+        return node
+
+    def get(self, key: str) -> object:
+        """
+        Returns the cached value of the given key, or None if it is not
+        cached or has expired.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        node = self._lookup(key)
+        if node is None:
+            return
+        return node.value
+
+    def get_or_load(self, key: str, loader, ttl: float = None) -> object:
+        """
+        Returns the cached value of the given key. On a miss, the value is
+        computed as loader(key) and cached with the given time to live.
+        :param key:     string representing key
+        :param loader:  callable computing the value of a key
+        :param ttl:     seconds the loaded value lives, or None for the
+                        cache's default
+        :return:        object representing value of key
+        """
+        node = self._lookup(key)
+        if node is not None:
+            return node.value
+        value = loader(key)
+        self.put(key, value, ttl)
+        return value
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Caches a key/value pair, evicting a key by the cache's policy if the
+        cache is full. Updating a cached key counts as a use.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :param ttl:     seconds the entry lives, or None for the cache's
+                        default
+        :return:        key/value pair added or updated in cache
+        """
+        if ttl is None:
+            ttl = self._ttl
+        expires = None if ttl is None else self._clock() + ttl
+
+        hash = self._map.key_hash(key)
+        node = self._map.find_node(key, hash)
+        if node is not None:
+            node.value = value
+            node.expires = expires
+            self._touch(node)
+            return
+
+        if self._map.get_size() >= self._capacity:
+            self._delete(self._victim())
+            self._evictions += 1
+
+        node = self._map.add_node(key, hash, value)
+        node.expires = expires
+        self._link(node)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is cached and has not expired, without
+        counting a hit or miss or recording a use.
+        :param key:     string representing key
+        :return:        True if key is cached, False otherwise.
+        """
+        node = self._node(key)
+        if node is None:
+            return False
+        if self._expired(node):
+            self._delete(node)
+            self._expirations += 1
+            return False
+        return True
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key from the cache.
+        :param key:     string representing key
+        :return:        key/value pair is removed from cache
+        """
+        node = self._node(key)
+        if node is not None:
+            self._delete(node)
+
+    def remove_expired(self) -> int:
+        """
+        Removes every expired key, which are otherwise only removed when
+        looked up.
+        :return:    integer number of keys removed
+        """
+        expired = [node for node in self._nodes() if self._expired(node)]
+        for node in expired:
+            self._delete(node)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """
+        Clears contents of the cache. The counters are kept.
+        :return:    Contents of cache cleared
+        """
+        self._map.clear()
+        self._probation = NodeList()
+        self._protected = NodeList()
+        self._frequencies.prev = self._frequencies.next = self._frequencies
+
+    def _nodes(self):
+        """
+        Yields every node, from the next to be evicted to the last.
+        """
+        if self._policy == 'lfu':
+            frequency = self._frequencies.next
+            while frequency is not self._frequencies:
+                yield from reversed(list(frequency.items))
+                frequency = frequency.next
+            return
+        yield from reversed(list(self._probation))
+        yield from reversed(list(self._protected))
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the cache that has not expired, in eviction order.
+        :return:        Array of key/value pairs
+        """
+        return DynamicArray([(node.key, node.value) for node in self._nodes()
+                             if not self._expired(node)])
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters.
+        :return:    dictionary of hits, misses, evictions, expirations, size
+                    and hit_rate, the fraction of lookups that hit
+        """
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'expirations': self._expirations,
+            'size': self._map.get_size(),
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+        }
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n LRU cache example")
+    print("-------------------")
+    c = Cache(3)
+    print("Create a Cache object c holding 3 keys: c = Cache(3)")
+    for key in ('a', 'b', 'c'):
+        c.put(key, key.upper())
+    c.get('a')
+    c.put('d', 'D')
+    print("Put 'a', 'b', 'c', get 'a', then put 'd': 'b' is evicted")
+    print("\t", c.get_keys_and_values())
+    print("\t", c.stats())
+
+    print("\n LFU cache example")
+    print("-------------------")
+    c = Cache(3, policy='lfu')
+    print("Create a Cache object c with the lfu policy: c = Cache(3, policy='lfu')")
+    for key in ('a', 'b', 'c'):
+        c.put(key, key.upper())
+    for key in ('a', 'a', 'b', 'c', 'c'):
+        c.get(key)
+    c.put('d', 'D')
+    print("Use 'a' and 'c' twice and 'b' once, then put 'd': 'b' is evicted")
+    print(c)
+
+    print(" Cache with time to live example")
+    print("---------------------------------")
+    now = [0.0]
+    c = Cache(10, ttl=60, clock=lambda: now[0])
+    c.put('session', 'token')
+    print("Put 'session' with a 60 second time to live: c.put('session', 'token')")
+    now[0] = 30
+    print("\tAfter 30 seconds, c.get('session') returns", c.get('session'))
+    now[0] = 61
+    print("\tAfter 61 seconds, c.get('session') returns", c.get('session'))
+    print("\t", c.stats())
@@ -0,0 +1,289 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, a thread-safe hash map that splits its
+#              keys across independent shards, each an existing HashMap
+#              (separate chaining by default, or open addressing). The
+#              shard of a key is chosen by the low bits of its mixed hash,
+#              and each shard has its own lock, so a resize in one shard
+#              only blocks operations on that shard. Reads first run without
+#              the lock and check a per-shard version counter, like a
+#              seqlock, falling back to the lock only if a write overlapped.
+#              Size, load and key/value queries aggregate over all shards.
+
+
+import threading
+
+import hash_map_sc
+from hash_map_include import (DynamicArray, HASH_MASK_64, get_hash_function,
+                              hash_function_1, next_power_of_two, shard_index)
+
+
+class _Shard:
+    """
+    One shard: a HashMap, the lock serializing writes to it, and a version
+    counter that is odd while a write is in progress.
+    """
+
+    def __init__(self, hash_map, optimistic: bool = True) -> None:
+        """
+        Initialize shard around the given HashMap. optimistic must be False
+        for maps whose reads modify the table, so reads always lock.
+        """
+        self.map = hash_map
+        self.lock = threading.Lock()
+        self.version = 0
+        self.optimistic = optimistic
+
+    def write(self, method, *args) -> object:
+        """
+        Calls method(*args) under the lock, bumping the version before and
+        after so that concurrent optimistic reads retry.
+        """
+        with self.lock:
+            self.version += 1
+            try:
+                return method(*args)
+            finally:
+                self.version += 1
+
+    def read(self, method, *args) -> object:
+        """
+        Calls method(*args) without the lock and returns its result if no
+        write started or finished meanwhile. Otherwise, including when the
+        read fails on a table that is being modified, it is repeated under
+        the lock.
+        """
+        version = self.version
+        if self.optimistic and version % 2 == 0:
+            try:
+                result = method(*args)
+            except Exception:
+                pass
+            else:
+                if self.version == version:
+                    return result
+
+        with self.lock:
+            return method(*args)
+
+
+class HashMap:
+    def __init__(self, capacity: int = 11, function=hash_function_1,
+                 shards: int = 16, map_class=None, **options) -> None:
+        """
+        Initialize new thread-safe HashMap of the given number of shards,
+        rounded up to a power of two, together holding at least capacity
+        buckets. Each shard is a map_class instance (hash_map_sc.HashMap by
+        default, or hash_map_oa.HashMap) built with the hash function and
+        any other options given. Open addressing maps with incremental=True
+        migrate buckets during reads, so their reads take the shard lock.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if map_class is None:
+            map_class = hash_map_sc.HashMap
+
+        self._hash_function = get_hash_function(function)
+        self._shard_count = next_power_of_two(shards)
+        shard_capacity = max(1, -(-capacity // self._shard_count))
+        optimistic = not options.get('incremental', False)
+        self._shards = [_Shard(map_class(shard_capacity, function, **options),
+                               optimistic)
+                        for _ in range(self._shard_count)]
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for index, shard in enumerate(self._shards):
+            out += 'Shard ' + str(index) + ':\n'
+            out += shard.read(str, shard.map)
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map, summed over the shards
+        """
+        return sum(shard.map.get_size() for shard in self._shards)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, summed over the shards
+        """
+        return sum(shard.map.get_capacity() for shard in self._shards)
+
+    # ------------------------------------------------------------------ #
+
+    def _shard(self, key: str) -> _Shard:
+        """
+        Returns the shard of a key, chosen by the low bits of its mixed
+        hash. Shards with power_of_two tables index buckets by the top bits
+        of the Fibonacci product, so those bits must not pick the shard.
+        """
+        hash = self._hash_function(key) & HASH_MASK_64
+        return self._shards[shard_index(hash, self._shard_count)]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        shard = self._shard(key)
+        shard.write(shard.map.put, key, value)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        shard = self._shard(key)
+        return shard.read(shard.map.get, key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        shard = self._shard(key)
+        return shard.read(shard.map.contains_key, key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        shard = self._shard(key)
+        shard.write(shard.map.remove, key)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Atomically adds delta to the value of the given key, which starts at
+        0 if the key is absent.
+        :param key:     string representing key
+        :param delta:   number added to the key's value
+        :return:        new value of key
+        """
+        shard = self._shard(key)
+        return shard.write(shard.map.increment, key, delta)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Atomically returns the value of the given key, first adding the key
+        with value default if it is absent.
+        :param key:         string representing key
+        :param default:     object stored if key is absent
+        :return:            object representing value of key
+        """
+        shard = self._shard(key)
+        return shard.write(shard.map.setdefault, key, default)
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Atomically replaces the value of the given key with function(value),
+        where the value of an absent key is default. function runs while
+        the key's shard is locked.
+        :param key:         string representing key
+        :param function:    callable taking and returning a value
+        :param default:     object passed to function if key is absent
+        :return:            new value of key
+        """
+        shard = self._shard(key)
+        return shard.write(shard.map.update_with, key, function, default)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Atomically removes the given key and returns its value, or returns
+        default if the key is not in the hash map.
+        :param key:         string representing key
+        :param default:     object returned if key is absent
+        :return:            object representing removed value or default
+        """
+        shard = self._shard(key)
+        return shard.write(shard.map.pop, key, default)
+
+    def table_load(self) -> float:
+        """
+        Returns the load factor over all shards.
+        :return:    float representing load factor
+        """
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets, summed over the shards.
+        :return:    integer representing number of empty buckets
+        """
+        return sum(shard.map.empty_buckets() for shard in self._shards)
+
+    def shard_sizes(self) -> DynamicArray:
+        """
+        Returns the number of keys in each shard.
+        :return:    DynamicArray of integers in shard order
+        """
+        return DynamicArray([shard.map.get_size() for shard in self._shards])
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes every shard, one at a time, so that together they have at
+        least new_capacity buckets.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity of every shard is changed
+        """
+        shard_capacity = max(1, -(-new_capacity // self._shard_count))
+        for shard in self._shards:
+            shard.write(shard.map.resize_table, shard_capacity)
+
+    def clear(self) -> None:
+        """
+        Clears contents of every shard.
+        :return:    Contents of hash map cleared
+        """
+        for shard in self._shards:
+            shard.write(shard.map.clear)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map. Each shard is read consistently, but writes to other
+        shards may happen between shards.
+        :return:        Array of key/value pairs
+        """
+        array = DynamicArray()
+        for shard in self._shards:
+            pairs = shard.read(shard.map.get_keys_and_values)
+            for index in range(pairs.length()):
+                array.append(pairs[index])
+        return array
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Concurrent hashmap example")
+    print("----------------------------")
+    m = HashMap(64, hash_function_1, shards=4)
+    print("Create a HashMap object m with 4 shards: m = HashMap(64, hash_function_1, shards=4)")
+
+    def worker(start: int) -> None:
+        for i in range(start, start + 250):
+            m.put('str' + str(i), i)
+            m.increment('total')
+
+    threads = [threading.Thread(target=worker, args=(250 * t,)) for t in range(4)]
+    print("Put 1000 keys and increment 'total' from 4 threads")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print("\tHashmap Size:", m.get_size(), ", Load Factor:", round(m.table_load(), 2),
+          ", Hashmap Capacity:", m.get_capacity())
+    print("\tKeys per shard:", m.shard_sizes())
+    print("\tValue of 'total':", m.get('total'))
@@ -0,0 +1,361 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, a bucketized cuckoo hash map. The table
+#              is split in two halves of buckets holding BUCKET_SIZE slots
+#              each. Every key may only live in one bucket of each half: the
+#              first chosen by the map's hash function, the second by a
+#              seeded hash from hash_map_include. A few keys that cannot be
+#              placed are kept in a small stash. get and contains_key
+#              therefore inspect at most MAX_PROBES slots, however full the
+#              table is. put displaces resident keys into their other bucket
+#              and rehashes with a new seed, or grows, when that fails.
+#              Exposes the same methods as the open addressing map in
+#              hash_map_oa.py: put, empty_buckets, table_load, clear,
+#              resize_table, get, contains_key, remove, get_keys_and_values.
+
+
+import random
+from array import array
+
+from hash_map_include import (DynamicArray, HASH_MASK_64, fibonacci_index,
+                              get_hash_function, hash_function_1,
+                              hash_function_2, make_seeded_hash,
+                              next_power_of_two)
+
+
+# Slots per bucket, and overflow slots kept after both tables
+BUCKET_SIZE = 4
+STASH_SIZE = 4
+
+# Most slots a lookup inspects: one bucket per table and the stash
+MAX_PROBES = 2 * BUCKET_SIZE + STASH_SIZE
+
+# Displacements tried before an insert falls back to the stash, and seeds
+# tried at one capacity before the table grows
+_MAX_KICKS = 64
+_MAX_REHASHES = 3
+
+
+class HashMap:
+    def __init__(self, capacity: int, function,
+                 max_load: float = 0.9) -> None:
+        """
+        Initialize new HashMap that uses cuckoo hashing with two tables of
+        BUCKET_SIZE-slot buckets and a stash. The number of buckets per
+        table is a power of two, and the table doubles when a put would
+        take the load factor above max_load, which must be below 1.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        self._hash_function = get_hash_function(function)
+        self._max_load = max_load
+        self._random = random.Random()
+        self._size = 0
+        self._allocate(self._fit_buckets(capacity))
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity + STASH_SIZE):
+            if self._keys[i] is None:
+                entry = 'None'
+            else:
+                entry = f"K: {self._keys[i]} V: {self._values[i]}"
+            if i >= self._capacity:
+                entry += ' (stash)'
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _fit_buckets(capacity: int) -> int:
+        """
+        Returns the number of buckets per table needed for at least
+        capacity slots, rounded up to a power of two.
+        """
+        return next_power_of_two(-(-capacity // (2 * BUCKET_SIZE)))
+
+    def _allocate(self, buckets: int) -> None:
+        """
+        Replaces the table with an empty one of the given number of buckets
+        per table and draws a new seed for the second hash function. Slots
+        of the first table come first, then the second table, then the
+        stash; each stores the key's hash from the map's hash function.
+        """
+        self._buckets = buckets
+        self._capacity = 2 * BUCKET_SIZE * buckets
+        slots = self._capacity + STASH_SIZE
+        self._hashes = array('Q', bytes(8 * slots))
+        self._keys = [None] * slots
+        self._values = [None] * slots
+        self._stashed = 0
+        self._second_hash = make_seeded_hash()
+
+    def _first_bucket(self, hash: int) -> int:
+        """
+        Returns the first slot of the key's bucket in the first table.
+        """
+        return fibonacci_index(hash, self._buckets) * BUCKET_SIZE
+
+    def _second_bucket(self, key: str) -> int:
+        """
+        Returns the first slot of the key's bucket in the second table.
+        """
+        bucket = self._second_hash(key) & (self._buckets - 1)
+        return (self._buckets + bucket) * BUCKET_SIZE
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Returns the slot index holding the given key, or -1 if the key is
+        not in the hash map. The second hash is only computed when the key
+        is not in its first bucket.
+        :param key:     string representing key
+        :param hash:    integer hash of key
+        :return:        integer slot index or -1
+        """
+        hashes, keys = self._hashes, self._keys
+
+        base = self._first_bucket(hash)
+        for index in range(base, base + BUCKET_SIZE):
+            if hashes[index] == hash and keys[index] == key:
+                return index
+
+        base = self._second_bucket(key)
+        for index in range(base, base + BUCKET_SIZE):
+            if hashes[index] == hash and keys[index] == key:
+                return index
+
+        if self._stashed:
+            for index in range(self._capacity, self._capacity + STASH_SIZE):
+                if hashes[index] == hash and keys[index] == key:
+                    return index
+        return -1
+
+    def _store(self, index: int, hash: int, key: str, value: object) -> None:
+        """
+        Writes an entry into the given slot.
+        """
+        self._hashes[index] = hash
+        self._keys[index] = key
+        self._values[index] = value
+
+    def _place(self, hash: int, key: str, value: object):
+        """
+        Stores a key known to be absent from the table. When both of its
+        buckets are full, a random resident of the bucket is evicted and
+        moved to its other bucket, repeating up to _MAX_KICKS times before
+        the displaced entry is put in the stash.
+        :return:    None, or a (hash, key, value) tuple that has no slot
+        """
+        keys = self._keys
+        first = self._first_bucket(hash)
+        for index in range(first, first + BUCKET_SIZE):
+            if keys[index] is None:
+                self._store(index, hash, key, value)
+                return None
+
+        second = self._second_bucket(key)
+        for index in range(second, second + BUCKET_SIZE):
+            if keys[index] is None:
+                self._store(index, hash, key, value)
+                return None
+
+        base = first
+        for _ in range(_MAX_KICKS):
+            index = base + self._random.randrange(BUCKET_SIZE)
+            evicted = (self._hashes[index], keys[index], self._values[index])
+            self._store(index, hash, key, value)
+            hash, key, value = evicted
+
+            # The evicted entry moves to its bucket in the other table
+            if index < self._buckets * BUCKET_SIZE:
+                base = self._second_bucket(key)
+            else:
+                base = self._first_bucket(hash)
+            for index in range(base, base + BUCKET_SIZE):
+                if keys[index] is None:
+                    self._store(index, hash, key, value)
+                    return None
+
+        for index in range(self._capacity, self._capacity + STASH_SIZE):
+            if keys[index] is None:
+                self._store(index, hash, key, value)
+                self._stashed += 1
+                return None
+        return hash, key, value
+
+    def _rebuild(self, buckets: int, extra: tuple = None) -> None:
+        """
+        Reinserts every entry, and the extra entry if given, into a table
+        with the given number of buckets per table and a new seed. If some
+        entry cannot be placed, the rebuild is retried with another seed,
+        and after _MAX_REHASHES attempts with twice as many buckets.
+        """
+        entries = [(self._hashes[index], self._keys[index], self._values[index])
+                   for index in range(self._capacity + STASH_SIZE)
+                   if self._keys[index] is not None]
+        if extra is not None:
+            entries.append(extra)
+
+        attempts = 0
+        while True:
+            self._allocate(buckets)
+            for entry in entries:
+                if self._place(*entry) is not None:
+                    break
+            else:
+                return
+
+            attempts += 1
+            if attempts == _MAX_REHASHES:
+                attempts = 0
+                buckets *= 2
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        hash = self._hash_function(key) & HASH_MASK_64
+        index = self._find(key, hash)
+        if index != -1:
+            self._values[index] = value
+            return
+
+        # Double the table if the new key would exceed the load factor
+        if (self._size + 1) / self._capacity > self._max_load:
+            self._rebuild(2 * self._buckets)
+
+        homeless = self._place(hash, key, value)
+        if homeless is not None:
+            self._rebuild(self._buckets, homeless)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots in the two tables.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - (self._size - self._stashed)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the hash table's capacity to at least new_capacity slots,
+        rounded up to a power of two number of buckets per table. All
+        key/value pairs remain in table and are reinserted with a new seed.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity is changed and links rehashed
+        """
+        buckets = self._fit_buckets(new_capacity)
+
+        # Every entry must fit within the maximum load factor
+        while self._size > self._max_load * 2 * BUCKET_SIZE * buckets:
+            buckets *= 2
+
+        self._rebuild(buckets)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._find(key, self._hash_function(key) & HASH_MASK_64) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map. Lookups never
+        continue past a key's two buckets, so the slot is simply emptied.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+
+        if index >= self._capacity:
+            self._stashed -= 1
+        self._store(index, 0, None, None)
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map without changing its capacity.
+        :return:    Contents of hash map cleared
+        """
+        self._size = 0
+        self._allocate(self._buckets)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        array_key_values = DynamicArray()
+        keys, values = self._keys, self._values
+        for index in range(self._capacity + STASH_SIZE):
+            if keys[index] is not None:
+                array_key_values.append((keys[index], values[index]))
+        return array_key_values
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Cuckoo hashmap example")
+    print("------------------------")
+    m = HashMap(20, hash_function_2)
+    print("Create a HashMap object m with capacity = 20 using Hash Function 2: m = HashMap(20, hash_function_2)")
+    print("\tCapacity is rounded up to two tables of 4-slot buckets:", m.get_capacity())
+    print("Add 30 key/value pairs with put() method:")
+    for i in range(30):
+        m.put('str' + str(i), i * 100)
+        if i % 10 == 9:
+            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
+            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
+    print("\tLookups inspect at most", MAX_PROBES, "slots.")
+    print("\nRemove 'str10' key: m.remove('str10')")
+    m.remove('str10')
+    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet value of 'str20' key: m.get('str20')")
+    print("\tReturned", m.get('str20'))
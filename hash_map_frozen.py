@@ -0,0 +1,357 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, a read-only open addressing hash map
+#              stored in a file and opened with mmap. The file holds a
+#              header, a power-of-two array of fixed-width slots (key hash,
+#              key offset and length, value offset and length) probed
+#              linearly from the key's Fibonacci index, and a heap of UTF-8
+#              keys and encoded values. get and contains_key read the slots
+#              and strings straight from the mapped pages, so opening a
+#              table is O(1) and every process using the same file shares
+#              one copy of it in the page cache. Tables are written from
+#              any existing map with HashMap.build.
+
+
+import mmap
+import os
+import pickle
+import struct
+
+from hash_map_include import (DynamicArray, HASH_MASK_64, fibonacci_index,
+                              get_hash_function, hash_function_1,
+                              hash_function_2, next_power_of_two)
+from hash_map_snapshot import function_fingerprint, function_name
+
+
+MAGIC = b'HMFROZEN'
+VERSION = 2
+
+# magic, version, capacity, size, offset of the slot array, file length,
+# hash function fingerprint and length of the hash function name that
+# follows the header
+_HEADER = struct.Struct('<8sIQQQQII')
+
+# key hash, key offset, value offset, key length, value length
+_SLOT = struct.Struct('<QQQII')
+
+# Key length marking an empty slot
+_EMPTY = 0xFFFFFFFF
+
+# First byte of an encoded value: UTF-8 string or pickled object
+_STRING = b's'
+_PICKLED = b'p'
+
+
+def _encode_value(value: object) -> bytes:
+    """
+    Returns a value as bytes, storing strings as UTF-8 so they can be
+    decoded without unpickling.
+    """
+    if type(value) is str:
+        return _STRING + value.encode('utf-8')
+    return _PICKLED + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_value(data) -> object:
+    """
+    Returns the value encoded by _encode_value.
+    """
+    if data[:1] == _STRING:
+        return str(data[1:], 'utf-8')
+    return pickle.loads(data[1:])
+
+
+class HashMap:
+    def __init__(self, path: str, function=None) -> None:
+        """
+        Opens the frozen table in the given file. Only the header is read;
+        slots and strings are read from the mapped file on demand. function
+        is required only if the table was built with a hash function that
+        is not registered in hash_map_include.HASH_FUNCTIONS, and must give
+        the same hashes as the one the table was built with.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError("frozen table is truncated")
+            (magic, version, capacity, size, slots, length, fingerprint,
+             name_length) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError("not a frozen hash map")
+            if version != VERSION:
+                raise ValueError(f"unsupported frozen table version {version}")
+            if length != len(self._mmap):
+                raise ValueError("frozen table is truncated")
+            if (capacity < 1 or capacity & (capacity - 1)
+                    or slots + capacity * _SLOT.size > length):
+                raise ValueError("frozen table is corrupt")
+
+            name = str(self._mmap[_HEADER.size:_HEADER.size + name_length],
+                       'utf-8')
+            if function is None:
+                if not name:
+                    raise ValueError("table was built with an unregistered "
+                                     "hash function, which must be passed")
+                function = name
+            elif name and get_hash_function(function) is not get_hash_function(name):
+                raise ValueError(f"table was built with hash function {name!r}")
+            if function_fingerprint(get_hash_function(function)) != fingerprint:
+                raise ValueError("table was built with a different hash function")
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self._hash_function = get_hash_function(function)
+        self._capacity = capacity
+        self._size = size
+        self._slots = slots
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for index in range(self._capacity):
+            hash, key_offset, value_offset, key_length, value_length = \
+                self._slot(index)
+            if key_length == _EMPTY:
+                out += str(index) + ': None\n'
+            else:
+                key = str(self._mmap[key_offset:key_offset + key_length], 'utf-8')
+                value = _decode_value(self._mmap[value_offset:value_offset + value_length])
+                out += str(index) + ': K: ' + key + ' V: ' + str(value) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def build(cls, hash_map, path: str, max_load: float = 0.5) -> "HashMap":
+        """
+        Writes the key/value pairs of an existing hash map to a frozen table
+        file and returns the table opened from it. The table uses the map's
+        hash function, and its capacity is the smallest power of two keeping
+        the load factor at or below max_load. Hashes cached by the map are
+        reused when it provides hashed_items. The file is written under a
+        temporary name and renamed, so processes never open a partial table.
+        :param hash_map:    any hash map with get_keys_and_values and string
+                            keys
+        :param path:        file path to write
+        :param max_load:    float load factor of the table, below 1
+        :return:            HashMap opened from the written file
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        function = hash_map._hash_function
+        if hasattr(hash_map, 'hashed_items'):
+            entries = list(hash_map.hashed_items())
+        else:
+            pairs = hash_map.get_keys_and_values()
+            entries = [pairs[position] + (function(pairs[position][0]),)
+                       for position in range(pairs.length())]
+        size = len(entries)
+        capacity = next_power_of_two(max(1, int(size / max_load) + 1))
+
+        name = function_name(function).encode('utf-8')
+        slots = _HEADER.size + len(name)
+        heap_offset = slots + capacity * _SLOT.size
+
+        table = bytearray(_SLOT.pack(0, 0, 0, _EMPTY, 0) * capacity)
+        used = bytearray(capacity)
+
+        heap, offset = [], heap_offset
+        for key, value, hash in entries:
+            key_data = key.encode('utf-8')
+            value_data = _encode_value(value)
+            hash &= HASH_MASK_64
+
+            index = fibonacci_index(hash, capacity)
+            while used[index]:
+                index = (index + 1) & (capacity - 1)
+            used[index] = 1
+            _SLOT.pack_into(table, index * _SLOT.size, hash, offset,
+                            offset + len(key_data), len(key_data),
+                            len(value_data))
+            heap.append(key_data)
+            heap.append(value_data)
+            offset += len(key_data) + len(value_data)
+
+        header = _HEADER.pack(MAGIC, VERSION, capacity, size, slots, offset,
+                              function_fingerprint(function), len(name))
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(header)
+            file.write(name)
+            file.write(table)
+            file.writelines(heap)
+        os.replace(temporary, path)
+        return cls(path, function)
+
+    def _slot(self, index: int) -> tuple:
+        """
+        Returns the fields of the slot at index from the mapped file.
+        """
+        return _SLOT.unpack_from(self._mmap, self._slots + index * _SLOT.size)
+
+    def _find(self, key: str) -> tuple:
+        """
+        Returns the slot holding the given key, or None if the key is not in
+        the hash map. Probing starts at the key's Fibonacci index and stops
+        at the first empty slot, or after every slot has been examined in a
+        corrupt table that has none; the key itself is only compared in
+        slots with a matching hash.
+        """
+        hash = self._hash_function(key) & HASH_MASK_64
+        mask = self._capacity - 1
+        index = fibonacci_index(hash, self._capacity)
+        data = None
+        for _ in range(self._capacity):
+            slot = self._slot(index)
+            if slot[3] == _EMPTY:
+                return None
+            if slot[0] == hash:
+                if data is None:
+                    data = key.encode('utf-8')
+                if (slot[3] == len(data)
+                        and self._mmap[slot[1]:slot[1] + slot[3]] == data):
+                    return slot
+            index = (index + 1) & mask
+        return None
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        slot = self._find(key)
+        if slot is None:
+            return
+        return _decode_value(self._mmap[slot[2]:slot[2] + slot[4]])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._find(key) is not None
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty slots in the hash table.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def items(self):
+        """
+        Yields a (key, value) tuple for every key/value pair in the table,
+        in slot order.
+        """
+        for index in range(self._capacity):
+            hash, key_offset, value_offset, key_length, value_length = \
+                self._slot(index)
+            if key_length != _EMPTY:
+                key = str(self._mmap[key_offset:key_offset + key_length], 'utf-8')
+                yield key, _decode_value(
+                    self._mmap[value_offset:value_offset + value_length])
+
+    def keys(self):
+        """
+        Yields every key in the table, as items does.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Yields every value in the table, as items does.
+        """
+        for _, value in self.items():
+            yield value
+
+    def __iter__(self):
+        """
+        Return an iterator over the keys of the table.
+        """
+        return self.keys()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        return DynamicArray(list(self.items()))
+
+    def close(self) -> None:
+        """
+        Unmaps the table file. The map cannot be used afterwards.
+        """
+        self._mmap.close()
+
+    def __enter__(self) -> "HashMap":
+        """
+        Return the map for use in a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the map at the end of a with statement.
+        """
+        self.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    import hash_map_oa
+
+    print("\n Frozen hashmap example")
+    print("------------------------")
+    source = hash_map_oa.HashMap(20, hash_function_2)
+    for i in range(30):
+        source.put('str' + str(i), i * 100)
+    source.put('name', 'frozen')
+    print("Create an open addressing HashMap with 31 keys using Hash Function 2")
+
+    path = os.path.join(tempfile.mkdtemp(), 'table.frozen')
+    with HashMap.build(source, path) as m:
+        print("Freeze it to a file and open it with mmap: m = HashMap.build(source, path)")
+        print("\tHashmap Size:", m.get_size(), ", Load Factor:", round(m.table_load(), 2),
+              ", Hashmap Capacity:", m.get_capacity(), ", File size:", os.path.getsize(path))
+        print("\nGet value of 'str20' key: m.get('str20')")
+        print("\tReturned", m.get('str20'))
+        print("Get value of 'name' key: m.get('name')")
+        print("\tReturned", m.get('name'))
+        print("Check for a missing key: m.contains_key('str99')")
+        print("\tReturned", m.contains_key('str99'))
+
+    with HashMap(path) as m:
+        print("\nReopen the file in another map: HashMap(path)")
+        print("\tValue of 'str7':", m.get('str7'))
+    os.remove(path)
@@ -1,6 +1,13 @@
 # Course:      CS261 - Data Structures
 # Description: Provided data structures necessary to complete the assignment.
 
+import os
+import random
+import struct
+from bisect import bisect_left, bisect_right
+from hashlib import blake2b
+
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -91,6 +98,255 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# FNV-1a 64-bit parameters
+_FNV_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+# Multipliers for the multiply-xorshift mixer (from MurmurHash3's fmix64)
+_MIX_MULTIPLIER_1 = 0xFF51AFD7ED558CCD
+_MIX_MULTIPLIER_2 = 0xC4CEB9FE1A85EC53
+
+# Words consumed by mix_hash, decoded little-endian on every host so the
+# hashes stored in snapshots and frozen tables are portable
+_MIX_WORD = struct.Struct('<Q')
+
+
+def fnv1a_hash(key: str) -> int:
+    """64-bit FNV-1a hash of the key's UTF-8 bytes."""
+    hash = _FNV_OFFSET_BASIS
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return hash
+
+
+def _fmix64(hash: int) -> int:
+    """Avalanche all 64 bits of hash with two multiply-xorshift rounds."""
+    hash ^= hash >> 33
+    hash = (hash * _MIX_MULTIPLIER_1) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    hash = (hash * _MIX_MULTIPLIER_2) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    return hash
+
+
+def mix_hash(key: str) -> int:
+    """
+    64-bit multiply-xorshift hash of the key's UTF-8 bytes, consumed eight
+    bytes at a time instead of one character at a time.
+    """
+    data = key.encode('utf-8')
+    length = len(data)
+
+    # Pad to whole words; the length is mixed in so padding cannot collide
+    data += bytes(-length % 8)
+    hash = (length * _MIX_MULTIPLIER_2) & 0xFFFFFFFFFFFFFFFF
+    for (word,) in _MIX_WORD.iter_unpack(data):
+        hash = ((hash ^ word) * _MIX_MULTIPLIER_1) & 0xFFFFFFFFFFFFFFFF
+        hash ^= hash >> 32
+    return _fmix64(hash ^ length)
+
+
+def make_seeded_hash(seed: bytes = None):
+    """
+    Return a hash function keyed with a secret seed, so keys chosen to
+    collide cannot be precomputed (collision flooding). The function uses
+    keyed BLAKE2b, a cryptographic PRF, truncated to 64 bits. A random
+    16-byte seed is generated if none is given; pass the same seed to
+    reproduce the same hashes.
+    """
+    if seed is None:
+        seed = os.urandom(16)
+
+    def seeded_hash(key: str) -> int:
+        """64-bit keyed BLAKE2b hash of the key's UTF-8 bytes."""
+        digest = blake2b(key.encode('utf-8'), digest_size=8, key=seed).digest()
+        return int.from_bytes(digest, 'little')
+
+    seeded_hash.seed = seed
+    return seeded_hash
+
+
+# Hash functions that can be selected by name when constructing a HashMap
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a_hash': fnv1a_hash,
+    'mix_hash': mix_hash,
+}
+
+
+def get_hash_function(function):
+    """
+    Return the hash function registered under the given name, or the
+    argument itself if it is already a callable.
+    """
+    if callable(function):
+        return function
+    if function not in HASH_FUNCTIONS:
+        raise ValueError(f"unknown hash function: {function!r}")
+    return HASH_FUNCTIONS[function]
+
+
+# ---------- Capacity policies for both HashMaps (SC & OA) ---------- #
+
+# Each prime is the smallest prime greater than or equal to twice the one
+# before it, so a table that starts on this ladder and doubles on every
+# resize finds its next capacity with one lookup instead of a prime search.
+PRIME_CAPACITIES = (
+    11, 23, 47, 97, 197, 397, 797, 1597, 3203, 6421, 12853, 25717, 51437,
+    102877, 205759, 411527, 823117, 1646237, 3292489, 6584983, 13169977,
+    26339969, 52679969, 105359939, 210719881, 421439783, 842879579,
+    1685759167, 3371518343, 6743036717, 13486073473, 26972146961,
+    53944293929, 107888587883, 215777175787, 431554351609, 863108703229,
+    1726217406467
+)
+
+_NEXT_PRIME_CAPACITY = {PRIME_CAPACITIES[i]: PRIME_CAPACITIES[i + 1]
+                        for i in range(len(PRIME_CAPACITIES) - 1)}
+
+# Witnesses that make Miller-Rabin deterministic below 3.3 * 10 ** 24
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# 2 ** 64 divided by the golden ratio, used for Fibonacci hashing
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def is_prime(capacity: int) -> bool:
+    """Determine if given integer is a prime number using Miller-Rabin."""
+    if capacity == 2 or capacity == 3:
+        return True
+
+    if capacity < 2 or capacity % 2 == 0:
+        return False
+
+    # Write capacity - 1 as d * 2 ** r with d odd
+    d, r = capacity - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for base in _MILLER_RABIN_BASES:
+        if base % capacity == 0:
+            continue
+        x = pow(base, d, capacity)
+        if x == 1 or x == capacity - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % capacity
+            if x == capacity - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """Increment from given number to find the closest odd prime number."""
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+def grow_prime(capacity: int) -> int:
+    """
+    Return the prime capacity a table of the given capacity doubles to,
+    which is next_prime(2 * capacity). Capacities on the PRIME_CAPACITIES
+    ladder are looked up directly.
+    """
+    if capacity in _NEXT_PRIME_CAPACITY:
+        return _NEXT_PRIME_CAPACITY[capacity]
+    return next_prime(2 * capacity)
+
+
+def next_power_of_two(capacity: int) -> int:
+    """Return the smallest power of two greater than or equal to capacity."""
+    if capacity <= 1:
+        return 1
+    return 1 << (capacity - 1).bit_length()
+
+
+def fibonacci_index(hash: int, capacity: int) -> int:
+    """
+    Map a hash to a bucket of a power-of-two capacity table by multiplying
+    with the golden ratio and keeping the top bits of the 64-bit product.
+    This mixes the low-quality low bits of the sample hash functions before
+    they are masked.
+    """
+    return ((hash * FIBONACCI_MULTIPLIER) & HASH_MASK_64) >> (65 - capacity.bit_length())
+
+
+def shard_index(hash: int, shards: int) -> int:
+    """
+    Map a hash to one of a power-of-two number of shards using the low bits
+    of the avalanched hash. fibonacci_index and hash % prime take bucket
+    indices from other bits, so the keys of one shard still spread over all
+    buckets of a table indexed either way.
+    """
+    return _fmix64(hash) & (shards - 1)
+
+
+# ---------- Statistics for both HashMaps (SC & OA) ---------- #
+
+# Buckets examined by stats() unless told otherwise
+STATS_SAMPLE = 1024
+
+
+def sample_buckets(capacity: int, sample: int = STATS_SAMPLE) -> list:
+    """
+    Returns sample distinct bucket indices chosen at random, or every index
+    if sample is None or at least capacity.
+    """
+    if sample is None or sample >= capacity:
+        return list(range(capacity))
+    return random.sample(range(capacity), sample)
+
+
+def summarize_lengths(lengths: list) -> dict:
+    """
+    Returns the mean, maximum and 50th, 90th and 99th percentiles of a list
+    of probe or chain lengths, and a histogram mapping each length to the
+    number of times it occurs.
+    """
+    ordered = sorted(lengths)
+    histogram = {}
+    for length in ordered:
+        histogram[length] = histogram.get(length, 0) + 1
+
+    def percentile(fraction: float) -> int:
+        if not ordered:
+            return 0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+        'max': ordered[-1] if ordered else 0,
+        'p50': percentile(0.50),
+        'p90': percentile(0.90),
+        'p99': percentile(0.99),
+        'histogram': histogram,
+    }
+
+
+def bucket_skew(counts: list, size: int, capacity: int) -> float:
+    """
+    Estimates how unevenly a hash function spreads keys over home buckets,
+    from the number of keys whose home is each of a sample of buckets. The
+    sum of squared counts, scaled to the whole table, is divided by its
+    expected value for a uniformly random hash function, so the result is
+    about 1.0 for a good hash function and grows as keys pile into fewer
+    buckets.
+    """
+    if size == 0 or not counts:
+        return 0.0
+    squares = sum(count * count for count in counts) * capacity / len(counts)
+    return squares / (size + size * (size - 1) / capacity)
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -98,11 +354,13 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """Initialize node given a key, value and the key's full hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -163,35 +421,47 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash: int = None) -> SLNode:
         """
         Remove first node with matching key.
-        Return True if removal was successful, False otherwise.
+        If hash is given, nodes with a different cached hash are skipped
+        without comparing keys.
+        Return the removed node, or None if no match.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash is given, nodes with a different cached hash are skipped
+        without comparing keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -201,15 +471,95 @@ class LinkedList:
         return self._size
 
 
+# Chain length above which a bucket is converted to a SortedBucket, and
+# length at or below which it is converted back to a LinkedList
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
+
+
+class SortedBucket:
+    """
+    Bucket that keeps its nodes sorted by (hash, key), so a key is found
+    with a binary search in O(log n) comparisons instead of a chain walk.
+    Used in place of a LinkedList for buckets with long chains.
+    Supported methods are the same as LinkedList: insert, insert_node,
+    remove, contains, length, iterator. Nodes must carry their hash.
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """
+        Initialize bucket holding the given nodes, for example the nodes of
+        a LinkedList being converted.
+        """
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        for node in self._nodes:
+            node.next = None
+
+        # Sort keys of the nodes, in the same order, for bisect
+        self._order = [(node.hash, node.key) for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SB [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in (hash, key) order."""
+        return iter(self._nodes)
+
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node in sorted position."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node in sorted position."""
+        node.next = None
+        index = bisect_right(self._order, (node.hash, node.key))
+        self._order.insert(index, (node.hash, node.key))
+        self._nodes.insert(index, node)
+
+    def _search(self, key: str, hash: int) -> int:
+        """Return the position of the node with matching key, or -1."""
+        index = bisect_left(self._order, (hash, key))
+        if index < len(self._order) and self._order[index] == (hash, key):
+            return index
+        return -1
+
+    def remove(self, key: str, hash: int) -> SLNode:
+        """
+        Remove node with matching key.
+        Return the removed node, or None if no match.
+        """
+        index = self._search(key, hash)
+        if index == -1:
+            return None
+        del self._order[index]
+        return self._nodes.pop(index)
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index = self._search(key, hash)
+        if index == -1:
+            return None
+        return self._nodes[index]
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
         """Initialize an entry for use in a hash map."""
         self.key = key
         self.value = value
 
+        # Full hash of the key, kept so the entry can be rehashed and
+        # compared without calling the hash function again
+        self.hash = hash
+
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
 
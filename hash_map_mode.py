@@ -0,0 +1,554 @@
+# Course: CS261 - Data Structures
+# Description: Streaming versions of find_mode for inputs too large to hold
+#              in a DynamicArray. stream_mode and top_k consume any iterable
+#              in chunks and count exactly with a separate chaining HashMap.
+#              For inputs with too many distinct values to count exactly,
+#              CountMinSketch estimates the frequency of any value in fixed
+#              memory, and SpaceSaving tracks the most frequent values with
+#              a fixed number of counters; both take their size from a
+#              memory budget or from the error bound wanted. parallel_mode
+#              counts chunks of the input in worker processes and merges
+#              the counts, partitioned by hash or by input range.
+
+
+import heapq
+import math
+import os
+import zlib
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from hash_map_batch import as_list, batch_hash
+from hash_map_include import (DynamicArray, get_hash_function,
+                              hash_function_1, mix_hash)
+from hash_map_sc import HashMap
+
+
+# Number of values read from the input and hashed together
+CHUNK_SIZE = 4096
+
+# Number of values sent to a worker process at a time by parallel_mode
+PARALLEL_CHUNK_SIZE = 100000
+
+
+def iter_chunks(iterable, size: int = CHUNK_SIZE):
+    """
+    Yields lists of up to size consecutive values of the iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ------------------- EXACT COUNTING --------------------------------------- #
+
+def count_values(iterable, chunk_size: int = CHUNK_SIZE,
+                 function=hash_function_1) -> HashMap:
+    """
+    Counts every value of the iterable.
+    :param iterable:    iterable of string values
+    :param chunk_size:  integer number of values hashed at a time
+    :param function:    hash function or registered name for the counts
+    :return:            HashMap of value to frequency
+    """
+    counts = HashMap(function=function)
+    for chunk in iter_chunks(iterable, chunk_size):
+        counts.increment_many(chunk)
+    return counts
+
+
+def stream_mode(iterable, chunk_size: int = CHUNK_SIZE,
+                function=hash_function_1) -> (DynamicArray, int):
+    """
+    Finds the mode and mode frequency of the values of any iterable,
+    reading it in chunks. Returns the same result as find_mode for the
+    same values, and an empty DynamicArray and 0 for an empty input.
+    :param iterable:    iterable of string values
+    :param chunk_size:  integer number of values hashed at a time
+    :param function:    hash function or registered name for the counts
+    :return:            tuple of mode DynamicArray and frequency integer
+    """
+    counts = HashMap(function=function)
+    mode_array = DynamicArray()
+    max_frequency = 0
+
+    for chunk in iter_chunks(iterable, chunk_size):
+        frequencies = counts.increment_many(chunk)
+        for index in range(len(chunk)):
+            count = frequencies[index]
+
+            # Same rule as find_mode: values join the mode array when they
+            # reach the maximum frequency, and replace it when they pass it
+            if count == max_frequency:
+                mode_array.append(chunk[index])
+            elif count > max_frequency:
+                max_frequency = count
+                mode_array = DynamicArray()
+                mode_array.append(chunk[index])
+
+    return mode_array, max_frequency
+
+
+def top_k(iterable, k: int, chunk_size: int = CHUNK_SIZE,
+          function=hash_function_1) -> DynamicArray:
+    """
+    Returns the k most frequent values of the iterable. Counting is exact;
+    selection keeps a heap of at most k candidates instead of sorting all
+    distinct values.
+    :param iterable:    iterable of string values
+    :param k:           integer number of values to return; none are
+                        returned if k is 0 or less
+    :param chunk_size:  integer number of values hashed at a time
+    :param function:    hash function or registered name for the counts
+    :return:            DynamicArray of (value, frequency) tuples, most
+                        frequent first
+    """
+    if k <= 0:
+        return DynamicArray()
+
+    counts = count_values(iterable, chunk_size, function)
+
+    heap = []
+    for value, count in counts.items():
+        if len(heap) < k:
+            heapq.heappush(heap, (count, value))
+        elif count > heap[0][0]:
+            heapq.heapreplace(heap, (count, value))
+
+    heap.sort(key=lambda item: (-item[0], item[1]))
+    return DynamicArray([(value, count) for count, value in heap])
+
+
+# ------------------- APPROXIMATE COUNTING --------------------------------- #
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: depth rows of width counters. A value adds to one
+    counter per row and its estimate is the smallest of those counters, so
+    estimates are never too low and exceed the true frequency by at most
+    e / width of the total count with probability 1 - exp(-depth).
+    Row positions come from one 64-bit hash split into two halves
+    (double hashing), so the hash function should spread all 64 bits.
+    """
+
+    def __init__(self, width: int = 2719, depth: int = 5,
+                 function=mix_hash) -> None:
+        """
+        Initialize an empty sketch of depth rows of width counters, using
+        8 * width * depth bytes.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        self._width = width
+        self._depth = depth
+        self._hash_function = get_hash_function(function)
+        self._counts = array('Q', bytes(8 * width * depth))
+        self._total = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float = 0.01,
+                   function=mix_hash) -> "CountMinSketch":
+        """
+        Returns a sketch whose estimates exceed the true frequency by at
+        most epsilon times the total count, with probability 1 - delta.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        width = math.ceil(math.e / epsilon)
+        depth = math.ceil(math.log(1 / delta))
+        return cls(width, depth, function)
+
+    @classmethod
+    def from_memory(cls, size: int, depth: int = 5,
+                    function=mix_hash) -> "CountMinSketch":
+        """
+        Returns the widest sketch of the given depth whose counters fit in
+        size bytes.
+        """
+        return cls(max(1, size // (8 * depth)), depth, function)
+
+    def _cells(self, hash: int) -> list:
+        """
+        Returns the counter index in each row for a hash.
+        """
+        width = self._width
+        first = hash & 0xFFFFFFFF
+        step = (hash >> 32) | 1
+        return [row * width + (first + row * step) % width
+                for row in range(self._depth)]
+
+    def _add_hash(self, hash: int, count: int) -> None:
+        """
+        Adds count to the counters of a hashed value.
+        """
+        counts = self._counts
+        for cell in self._cells(hash):
+            counts[cell] += count
+        self._total += count
+
+    def add(self, value: str, count: int = 1) -> None:
+        """
+        Adds count occurrences of value.
+        """
+        self._add_hash(self._hash_function(value), count)
+
+    def update(self, iterable, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Adds one occurrence of every value of the iterable, hashing it in
+        chunks with batch_hash.
+        """
+        for chunk in iter_chunks(iterable, chunk_size):
+            hashes = batch_hash(chunk, self._hash_function)
+            for index in range(hashes.length()):
+                self._add_hash(hashes[index], 1)
+
+    def estimate(self, value: str) -> int:
+        """
+        Returns the estimated frequency of value, which is never below the
+        true frequency.
+        """
+        counts = self._counts
+        return min(counts[cell] for cell in self._cells(self._hash_function(value)))
+
+    def total(self) -> int:
+        """
+        Returns the number of occurrences added.
+        """
+        return self._total
+
+    def error_bound(self) -> float:
+        """
+        Returns the amount estimates may exceed true frequencies by, with
+        probability 1 - exp(-depth).
+        """
+        return math.e / self._width * self._total
+
+    def memory(self) -> int:
+        """
+        Returns the number of bytes used by the counters.
+        """
+        return self._counts.itemsize * len(self._counts)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters: at most capacity values are counted. When
+    a new value arrives and all counters are taken, it replaces the value
+    with the smallest count and inherits that count as its error. Counts
+    are never too low and exceed the true frequency by at most
+    total / capacity, and every value more frequent than that is tracked.
+    """
+
+    def __init__(self, capacity: int = 1000, function=mix_hash) -> None:
+        """
+        Initialize an empty summary with the given number of counters.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+
+        # Value to [count, error], and a heap of (count, value) pairs in
+        # which entries whose count is out of date are skipped
+        self._counters = HashMap(2 * capacity, function)
+        self._heap = []
+        self._total = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float, function=mix_hash) -> "SpaceSaving":
+        """
+        Returns a summary whose counts exceed true frequencies by at most
+        epsilon times the total count.
+        """
+        if not 0 < epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1")
+        return cls(math.ceil(1 / epsilon), function)
+
+    def _pop_smallest(self) -> tuple:
+        """
+        Removes and returns the (count, value) pair of the tracked value
+        with the smallest count.
+        """
+        while True:
+            count, value = heapq.heappop(self._heap)
+            counter = self._counters.get(value)
+            if counter is not None and counter[0] == count:
+                return count, value
+
+    def _compact(self) -> None:
+        """
+        Rebuilds the heap from the live counters, dropping stale entries.
+        """
+        counters = self._counters.get_keys_and_values()
+        self._heap = [(counters[index][1][0], counters[index][0])
+                      for index in range(counters.length())]
+        heapq.heapify(self._heap)
+
+    def add(self, value: str, count: int = 1) -> None:
+        """
+        Adds count occurrences of value.
+        """
+        self._total += count
+        counter = self._counters.get(value)
+        if counter is not None:
+            counter[0] += count
+        elif self._counters.get_size() < self._capacity:
+            counter = [count, 0]
+            self._counters.put(value, counter)
+        else:
+            smallest, evicted = self._pop_smallest()
+            self._counters.remove(evicted)
+            counter = [smallest + count, smallest]
+            self._counters.put(value, counter)
+
+        heapq.heappush(self._heap, (counter[0], value))
+        if len(self._heap) > 4 * self._capacity:
+            self._compact()
+
+    def update(self, iterable) -> None:
+        """
+        Adds one occurrence of every value of the iterable.
+        """
+        for value in iterable:
+            self.add(value)
+
+    def estimate(self, value: str) -> tuple:
+        """
+        Returns the count and error of value; its true frequency is between
+        count - error and count. Untracked values return (0, 0), although
+        their frequency may be up to total / capacity.
+        """
+        counter = self._counters.get(value)
+        if counter is None:
+            return 0, 0
+        return counter[0], counter[1]
+
+    def top(self, k: int = None) -> DynamicArray:
+        """
+        Returns the k tracked values with the highest counts, or all of
+        them if k is None. None are returned if k is 0 or less.
+        :return:    DynamicArray of (value, count, error) tuples, highest
+                    count first
+        """
+        items = [(value, counter[0], counter[1])
+                 for value, counter in self._counters.items()]
+        items.sort(key=lambda item: (-item[1], item[0]))
+        if k is not None:
+            items = items[:max(k, 0)]
+        return DynamicArray(items)
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        Returns the tracked values with the highest count and that count,
+        in the same form as find_mode.
+        """
+        items = self.top()
+        mode_array = DynamicArray()
+        if items.length() == 0:
+            return mode_array, 0
+
+        frequency = items[0][1]
+        for index in range(items.length()):
+            if items[index][1] != frequency:
+                break
+            mode_array.append(items[index][0])
+        return mode_array, frequency
+
+    def total(self) -> int:
+        """
+        Returns the number of occurrences added.
+        """
+        return self._total
+
+    def error_bound(self) -> float:
+        """
+        Returns the most any count may exceed the true frequency by.
+        """
+        return self._total / self._capacity
+
+
+def approximate_mode(iterable, capacity: int = 1000,
+                     function=mix_hash) -> (DynamicArray, int):
+    """
+    Finds the approximate mode of the values of any iterable with a
+    SpaceSaving summary of the given number of counters. The returned
+    frequency may exceed the true one by at most len(values) / capacity.
+    :param iterable:    iterable of string values
+    :param capacity:    integer number of counters
+    :param function:    hash function or registered name for the counters
+    :return:            tuple of mode DynamicArray and frequency integer
+    """
+    summary = SpaceSaving(capacity, function)
+    summary.update(iterable)
+    return summary.mode()
+
+
+# ------------------- PARALLEL COUNTING ------------------------------------ #
+
+def _shard_of(value: str, shards: int) -> int:
+    """
+    Returns the hash partition of a value. CRC-32 is computed in C and is
+    the same in every process, unlike the built-in hash of a string.
+    """
+    if shards == 1:
+        return 0
+    return zlib.crc32(value.encode('utf-8')) % shards
+
+
+def _count_chunk(chunk: list, offset: int, shards: int, function) -> list:
+    """
+    Worker task of parallel_mode: counts a chunk of values and records the
+    input position of each value's last occurrence.
+    :param chunk:       list of string values
+    :param offset:      integer position of the chunk in the input
+    :param shards:      integer number of hash partitions of the result
+    :param function:    hash function or registered name for the counts
+    :return:            list of shards lists of (value, count, last
+                        position) tuples, each value in shard
+                        _shard_of(value, shards)
+    """
+    counts = HashMap(len(chunk), function)
+    for index in range(len(chunk)):
+        counter = counts.setdefault(chunk[index], [0, 0])
+        counter[0] += 1
+        counter[1] = offset + index
+
+    partitions = [[] for _ in range(shards)]
+    pairs = counts.get_keys_and_values()
+    for index in range(pairs.length()):
+        value, (count, last) = pairs[index]
+        partitions[_shard_of(value, shards)].append((value, count, last))
+    return partitions
+
+
+def _merge_counts(counts: HashMap, partition: list) -> None:
+    """
+    Adds (value, count, last position) tuples into a HashMap of value to
+    [count, last position].
+    """
+    for value, count, last in partition:
+        counter = counts.setdefault(value, [0, -1])
+        counter[0] += count
+        if last > counter[1]:
+            counter[1] = last
+
+
+def _shard_modes(counts: HashMap) -> list:
+    """
+    Returns (value, count, last position) tuples for the values with the
+    highest count in a HashMap of value to [count, last position].
+    """
+    modes, frequency = [], 0
+    pairs = counts.get_keys_and_values()
+    for index in range(pairs.length()):
+        value, (count, last) = pairs[index]
+        if count > frequency:
+            modes, frequency = [], count
+        if count == frequency:
+            modes.append((value, count, last))
+    return modes
+
+
+def _reduce_shard(partitions: list, function) -> list:
+    """
+    Worker task of parallel_mode: merges the counts of one hash partition
+    from every chunk and returns the partition's modes.
+    """
+    counts = HashMap(sum(len(partition) for partition in partitions), function)
+    for partition in partitions:
+        _merge_counts(counts, partition)
+    return _shard_modes(counts)
+
+
+def parallel_mode(values, workers: int = None, partition: str = 'hash',
+                  chunk_size: int = PARALLEL_CHUNK_SIZE,
+                  function=hash_function_1) -> (DynamicArray, int):
+    """
+    Finds the mode and mode frequency of the values with worker processes,
+    returning the same result as find_mode. Chunks of the input are counted
+    in parallel. With partition='hash' each chunk's counts are split by
+    hash, and every partition, which holds a disjoint set of values, is
+    merged in parallel too. With partition='range' the chunk counts are
+    merged in this process, which is simpler but serial.
+    Modes are ordered by the position of their last occurrence, which is
+    where find_mode adds them to its mode array.
+    :param values:      DynamicArray, sequence or iterable of string values
+    :param workers:     integer number of processes, default one per CPU
+    :param partition:   'hash' or 'range'
+    :param chunk_size:  integer number of values per worker task
+    :param function:    hash function or registered name for the counts
+    :return:            tuple of mode DynamicArray and frequency integer
+    """
+    if partition not in ('hash', 'range'):
+        raise ValueError(f"unknown partition: {partition!r}")
+    if isinstance(values, DynamicArray):
+        values = as_list(values)
+    workers = workers or os.cpu_count() or 1
+    shards = workers if partition == 'hash' else 1
+
+    counts = HashMap(function=function)
+    partitions = [[] for _ in range(shards)]
+
+    def collect(future) -> None:
+        result = future.result()
+        if partition == 'hash':
+            for shard in range(shards):
+                partitions[shard].append(result[shard])
+        else:
+            _merge_counts(counts, result[0])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of chunks in flight, so an iterator input
+        # is never read far ahead of the workers
+        pending, offset = set(), 0
+        for chunk in iter_chunks(values, chunk_size):
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+            pending.add(executor.submit(_count_chunk, chunk, offset, shards, function))
+            offset += len(chunk)
+        for future in pending:
+            collect(future)
+
+        if partition == 'hash':
+            candidates = []
+            for modes in executor.map(_reduce_shard, partitions,
+                                      [function] * shards):
+                candidates.extend(modes)
+        else:
+            candidates = _shard_modes(counts)
+
+    frequency = max((count for _, count, _ in candidates), default=0)
+    modes = sorted((last, value) for value, count, last in candidates
+                   if count == frequency)
+    return DynamicArray([value for _, value in modes]), frequency
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Streaming mode example")
+    print("------------------------")
+    values = ("Ubuntu " * 40 + "Mint " * 30 + "Arch " * 5).split()
+    values += ['event' + str(i) for i in range(1000)]
+    print("Stream of", len(values), "values: Ubuntu x40, Mint x30, Arch x5 and 1000 distinct events")
+
+    mode, frequency = stream_mode(iter(values))
+    print(f"stream_mode      : {mode}, Frequency: {frequency}")
+    print(f"top_k(k=3)       : {top_k(iter(values), 3)}")
+
+    sketch = CountMinSketch.from_error(0.01)
+    sketch.update(iter(values))
+    print(f"CountMinSketch   : Ubuntu ~ {sketch.estimate('Ubuntu')}, error bound "
+          f"{sketch.error_bound():.1f}, {sketch.memory()} bytes")
+
+    mode, frequency = approximate_mode(iter(values), capacity=50)
+    print(f"approximate_mode : {mode}, Frequency: {frequency} (50 counters)")
+
+    mode, frequency = parallel_mode(values, workers=2, chunk_size=200)
+    print(f"parallel_mode    : {mode}, Frequency: {frequency} (2 processes)")
@@ -1,352 +1,932 @@
-# Name: Katie Booth
-# OSU Email: boothcat@oregonstate.edu
-# Course: CS261 - Data Structures, Section 401
-# Description: Defines class HashMap, implemented with a dynamic array and
-#              open addressing, with methods put, empty buckets,
-#              table_load, clear, resize_table, get, contains_key, remove,
-#              get_keys_and_values for adding, removing, and manipulating
-#              elements of a hash map.
-
-
-from hash_map_include import (DynamicArray, HashEntry,
-                              hash_function_1, hash_function_2)
-
-
-class HashMap:
-    def __init__(self, capacity: int, function) -> None:
-        """
-        Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        self._buckets = DynamicArray()
-
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
-
-        self._hash_function = function
-        self._size = 0
-
-    def __str__(self) -> str:
-        """
-        Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        out = ''
-        for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
-        return out
-
-    def _next_prime(self, capacity: int) -> int:
-        """
-        Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
-        """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
-
-    def get_size(self) -> int:
-        """
-        Return size of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        return self._size
-
-    def get_capacity(self) -> int:
-        """
-        Return capacity of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        return self._capacity
-
-    # ------------------------------------------------------------------ #
-
-    def put(self, key: str, value: object) -> None:
-        """
-        Adds a key/value pair to the hash map.  If the given key exists in
-        the map, the value is updated.
-        :param key:     string to represent key
-        :param value:   object representing value of key
-        :return:        key/value pair added or updated in hash map
-        """
-        # Double the hash table's capacity if load factor is >= 0.5
-        if self.table_load() >= 0.5:
-            self.resize_table(2*self._capacity)
-
-        # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
-
-        # If bucket is empty or tombstone, add the key/value pair
-        if self._buckets[index] is None or self._buckets[index].is_tombstone is True:
-            self._buckets[index] = HashEntry(key, value)
-            self._size += 1     # Increment number of elements in hash map
-            return
-
-        # If bucket contains the key, update the key's value
-        if self._buckets[index].key == key:
-            self._buckets[index].value = value
-            return
-
-        # If bucket is not empty and not the key, implement quadratic probing
-        j = 0
-        new_index = index
-
-        # Continue probing until empty bucket is reached or key found
-        while self._buckets[new_index] is not None:
-            j += 1
-            new_index = (index + j**2) % self._capacity
-
-            if self._buckets[new_index] is None or self._buckets[new_index].is_tombstone is True:
-                self._buckets[new_index] = HashEntry(key, value)
-                self._size += 1
-                return
-
-            if self._buckets[new_index].key == key:
-                self._buckets[new_index].value = value
-                return
-
-    def table_load(self) -> float:
-        """
-        Returns the hash table load factor.
-        :return:    float representing load factor
-        """
-        return self._size / self._capacity
-
-    def empty_buckets(self) -> int:
-        """
-        Returns the number of empty buckets in the hash table.
-        :return:    integer representing number of empty buckets
-        """
-        count = 0
-
-        # For each bucket in table, check if bucket is empty or tombstone
-        for index in range(self._capacity):
-            if self._buckets[index] is None or self._buckets[index].is_tombstone is True:
-                count += 1
-        return count
-
-    def resize_table(self, new_capacity: int) -> None:
-        """
-        Changes the hash table's capacity to the given new_capacity or
-        next closest prime number. All key/value pairs remain in table
-        and hash table links are rehashed.
-        :param new_capacity:    integer representing new capacity
-        :return:                capacity is changed and links rehashed
-        """
-        # new_capacity cannot be smaller than number of elements in hash map
-        if new_capacity < self._size:
-            return
-
-        # If new_capacity is not prime, find the next closest prime number
-        if self._is_prime(new_capacity) is False:
-            new_capacity = self._next_prime(new_capacity)
-
-        # Store hash map's key/value pairs in array
-        array_key_values = self.get_keys_and_values()
-
-        # Update capacity and clear contents of hash table
-        self._capacity = new_capacity
-        self.clear()
-
-        # Rehash all hash table links
-        for index in range(array_key_values.length()):
-            key, value = array_key_values[index]
-            self.put(key, value)
-
-    def get(self, key: str) -> object:
-        """
-        Returns the value of the given key.
-        :param key:     string representing key
-        :return:        object representing value of key
-        """
-        # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
-
-        # Check if bucket is empty
-        if self._buckets[index] is None:
-            return
-
-        # If bucket has key, return key's value
-        if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-            return self._buckets[index].value
-
-        # If bucket is not empty and not the key, implement quadratic probing
-        j = 0
-        new_index = index
-
-        # Keep probing until empty bucket is reached or key is found
-        while self._buckets[new_index].key is not None:
-            j += 1
-            new_index = (index + j ** 2) % self._capacity
-
-            if self._buckets[new_index] is None:
-                return
-
-            if self._buckets[new_index].key == key and self._buckets[new_index].is_tombstone is False:
-                return self._buckets[new_index].value
-
-    def contains_key(self, key: str) -> bool:
-        """
-        Returns True if the given key is in the hash map and False otherwise.
-        :param key:     string representing key
-        :return:        True if key is in hash map, False otherwise.
-        """
-        # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
-
-        # If bucket is empty, return False
-        if self._buckets[index] is None:
-            return False
-
-        # If bucket contains key, return True
-        if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-            return True
-
-        # If bucket is not empty and not key, implement quadratic probing
-        j = 0
-        new_index = index
-
-        # Keep probing until empty bucket is reached or key is found
-        while self._buckets[new_index] is not None:
-            j += 1
-            new_index = (index + j ** 2) % self._capacity
-
-            if self._buckets[new_index] is None:
-                return False
-
-            if self._buckets[new_index].key == key and self._buckets[new_index].is_tombstone is False:
-                return True
-
-            if self._buckets[new_index].key == key and self._buckets[new_index].is_tombstone is True:
-                return False
-
-    def remove(self, key: str) -> None:
-        """
-        Removes the given key and its value from the hash map.
-        :param key:     string representing key
-        :return:        key/value pair is removed from hash map
-        """
-        # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
-
-        # Check if bucket is empty
-        if self._buckets[index] is None:
-            return
-
-        # If bucket has key, update tombstone to True, decrement hash map size
-        if self._buckets[index].key == key and self._buckets[index].is_tombstone is False:
-            self._buckets[index].is_tombstone = True
-            self._size -= 1
-            return
-
-        # If bucket is not empty and does not have key, implement quadratic probing
-        j = 0
-        new_index = index
-
-        # Keep probing until empty bucket is reached or key is found
-        while self._buckets[new_index] is not None:
-            j += 1
-            new_index = (index + j ** 2) % self._capacity
-
-            if self._buckets[new_index] is None:
-                return
-
-            if self._buckets[new_index].key == key and self._buckets[new_index].is_tombstone is False:
-                self._buckets[new_index].is_tombstone = True
-                self._size -= 1
-                return
-
-    def clear(self) -> None:
-        """
-        Clears contents of the hash map.  All buckets reset to None.
-        :return:    Contents of hash map cleared
-        """
-        # Reset size of hashmap to zero and clear array
-        self._size = 0
-        self._buckets = DynamicArray()
-
-        # Add buckets according to capacity and set contents to None
-        for num in range(self._capacity):
-            self._buckets.append(None)
-
-    def get_keys_and_values(self) -> DynamicArray:
-        """
-        Returns an array where each index contains a tuple of a key/value pair
-        in the hash map.
-        :return:        Array of key/value pairs
-        """
-        # Create new Dynamic Array
-        array = DynamicArray()
-
-        #  Search each bucket for key/value pairs
-        #  Store key/value pairs as a tuple and append to new array
-        for index in range(self._capacity):
-            if self._buckets[index] is not None and self._buckets[index].is_tombstone is False:
-                key_value = (self._buckets[index].key, self._buckets[index].value)
-                array.append(key_value)
-
-        return array
-
-# ------------------- BASIC TESTING ---------------------------------------- #
-
-if __name__ == "__main__":
-
-    print("\n Hashmap example")
-    print("-------------------")
-    m = HashMap(20, hash_function_1)
-    print("Create a HashMap object m with capacity = 20 using Hash Function 1: m = HashMap(20, hash_function_1)")
-    print("Add 30 key/value pairs with put() method:")
-    for i in range(30):
-        m.put('str' + str(i), i * 100)
-        if i % 10 == 9:
-            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
-            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
-                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
-    print("\tNotice how the capacity was adjusted to next prime number.")
-    print("\tFor this implementation capacity is doubled for load factor >= 0.5.")
-    print("\nResize the capacity to 11: m.resize(11)")
-    m.resize_table(11)
-    print("\tNotice how the load factor and empty buckets changes.")
-    print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
-          ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
-    print("\nCheck that key 'str10' exists: m.contains_key('str10')")
-    print("\tReturned", m.contains_key('str10'))
-    print("\nGet value of 'str10' key: m.get('str10')")
-    print("\tReturned", m.get('str10'))
-    print("\nRemove 'str10' key: m.remove('str10')")
-    m.remove('str10')
-    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
-    print("\tReturned", m.contains_key('str10'))
-    print("\nGet all key/value pairs: m.get_keys_and_values()")
-    print("\t", m.get_keys_and_values())
-    print("\nClear the hashmap: m.clear()")
-    m.clear()
-    print("\tHashmap table:", m.get_keys_and_values(), "Hashmap Size:", m.get_size(), "Hashmap Capacity:",
+# Name: Katie Booth
+# OSU Email: boothcat@oregonstate.edu
+# Course: CS261 - Data Structures, Section 401
+# Description: Defines class HashMap, implemented with a dynamic array and
+#              open addressing, with methods put, empty buckets,
+#              table_load, clear, resize_table, get, contains_key, remove,
+#              get_keys_and_values for adding, removing, and manipulating
+#              elements of a hash map.
+
+
+import time
+
+from hash_map_include import (DynamicArray, HashEntry,
+                              hash_function_1, hash_function_2,
+                              is_prime, next_prime, grow_prime,
+                              next_power_of_two, fibonacci_index,
+                              get_hash_function, STATS_SAMPLE,
+                              sample_buckets, summarize_lengths, bucket_skew)
+from hash_map_batch import batch_hash, as_list
+from hash_map_snapshot import (KIND_OPEN_ADDRESSING, load_snapshot,
+                               pack_indices, save_snapshot, unpack_indices)
+
+
+class HashMap:
+    # Number of old-table buckets moved by each operation while an
+    # incremental resize is in progress
+    _MIGRATE_STEP = 16
+
+    # Longest probe walk followed from one home bucket by stats()
+    _STATS_MAX_PROBES = 256
+
+    def __init__(self, capacity: int, function,
+                 incremental: bool = False,
+                 power_of_two: bool = False) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution.
+        function is a hash function, or the name of one registered in
+        hash_map_include.HASH_FUNCTIONS.
+        If incremental is True, growing the table is spread across the
+        following operations instead of rehashing everything at once.
+        If power_of_two is True, capacities are powers of two and bucket
+        indices use Fibonacci hashing instead of a prime modulus.
+        """
+        self._buckets = DynamicArray()
+        self._power_of_two = power_of_two
+
+        # capacity must be a prime number, or a power of two
+        self._capacity = self._fit_capacity(capacity)
+        for _ in range(self._capacity):
+            self._buckets.append(None)
+
+        self._hash_function = get_hash_function(function)
+        self._size = 0
+
+        # Tombstones in the active table, counted separately from live
+        # entries because both lengthen probe sequences
+        self._tombstones = 0
+
+        # Table being drained by an incremental resize, if any
+        self._incremental = incremental
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+        # Count of added and removed keys, resizes and clears, checked by
+        # iterators to detect modification
+        self._mod_count = 0
+
+        # Resizes over the map's lifetime and the seconds they took,
+        # including the migration steps of incremental resizes
+        self._resize_count = 0
+        self._resize_seconds = 0.0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _fit_capacity(self, capacity: int) -> int:
+        """
+        Returns the smallest valid capacity greater than or equal to the
+        given capacity: a prime, or a power of two in power_of_two mode.
+        """
+        if self._power_of_two:
+            return next_power_of_two(capacity)
+        return self._next_prime(capacity)
+
+    def _grow_capacity(self) -> int:
+        """
+        Returns the capacity to double the table to.
+        """
+        if self._power_of_two:
+            return 2 * self._capacity
+        return grow_prime(self._capacity)
+
+    def _index(self, hash: int, capacity: int) -> int:
+        """
+        Returns the home bucket of a hash in a table of the given capacity.
+        """
+        if self._power_of_two:
+            return fibonacci_index(hash, capacity)
+        return hash % capacity
+
+    def _probe(self, buckets: DynamicArray, capacity: int, key: str,
+               hash: int) -> tuple:
+        """
+        Follows the quadratic probe sequence of the given key through a
+        bucket array. Entries whose cached hash differs are skipped without
+        comparing keys.
+        :param buckets:     DynamicArray of HashEntry objects to search
+        :param capacity:    integer representing size of buckets
+        :param key:         string representing key
+        :param hash:        integer representing full hash of key
+        :return:            tuple of the index holding the key (or -1) and
+                            the first empty or tombstone index (or -1)
+        """
+        index = self._index(hash, capacity)
+        new_index = index
+        first_free = -1
+
+        # Every distinct quadratic probe of a prime capacity is visited by
+        # the time j reaches capacity // 2. Power-of-two tables probe with
+        # triangular numbers, which visit every bucket in capacity probes.
+        triangular = self._power_of_two
+        last = capacity + 1 if triangular else capacity // 2 + 2
+        for j in range(1, last):
+            entry = buckets[new_index]
+
+            # An empty bucket ends the probe sequence
+            if entry is None:
+                if first_free == -1:
+                    first_free = new_index
+                return -1, first_free
+
+            if entry.is_tombstone is True:
+                if first_free == -1:
+                    first_free = new_index
+            elif entry.hash == hash and entry.key == key:
+                return new_index, first_free
+
+            if triangular:
+                new_index = (index + (j * j + j) // 2) % capacity
+            else:
+                new_index = (index + j ** 2) % capacity
+
+        return -1, first_free
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Stores an entry whose key is known to be absent from the active
+        table in the first empty or tombstone bucket of its probe sequence,
+        using the entry's cached hash.
+        """
+        buckets, capacity = self._buckets, self._capacity
+        index = self._index(entry.hash, capacity)
+        new_index = index
+        j = 0
+        while buckets[new_index] is not None and buckets[new_index].is_tombstone is False:
+            j += 1
+            if self._power_of_two:
+                new_index = (index + (j * j + j) // 2) % capacity
+            else:
+                new_index = (index + j ** 2) % capacity
+
+        if buckets[new_index] is not None:
+            self._tombstones -= 1
+        buckets[new_index] = entry
+
+    def _new_buckets(self, capacity: int) -> DynamicArray:
+        """
+        Returns a DynamicArray of the given capacity with every bucket None.
+        """
+        return DynamicArray([None] * capacity)
+
+    def _start_resize(self, new_capacity: int) -> None:
+        """
+        Begins an incremental resize. A new, empty table becomes the active
+        table and the current one is kept until all of its buckets have been
+        migrated by later operations.
+        :param new_capacity:    integer representing new capacity
+        :return:                old and new tables coexist
+        """
+        # Only one resize can be in progress at a time
+        self._finish_resize()
+        start = time.perf_counter()
+
+        new_capacity = self._fit_capacity(new_capacity)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+
+        self._capacity = new_capacity
+        self._buckets = self._new_buckets(new_capacity)
+        self._tombstones = 0
+        self._mod_count += 1
+        self._resize_count += 1
+        self._resize_seconds += time.perf_counter() - start
+
+    def _migrate(self, count: int) -> None:
+        """
+        Moves up to count buckets from the old table into the active table.
+        Migrated entries are shared by both tables, so updates and removals
+        made through either table stay consistent until the old table is
+        dropped.
+        :param count:   integer representing number of buckets to move
+        :return:        buckets migrated, old table dropped when drained
+        """
+        if self._old_buckets is None:
+            return
+        start = time.perf_counter()
+
+        end = min(self._migrate_index + count, self._old_capacity)
+        for index in range(self._migrate_index, end):
+            entry = self._old_buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                # Keys are unique across both tables, so the entry can go in
+                # the first free bucket of its probe sequence
+                self._place(entry)
+
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+            self._old_capacity = 0
+            self._migrate_index = 0
+        self._resize_seconds += time.perf_counter() - start
+
+    def _finish_resize(self) -> None:
+        """
+        Completes any incremental resize that is in progress.
+        """
+        self._migrate(self._old_capacity)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        self._put(key, value, self._hash_function(key))
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds or updates a key/value pair given the key's precomputed hash.
+        """
+        entry, created = self._entry_for(key, hash, value)
+        if not created:
+            entry.value = value
+
+    def _entry_for(self, key: str, hash: int, default: object) -> tuple:
+        """
+        Returns the live entry for the given key, adding one holding default
+        if the key is absent. The key's probe sequence is followed once,
+        and again only if adding the key first resizes the table.
+        :param key:         string representing key
+        :param hash:        integer representing full hash of key
+        :param default:     object stored for a new key
+        :return:            tuple of the HashEntry and True if it was added
+        """
+        self._migrate(self._MIGRATE_STEP)
+
+        # If the active table contains the key, return its entry
+        found, free = self._probe(self._buckets, self._capacity, key, hash)
+        if found != -1:
+            return self._buckets[found], False
+
+        # A key not yet migrated out of the old table is used in place
+        if self._old_buckets is not None:
+            old_found, _ = self._probe(self._old_buckets, self._old_capacity, key, hash)
+            if old_found != -1:
+                return self._old_buckets[old_found], False
+
+        # Only a new key can resize the table, so updating the value of an
+        # existing key never disturbs iteration. Tombstones lengthen probe sequences just like live entries, so
+        # they count towards the 0.5 threshold. Double the hash table's
+        # capacity when live entries dominate; when tombstones dominate,
+        # rehash at the same capacity to clean them out instead.
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self._size >= self._tombstones:
+                new_capacity = self._grow_capacity()
+            else:
+                new_capacity = self._capacity
+
+            if self._incremental:
+                self._start_resize(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+            _, free = self._probe(self._buckets, self._capacity, key, hash)
+
+        # Otherwise add the key/value pair to the first empty or tombstone
+        # bucket of the probe sequence
+        if self._buckets[free] is not None:
+            self._tombstones -= 1
+        entry = HashEntry(key, default, hash)
+        self._buckets[free] = entry
+        self._size += 1     # Increment number of elements in hash map
+        self._mod_count += 1
+        return entry, True
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table. Tombstones
+        count as empty, so this is every bucket not holding a live entry.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def get_tombstone_count(self) -> int:
+        """
+        Returns the number of tombstones in the hash table.
+        :return:    integer representing number of tombstones
+        """
+        return self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the hash table's capacity to the given new_capacity or
+        next closest prime number. All key/value pairs remain in table
+        and hash table links are rehashed.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity is changed and links rehashed
+        """
+        # new_capacity cannot be smaller than number of elements in hash map
+        if new_capacity < self._size:
+            return
+        start = time.perf_counter()
+
+        # If new_capacity is not prime, find the next closest prime number
+        # (or power of two in power_of_two mode)
+        new_capacity = self._fit_capacity(new_capacity)
+
+        # Quadratic probing is only guaranteed to find a free bucket while
+        # the table is less than half full, so keep doubling until it is
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._fit_capacity(2 * new_capacity)
+
+        # Keep the current tables, including any old table of an
+        # incremental resize, then update capacity and clear the hash table
+        buckets, capacity = self._buckets, self._capacity
+        old_buckets, old_capacity = self._old_buckets, self._old_capacity
+        migrate_index = self._migrate_index
+        self._capacity = new_capacity
+        size = self._size
+        self.clear()
+
+        # Rehash all live entries straight from the old tables using their
+        # cached hashes
+        for entry in self._iter_entries(buckets, 0, capacity):
+            self._place(entry)
+        if old_buckets is not None:
+            for entry in self._iter_entries(old_buckets, migrate_index, old_capacity):
+                self._place(entry)
+        self._size = size
+
+        self._resize_count += 1
+        self._resize_seconds += time.perf_counter() - start
+
+    def _find(self, key: str, hash: int) -> tuple:
+        """
+        Returns the live entry for the given key from the active table or
+        the old table of an incremental resize, or None if no match.
+        :param key:     string representing key
+        :param hash:    integer representing full hash of key
+        :return:        tuple of the HashEntry (or None) and True if it was
+                        found in the active table
+        """
+        found, _ = self._probe(self._buckets, self._capacity, key, hash)
+        if found != -1:
+            return self._buckets[found], True
+
+        if self._old_buckets is not None:
+            found, _ = self._probe(self._old_buckets, self._old_capacity, key, hash)
+            if found != -1:
+                return self._old_buckets[found], False
+        return None, False
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        self._migrate(self._MIGRATE_STEP)
+
+        entry, _ = self._find(key, self._hash_function(key))
+        if entry is None:
+            return
+        return entry.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        self._migrate(self._MIGRATE_STEP)
+
+        entry, _ = self._find(key, self._hash_function(key))
+        return entry is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        self._remove(key, self._hash_function(key))
+
+    def _remove(self, key: str, hash: int) -> HashEntry:
+        """
+        Removes the given key given its precomputed hash and returns its
+        entry, or None if the key was not found.
+        """
+        self._migrate(self._MIGRATE_STEP)
+
+        # If key is found, update tombstone to True, decrement hash map size
+        entry, active = self._find(key, hash)
+        if entry is None:
+            return None
+        entry.is_tombstone = True
+        self._size -= 1
+        self._mod_count += 1
+
+        # Tombstones left in the old table are dropped with it
+        if active:
+            self._tombstones += 1
+        return entry
+
+    # ------------------- SINGLE-PROBE UPDATES ----------------------------- #
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of the given key, which starts at 0 if the
+        key is absent, hashing and probing only once.
+        :param key:     string representing key
+        :param delta:   number added to the key's value
+        :return:        new value of key
+        """
+        entry, _ = self._entry_for(key, self._hash_function(key), 0)
+        entry.value += delta
+        return entry.value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of the given key, first adding the key with value
+        default if it is absent.
+        :param key:         string representing key
+        :param default:     object stored if key is absent
+        :return:            object representing value of key
+        """
+        entry, _ = self._entry_for(key, self._hash_function(key), default)
+        return entry.value
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Replaces the value of the given key with function(value), where the
+        value of an absent key is default.
+        :param key:         string representing key
+        :param function:    callable taking and returning a value
+        :param default:     object passed to function if key is absent
+        :return:            new value of key
+        """
+        entry, _ = self._entry_for(key, self._hash_function(key), default)
+        entry.value = function(entry.value)
+        return entry.value
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Removes the given key and returns its value, or returns default if
+        the key is not in the hash map.
+        :param key:         string representing key
+        :param default:     object returned if key is absent
+        :return:            object representing removed value or default
+        """
+        entry = self._remove(key, self._hash_function(key))
+        if entry is None:
+            return default
+        return entry.value
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map.  All buckets reset to None.
+        :return:    Contents of hash map cleared
+        """
+        # Reset size of hashmap to zero and clear array
+        self._size = 0
+        self._tombstones = 0
+        self._mod_count += 1
+        self._buckets = self._new_buckets(self._capacity)
+
+        # Drop any old table left by an incremental resize
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        # Create new Dynamic Array
+        array = DynamicArray()
+
+        #  Search each bucket for key/value pairs
+        #  Store key/value pairs as a tuple and append to new array
+        for index in range(self._capacity):
+            if self._buckets[index] is not None and self._buckets[index].is_tombstone is False:
+                key_value = (self._buckets[index].key, self._buckets[index].value)
+                array.append(key_value)
+
+        # Include entries not yet migrated out of the old table
+        for index in range(self._migrate_index, self._old_capacity):
+            entry = self._old_buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                array.append((entry.key, entry.value))
+
+        return array
+
+    # ------------------- ITERATION ---------------------------------------- #
+
+    @staticmethod
+    def _iter_entries(buckets: DynamicArray, start: int, end: int):
+        """
+        Yields the live entries of buckets[start:end], skipping empty
+        buckets and tombstones.
+        """
+        for index in range(start, end):
+            entry = buckets[index]
+            if entry is not None and entry.is_tombstone is False:
+                yield entry
+
+    def items(self):
+        """
+        Yields a (key, value) tuple for every key/value pair in the hash map
+        without copying the table. Any incremental resize in progress is
+        completed first. Adding or removing keys during iteration raises
+        RuntimeError; updating values does not.
+        """
+        self._finish_resize()
+        mod_count = self._mod_count
+        for entry in self._iter_entries(self._buckets, 0, self._capacity):
+            yield entry.key, entry.value
+            if self._mod_count != mod_count:
+                raise RuntimeError("HashMap changed size during iteration")
+
+    def keys(self):
+        """
+        Yields every key in the hash map, as items does.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Yields every value in the hash map, as items does.
+        """
+        for _, value in self.items():
+            yield value
+
+    def hashed_items(self):
+        """
+        Yields a (key, value, hash) tuple for every key/value pair, with the
+        hash cached when the key was added, as items does.
+        """
+        self._finish_resize()
+        mod_count = self._mod_count
+        for entry in self._iter_entries(self._buckets, 0, self._capacity):
+            yield entry.key, entry.value, entry.hash
+            if self._mod_count != mod_count:
+                raise RuntimeError("HashMap changed size during iteration")
+
+    def __iter__(self):
+        """
+        Return an iterator over the keys of the hash map.
+        """
+        return self.keys()
+
+    # ------------------- STATISTICS --------------------------------------- #
+
+    def stats(self, sample: int = STATS_SAMPLE,
+              max_probes: int = _STATS_MAX_PROBES) -> dict:
+        """
+        Returns statistics of the table's probe sequences, measured on a
+        random sample of home buckets so that the cost does not grow with
+        the table. The probe sequence of each sampled bucket is followed to
+        its first empty bucket, as a lookup of an absent key would be, and
+        every key whose home is that bucket is found on the way. Miss costs
+        therefore assume absent keys hash uniformly; a high skew means they
+        do not. Lookup costs count the buckets examined, and each walk stops
+        after max_probes buckets. An incremental resize in progress is left
+        as it is: the old table is sampled too, and keys not yet migrated
+        are measured there, while misses and skew describe the active table.
+        :param sample:      integer number of home buckets to sample in each
+                            table, or None to measure every bucket
+        :param max_probes:  integer number of buckets, at least 1, after
+                            which a walk is cut short, or None to follow it
+                            to the end
+        :return:            dictionary of size, capacity, load,
+                            empty_buckets, tombstones, sampled_buckets,
+                            truncated (walks cut short), hit and miss
+                            (lookup cost summaries with mean, max, p50, p90,
+                            p99 and histogram), skew (about 1.0 when keys
+                            are spread as by a random hash function),
+                            resizes and resize_seconds
+        """
+        if max_probes is not None and max_probes < 1:
+            raise ValueError("max_probes must be at least 1")
+
+        hits, misses = [], []
+        counts, truncated = self._sample_probes(
+            self._buckets, self._capacity, 0, sample, max_probes, hits, misses)
+        sampled, size = len(counts), self._size
+
+        if self._old_buckets is not None:
+            old_counts, old_truncated = self._sample_probes(
+                self._old_buckets, self._old_capacity, self._migrate_index,
+                sample, max_probes, hits, None)
+            sampled += len(old_counts)
+            truncated += old_truncated
+            # Skew is measured on the active table, which holds every key
+            # but the estimated number still waiting in the old table
+            if old_counts:
+                waiting = sum(old_counts) * self._old_capacity / len(old_counts)
+                size = max(0, round(size - waiting))
+
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'tombstones': self._tombstones,
+            'sampled_buckets': sampled,
+            'truncated': truncated,
+            'hit': summarize_lengths(hits),
+            'miss': summarize_lengths(misses),
+            'skew': bucket_skew(counts, size, self._capacity),
+            'resizes': self._resize_count,
+            'resize_seconds': self._resize_seconds,
+        }
+
+    def _sample_probes(self, buckets: DynamicArray, capacity: int,
+                       first_live: int, sample: int, max_probes: int,
+                       hits: list, misses: list) -> tuple:
+        """
+        Follows the probe sequences of a random sample of home buckets of
+        the given table for stats(). Entries in buckets below first_live
+        have already been migrated and are skipped.
+        :param buckets:     DynamicArray table to walk
+        :param capacity:    integer capacity of that table
+        :param first_live:  integer index of the first bucket whose entries
+                            belong to this table
+        :param sample:      integer number of home buckets, or None for all
+        :param max_probes:  integer longest walk, or None for no limit
+        :param hits:        list extended with the cost of finding each key
+                            whose home is a sampled bucket
+        :param misses:      list extended with the cost of a miss from each
+                            sampled bucket, or None
+        :return:            tuple of the list of keys homed in each sampled
+                            bucket and the number of walks cut short
+        """
+        triangular = self._power_of_two
+        longest = capacity if triangular else capacity // 2 + 1
+        limit = longest if max_probes is None else min(max_probes, longest)
+        counts, truncated = [], 0
+
+        for index in sample_buckets(capacity, sample):
+            new_index, count = index, 0
+            for j in range(1, limit + 1):
+                entry = buckets[new_index]
+                if entry is None:
+                    break
+                if (entry.is_tombstone is False and new_index >= first_live
+                        and self._index(entry.hash, capacity) == index):
+                    hits.append(j)
+                    count += 1
+
+                if triangular:
+                    new_index = (index + (j * j + j) // 2) % capacity
+                else:
+                    new_index = (index + j ** 2) % capacity
+            else:
+                if limit < longest:
+                    truncated += 1
+            if misses is not None:
+                misses.append(j)
+            counts.append(count)
+        return counts, truncated
+
+    # ------------------- SNAPSHOTS ---------------------------------------- #
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map to a binary snapshot file. Every entry is stored
+        with its bucket index and cached hash, and tombstones with theirs,
+        so load restores the same table without rehashing. Any incremental
+        resize in progress is completed first.
+        :param path:    file path to write
+        :return:        snapshot file written
+        """
+        self._finish_resize()
+
+        layout, hashes, keys, values, tombstones = [], [], [], [], []
+        for index in range(self._capacity):
+            entry = self._buckets[index]
+            if entry is None:
+                continue
+            if entry.is_tombstone is True:
+                tombstones.append(index)
+            else:
+                layout.append(index)
+                hashes.append(entry.hash)
+                keys.append(entry.key)
+                values.append(entry.value)
+
+        options = {'incremental': self._incremental,
+                   'power_of_two': self._power_of_two}
+        save_snapshot(path, KIND_OPEN_ADDRESSING, self._capacity,
+                      self._hash_function, options, pack_indices(layout),
+                      hashes, keys, values, pack_indices(tombstones))
+
+    @classmethod
+    def load(cls, path: str, function=None) -> "HashMap":
+        """
+        Returns the hash map saved in a snapshot file. The header is
+        validated and the entries are put back in their saved buckets.
+        :param path:        file path to read
+        :param function:    hash function, required only if the map was
+                            saved with one not in HASH_FUNCTIONS
+        :return:            HashMap restored from the snapshot
+        """
+        snapshot = load_snapshot(path, KIND_OPEN_ADDRESSING, function)
+        capacity = snapshot['capacity']
+        hash_map = cls(capacity, snapshot['function'], **snapshot['options'])
+        if hash_map._capacity != capacity:
+            raise ValueError("snapshot capacity is not valid for this map")
+
+        buckets = [None] * capacity
+        for index, hash, key, value in zip(snapshot['layout'], snapshot['hashes'],
+                                           snapshot['keys'], snapshot['values']):
+            buckets[index] = HashEntry(key, value, hash)
+
+        tombstones = unpack_indices(snapshot['extra'])
+        for index in tombstones:
+            if index >= capacity or buckets[index] is not None:
+                raise ValueError("snapshot tombstones do not match its layout")
+            buckets[index] = HashEntry(None, None)
+            buckets[index].is_tombstone = True
+
+        hash_map._buckets = DynamicArray(buckets)
+        hash_map._size = len(snapshot['keys'])
+        hash_map._tombstones = len(tombstones)
+        return hash_map
+
+    # ------------------- BULK OPERATIONS ---------------------------------- #
+
+    @classmethod
+    def from_pairs(cls, pairs, function, **options) -> "HashMap":
+        """
+        Returns a new hash map holding the given key/value pairs, sized up
+        front so that loading them does not resize the table.
+        :param pairs:       DynamicArray or sequence of (key, value) tuples
+        :param function:    hash function or registered name
+        :param options:     other constructor arguments
+        :return:            HashMap containing the pairs
+        """
+        count = pairs.length() if isinstance(pairs, DynamicArray) else len(pairs)
+        hash_map = cls(2 * count + 1, function, **options)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the table once so that count more entries keep the load
+        factor, including tombstones, below 0.5.
+        """
+        needed = 2 * (self._size + self._tombstones + count) + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds or updates every key/value pair. The table is presized for the
+        whole batch and all keys are hashed up front in one batch_hash call.
+        :param pairs:   DynamicArray or sequence of (key, value) tuples
+        :return:        key/value pairs added or updated in hash map
+        """
+        pairs = as_list(pairs)
+        hashes = batch_hash([pair[0] for pair in pairs], self._hash_function)
+        self._reserve(len(pairs))
+        for index in range(len(pairs)):
+            key, value = pairs[index]
+            self._put(key, value, hashes[index])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns the values of the given keys, None for missing keys.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        DynamicArray of values in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            self._migrate(self._MIGRATE_STEP)
+            entry, _ = self._find(keys[index], hashes[index])
+            values.append(None if entry is None else entry.value)
+        return values
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns whether each of the given keys is in the hash map.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        DynamicArray of booleans in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        found = DynamicArray()
+        for index in range(len(keys)):
+            self._migrate(self._MIGRATE_STEP)
+            entry, _ = self._find(keys[index], hashes[index])
+            found.append(entry is not None)
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every given key that is in the hash map.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        keys removed from hash map
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        for index in range(len(keys)):
+            self._remove(keys[index], hashes[index])
+
+    def increment_many(self, keys, delta: int = 1) -> DynamicArray:
+        """
+        Adds delta to the value of every given key, as increment does, with
+        all keys hashed up front in one batch_hash call.
+        :param keys:    DynamicArray or sequence of string keys
+        :param delta:   number added to each key's value
+        :return:        DynamicArray of the new values in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            entry, _ = self._entry_for(keys[index], hashes[index], 0)
+            entry.value += delta
+            values.append(entry.value)
+        return values
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Hashmap example")
+    print("-------------------")
+    m = HashMap(20, hash_function_1)
+    print("Create a HashMap object m with capacity = 20 using Hash Function 1: m = HashMap(20, hash_function_1)")
+    print("Add 30 key/value pairs with put() method:")
+    for i in range(30):
+        m.put('str' + str(i), i * 100)
+        if i % 10 == 9:
+            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
+            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
+    print("\tNotice how the capacity was adjusted to next prime number.")
+    print("\tFor this implementation capacity is doubled for load factor >= 0.5.")
+    print("\nResize the capacity to 11: m.resize(11)")
+    m.resize_table(11)
+    print("\tNotice how the load factor and empty buckets changes.")
+    print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+          ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
+    print("\nCheck that key 'str10' exists: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet value of 'str10' key: m.get('str10')")
+    print("\tReturned", m.get('str10'))
+    print("\nRemove 'str10' key: m.remove('str10')")
+    m.remove('str10')
+    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet all key/value pairs: m.get_keys_and_values()")
+    print("\t", m.get_keys_and_values())
+    print("\nClear the hashmap: m.clear()")
+    m.clear()
+    print("\tHashmap table:", m.get_keys_and_values(), "Hashmap Size:", m.get_size(), "Hashmap Capacity:",
           m.get_capacity())
\ No newline at end of file
@@ -0,0 +1,313 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, an open addressing hash map that uses
+#              Robin Hood hashing: linear probing where an inserted key
+#              takes the slot of any resident key that is closer to its
+#              home slot, and removal shifts the following keys back
+#              instead of leaving tombstones. This keeps probe lengths
+#              short and even at load factors up to 0.9. Exposes the same
+#              methods as the open addressing map in hash_map_oa.py: put,
+#              empty_buckets, table_load, clear, resize_table, get,
+#              contains_key, remove, get_keys_and_values.
+
+
+from array import array
+
+from hash_map_include import (DynamicArray, HASH_MASK_64, get_hash_function,
+                              grow_prime, hash_function_1, hash_function_2,
+                              next_prime)
+
+
+# Probe distance stored for a slot that holds no key
+_EMPTY = -1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function,
+                 max_load: float = 0.875) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing for
+        collision resolution. The table doubles when a put would take the
+        load factor above max_load, which must be below 1.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._hash_function = get_hash_function(function)
+        self._max_load = max_load
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._distances[i] == _EMPTY:
+                entry = 'None'
+            else:
+                entry = (f"K: {self._keys[i]} V: {self._values[i]} "
+                         f"D: {self._distances[i]}")
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the table with empty parallel arrays of the given capacity.
+        Each slot stores the key's cached hash, the key, the value and the
+        key's distance from its home slot, or _EMPTY.
+        """
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._distances = array('l', [_EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Returns the slot index holding the given key, or -1 if the key is
+        not in the hash map. The search stops as soon as it reaches a slot
+        whose key is closer to home than the searched key would be, since
+        Robin Hood insertion would have placed the key before it.
+        :param key:     string representing key
+        :param hash:    integer hash of key
+        :return:        integer slot index or -1
+        """
+        distances, hashes, keys = self._distances, self._hashes, self._keys
+        capacity = self._capacity
+        index = hash % capacity
+        distance = 0
+
+        while distances[index] >= distance:
+            if hashes[index] == hash and keys[index] == key:
+                return index
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+        return -1
+
+    def _insert(self, key: str, value: object, hash: int, index: int,
+                distance: int) -> None:
+        """
+        Stores a key known to be absent from the table, starting at the
+        given slot and probe distance. Resident keys closer to their home
+        slot are displaced and carried forward until an empty slot is found.
+        """
+        distances, hashes = self._distances, self._hashes
+        keys, values = self._keys, self._values
+        capacity = self._capacity
+
+        while distances[index] != _EMPTY:
+            if distances[index] < distance:
+                # Take the slot from the richer key and keep inserting it
+                hash, hashes[index] = hashes[index], hash
+                key, keys[index] = keys[index], key
+                value, values[index] = values[index], value
+                distance, distances[index] = distances[index], distance
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+        hashes[index] = hash
+        keys[index] = key
+        values[index] = value
+        distances[index] = distance
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        hash = self._hash_function(key) & HASH_MASK_64
+        distances, hashes, keys = self._distances, self._hashes, self._keys
+        capacity = self._capacity
+        index = hash % capacity
+        distance = 0
+
+        # Walk the probe sequence while resident keys are at least as far
+        # from home; the key, if present, is in this stretch
+        while distances[index] >= distance:
+            if hashes[index] == hash and keys[index] == key:
+                self._values[index] = value
+                return
+            index += 1
+            if index == capacity:
+                index = 0
+            distance += 1
+
+        # Double the table if the new key would exceed the load factor,
+        # then insert from the start of the (new) probe sequence
+        if (self._size + 1) / capacity > self._max_load:
+            self.resize_table(grow_prime(capacity))
+            self._insert(key, value, hash, hash % self._capacity, 0)
+        else:
+            self._insert(key, value, hash, index, distance)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the hash table's capacity to the given new_capacity or
+        next closest prime number. All key/value pairs remain in table
+        and are reinserted from their cached hashes.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity is changed and links rehashed
+        """
+        # Linear probing needs at least one empty slot
+        if new_capacity <= self._size:
+            return
+
+        new_capacity = next_prime(new_capacity)
+
+        distances, hashes = self._distances, self._hashes
+        keys, values = self._keys, self._values
+        old_capacity = self._capacity
+
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        for index in range(old_capacity):
+            if distances[index] != _EMPTY:
+                hash = hashes[index]
+                self._insert(keys[index], values[index], hash,
+                             hash % new_capacity, 0)
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._find(key, self._hash_function(key) & HASH_MASK_64) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map. The keys
+        after it are shifted back one slot until one is found that is
+        already in its home slot, so no tombstone is needed.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+
+        distances, hashes = self._distances, self._hashes
+        keys, values = self._keys, self._values
+        capacity = self._capacity
+
+        next_index = index + 1 if index + 1 < capacity else 0
+        while distances[next_index] > 0:
+            hashes[index] = hashes[next_index]
+            keys[index] = keys[next_index]
+            values[index] = values[next_index]
+            distances[index] = distances[next_index] - 1
+            index = next_index
+            next_index = index + 1 if index + 1 < capacity else 0
+
+        distances[index] = _EMPTY
+        keys[index] = None
+        values[index] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map without changing its capacity.
+        :return:    Contents of hash map cleared
+        """
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        array_key_values = DynamicArray()
+        distances, keys, values = self._distances, self._keys, self._values
+        for index in range(self._capacity):
+            if distances[index] != _EMPTY:
+                array_key_values.append((keys[index], values[index]))
+        return array_key_values
+
+    def max_probe_length(self) -> int:
+        """
+        Returns the longest distance of any key from its home slot, which
+        bounds the number of slots a lookup inspects.
+        :return:    integer representing longest probe distance
+        """
+        longest = 0
+        for distance in self._distances:
+            if distance > longest:
+                longest = distance
+        return longest
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Robin Hood hashmap example")
+    print("----------------------------")
+    m = HashMap(20, hash_function_2)
+    print("Create a HashMap object m with capacity = 20 using Hash Function 2: m = HashMap(20, hash_function_2)")
+    print("Add 30 key/value pairs with put() method:")
+    for i in range(30):
+        m.put('str' + str(i), i * 100)
+        if i % 10 == 9:
+            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
+            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity(),
+                  ", Longest Probe:", m.max_probe_length())
+    print("\tFor this implementation capacity is doubled for load factor > 0.875.")
+    print("\nRemove 'str10' key: m.remove('str10')")
+    m.remove('str10')
+    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet value of 'str20' key: m.get('str20')")
+    print("\tReturned", m.get('str20'))
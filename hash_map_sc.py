@@ -5,33 +5,90 @@
 #              singly chained linked list, with methods put, empty buckets,
 #              table_load, clear, resize_table, get, contains_key, remove,
 #              get_keys_and_values for adding, removing, and manipulating
-#              elements of a hash map. Defines function find_mode which uses
-#              a hash map to find the mode of a given dynamic array.
+#              elements of a hash map. Buckets whose chains grow long are
+#              converted to sorted buckets searched in O(log n). Defines
+#              function find_mode which uses a hash map to find the mode of
+#              a given dynamic array.
 
 
-from hash_map_include import (DynamicArray, LinkedList,
-                              hash_function_1, hash_function_2)
+import time
+
+from hash_map_include import (DynamicArray, LinkedList, SLNode, SortedBucket,
+                              TREEIFY_THRESHOLD, UNTREEIFY_THRESHOLD,
+                              hash_function_1, hash_function_2,
+                              is_prime, next_prime, grow_prime,
+                              next_power_of_two, fibonacci_index,
+                              get_hash_function, STATS_SAMPLE,
+                              sample_buckets, summarize_lengths, bucket_skew)
+from hash_map_batch import batch_hash, as_list
+from hash_map_snapshot import (KIND_SEPARATE_CHAINING, load_snapshot,
+                               pack_indices, save_snapshot, unpack_indices)
 
 
 class HashMap:
+    # Class of the chain nodes the map creates; subclasses may use an
+    # SLNode subclass to store more data on each node
+    _node_class = SLNode
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 max_load: float = 1.0,
+                 growth_factor: float = 2.0,
+                 shrink_load: float = None,
+                 power_of_two: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        function is a hash function, or the name of one registered in
+        hash_map_include.HASH_FUNCTIONS.
+        The table grows by growth_factor when put() takes the load factor
+        above max_load (None disables growing), and shrinks by the same
+        factor when remove() takes it below shrink_load (None disables
+        shrinking) and that gives a smaller prime or power of two. The
+        table never shrinks below its initial capacity.
+        If power_of_two is True, capacities are powers of two and bucket
+        indices use Fibonacci hashing instead of a prime modulus.
+        A chain longer than TREEIFY_THRESHOLD is converted to a SortedBucket,
+        and back to a LinkedList at UNTREEIFY_THRESHOLD, so a hash function
+        that piles keys into one bucket costs O(log n) per lookup rather
+        than O(n).
         """
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if (shrink_load is not None and max_load is not None
+                and shrink_load * growth_factor >= max_load):
+            raise ValueError("shrink_load * growth_factor must be less "
+                             "than max_load")
+
         self._buckets = DynamicArray()
+        self._power_of_two = power_of_two
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, or a power of two
+        self._capacity = self._fit_capacity(capacity)
         for _ in range(self._capacity):
             self._buckets.append(LinkedList())
 
-        self._hash_function = function
+        self._hash_function = get_hash_function(function)
         self._size = 0
 
+        # Buckets with an empty chain, kept up to date by every operation
+        self._empty_count = self._capacity
+
+        # Count of added and removed keys, resizes and clears, checked by
+        # iterators to detect modification
+        self._mod_count = 0
+
+        # Resizes over the map's lifetime and the seconds they took
+        self._resize_count = 0
+        self._resize_seconds = 0.0
+
+        # Growth policy
+        self._max_load = max_load
+        self._growth_factor = growth_factor
+        self._shrink_load = shrink_load
+        self._min_capacity = self._capacity
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -45,35 +102,15 @@ class HashMap:
     def _next_prime(self, capacity: int) -> int:
         """
         Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
+        return is_prime(capacity)
 
     def get_size(self) -> int:
         """
@@ -91,6 +128,51 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    def _fit_capacity(self, capacity: int) -> int:
+        """
+        Returns the smallest valid capacity greater than or equal to the
+        given capacity: a prime, or a power of two in power_of_two mode.
+        """
+        if self._power_of_two:
+            return next_power_of_two(capacity)
+        return self._next_prime(capacity)
+
+    def _grow_capacity(self) -> int:
+        """
+        Returns the capacity to grow the table to. Doubling a prime
+        capacity uses the precomputed prime ladder. The result is always
+        larger than the current capacity, even for growth factors so small
+        that the product rounds back down to it.
+        """
+        if self._growth_factor == 2 and not self._power_of_two:
+            return grow_prime(self._capacity)
+        return max(self._capacity + 1,
+                   int(self._capacity * self._growth_factor))
+
+    def _index(self, hash: int) -> int:
+        """
+        Returns the bucket index of a hash in the current table.
+        """
+        if self._power_of_two:
+            return fibonacci_index(hash, self._capacity)
+        return hash % self._capacity
+
+    def _treeify(self, index: int) -> None:
+        """
+        Converts the bucket at index from a LinkedList to a SortedBucket.
+        """
+        self._buckets[index] = SortedBucket(self._buckets[index])
+
+    def _untreeify(self, index: int) -> None:
+        """
+        Converts the bucket at index from a SortedBucket to a LinkedList,
+        relinking its nodes.
+        """
+        chain = LinkedList()
+        for node in self._buckets[index]:
+            chain.insert_node(node)
+        self._buckets[index] = chain
+
     def put(self, key: str, value: object) -> None:
         """
         Adds a key/value pair to the hash map.  If the given key exists in
@@ -99,33 +181,57 @@ class HashMap:
         :param value:   object representing value of key
         :return:        key/value pair added or updated in hash map
         """
+        self._put(key, value, self._hash_function(key))
+
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Adds or updates a key/value pair given the key's precomputed hash.
+        """
+        node, created = self._node_for(key, hash, value)
+        if not created:
+            node.value = value
+
+    def _node_for(self, key: str, hash: int, default: object) -> tuple:
+        """
+        Returns the node for the given key, adding one holding default if
+        the key is absent. The key's bucket is searched once.
+        :param key:         string representing key
+        :param hash:        integer representing full hash of key
+        :param default:     object stored for a new key
+        :return:            tuple of the SLNode and True if it was added
+        """
         # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
+        index = self._index(hash)
 
         # Check whether key exists in bucket's linked list
-        node = self._buckets[index].contains(key)
-
-        # If key does not exist, add new key/value pair
-        # Otherwise, update the key's value
-        if node is None:
-            self._buckets[index].insert(key,value)
-            self._size += 1     # Increment number of elements in hash map
-        else:
-            node.value = value
+        bucket = self._buckets[index]
+        node = bucket.contains(key, hash)
+        if node is not None:
+            return node, False
+
+        # Add new key/value pair with its hash
+        if bucket.length() == 0:
+            self._empty_count -= 1
+        node = self._node_class(key, default, None, hash)
+        bucket.insert_node(node)
+        self._size += 1     # Increment number of elements in hash map
+        self._mod_count += 1
+        if (isinstance(bucket, LinkedList)
+                and bucket.length() > TREEIFY_THRESHOLD):
+            self._treeify(index)
+
+        # Grow the table if the load factor exceeds the maximum
+        if self._max_load is not None and self.table_load() > self._max_load:
+            self.resize_table(self._grow_capacity())
+        return node, True
 
     def empty_buckets(self) -> int:
         """
-        Returns the number of empty buckets in the hash table
+        Returns the number of empty buckets in the hash table. The count is
+        maintained as buckets fill and empty, so no buckets are scanned.
         :return:    integer representing number of empty buckets
         """
-        empty_count = 0
-
-        # For each bucket in the table, check the length of the linkedlist
-        for num in range(self._buckets.length()):
-            list = self._buckets[num]
-            if list.length() == 0:      # Zero length = empty bucket
-                empty_count += 1
-        return empty_count
+        return self._empty_count
 
     def table_load(self) -> float:
         """
@@ -142,6 +248,8 @@ class HashMap:
         """
         # Reset size of hashmap to zero and clear array
         self._size = 0
+        self._empty_count = self._capacity
+        self._mod_count += 1
         self._buckets = DynamicArray()
 
         # Add empty linked list to each bucket
@@ -159,22 +267,38 @@ class HashMap:
         # New capacity must be greater than or equal to 1
         if new_capacity < 1:
             return
+        start = time.perf_counter()
 
         # If new_capacity is not prime, find the next closest prime number
-        if self._is_prime(new_capacity) is False:
-            new_capacity = self._next_prime(new_capacity)
-
-        # Store all hash map key/value pairs in an array
-        array_key_values = self.get_keys_and_values()
+        # (or power of two in power_of_two mode)
+        new_capacity = self._fit_capacity(new_capacity)
 
-        # Update hash table capacity and clear the hash table
+        # Keep the current buckets, then update capacity and clear the table
+        old_buckets = self._buckets
+        size = self._size
         self._capacity = new_capacity
         self.clear()
 
-        # Rehash all hash table links
-        for index in range(array_key_values.length()):
-            key, value = array_key_values[index]
-            self.put(key, value)
+        # Relink every existing node into its new bucket using the cached
+        # hash, so no nodes are allocated and the hash function is not
+        # called again
+        long_chains = []
+        for node in self._iter_nodes(old_buckets):
+            new_index = self._index(node.hash)
+            bucket = self._buckets[new_index]
+            if bucket.length() == 0:
+                self._empty_count -= 1
+            bucket.insert_node(node)
+            if bucket.length() == TREEIFY_THRESHOLD + 1:
+                long_chains.append(new_index)
+        self._size = size
+
+        # Convert the chains that grew too long once they are complete
+        for index in long_chains:
+            self._treeify(index)
+
+        self._resize_count += 1
+        self._resize_seconds += time.perf_counter() - start
 
     def get(self, key: str) -> object:
         """
@@ -183,10 +307,11 @@ class HashMap:
         :return:        object representing value of key
         """
         # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
+        hash = self._hash_function(key)
+        index = self._index(hash)
 
         # Check whether key exists in bucket's linked list
-        node = self._buckets[index].contains(key)
+        node = self._buckets[index].contains(key, hash)
 
         # If key does not exist, return None, otherwise return value
         if node is None:
@@ -200,10 +325,11 @@ class HashMap:
         :return:        True if key is in hash map, False otherwise
         """
         # Calculate index in hash table based on hash function
-        index = self._hash_function(key) % self._capacity
+        hash = self._hash_function(key)
+        index = self._index(hash)
 
         # Check whether key exists in bucket's linked list
-        node = self._buckets[index].contains(key)
+        node = self._buckets[index].contains(key, hash)
 
         # If key does not exist, return False, otherwise True
         if node is None:
@@ -216,14 +342,90 @@ class HashMap:
         :param key:     string representing key
         :return:        key/value pair is removed from hash map
         """
-        # Check if key exists in the hash map
-        if self.contains_key(key) is False:
-            return
+        self._remove(key, self._hash_function(key))
+
+    def _remove(self, key: str, hash: int) -> SLNode:
+        """
+        Removes the given key given its precomputed hash and returns its
+        node, or None if the key was not found.
+        """
+        # Calculate index in hash table based on hash function
+        index = self._index(hash)
+
+        # Remove key from the bucket if it exists
+        bucket = self._buckets[index]
+        node = bucket.remove(key, hash)
+        if node is not None:
+            self._size -= 1        # Decrement number of elements in hash map
+            self._mod_count += 1
+            if bucket.length() == 0:
+                self._empty_count += 1
+            elif (isinstance(bucket, SortedBucket)
+                  and bucket.length() <= UNTREEIFY_THRESHOLD):
+                self._untreeify(index)
+
+            # Shrink the table if the load factor falls below the minimum,
+            # unless the smaller capacity rounds back up to the current one
+            if (self._shrink_load is not None
+                    and self._capacity > self._min_capacity
+                    and self.table_load() < self._shrink_load):
+                new_capacity = self._fit_capacity(max(
+                    int(self._capacity / self._growth_factor),
+                    self._min_capacity))
+                if new_capacity < self._capacity:
+                    self.resize_table(new_capacity)
+        return node
+
+    # ------------------- SINGLE-PROBE UPDATES ----------------------------- #
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of the given key, which starts at 0 if the
+        key is absent, hashing and searching the bucket only once.
+        :param key:     string representing key
+        :param delta:   number added to the key's value
+        :return:        new value of key
+        """
+        node, _ = self._node_for(key, self._hash_function(key), 0)
+        node.value += delta
+        return node.value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Returns the value of the given key, first adding the key with value
+        default if it is absent.
+        :param key:         string representing key
+        :param default:     object stored if key is absent
+        :return:            object representing value of key
+        """
+        node, _ = self._node_for(key, self._hash_function(key), default)
+        return node.value
 
-        # If key exists, calculate index and remove key from the bucket
-        index = self._hash_function(key) % self._capacity
-        self._buckets[index].remove(key)
-        self._size -= 1        # Decrement number of elements in hash map
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Replaces the value of the given key with function(value), where the
+        value of an absent key is default.
+        :param key:         string representing key
+        :param function:    callable taking and returning a value
+        :param default:     object passed to function if key is absent
+        :return:            new value of key
+        """
+        node, _ = self._node_for(key, self._hash_function(key), default)
+        node.value = function(node.value)
+        return node.value
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Removes the given key and returns its value, or returns default if
+        the key is not in the hash map.
+        :param key:         string representing key
+        :param default:     object returned if key is absent
+        :return:            object representing removed value or default
+        """
+        node = self._remove(key, self._hash_function(key))
+        if node is None:
+            return default
+        return node.value
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -243,6 +445,279 @@ class HashMap:
 
         return array
 
+    # ------------------- ITERATION ---------------------------------------- #
+
+    @staticmethod
+    def _iter_nodes(buckets: DynamicArray):
+        """
+        Yields every node of every bucket. Each node is yielded after the
+        chain has moved past it, so it may be relinked elsewhere.
+        """
+        for index in range(buckets.length()):
+            for node in buckets[index]:
+                yield node
+
+    def items(self):
+        """
+        Yields a (key, value) tuple for every key/value pair in the hash map
+        without copying the table. Adding or removing keys during iteration
+        raises RuntimeError; updating values does not.
+        """
+        mod_count = self._mod_count
+        for node in self._iter_nodes(self._buckets):
+            yield node.key, node.value
+            if self._mod_count != mod_count:
+                raise RuntimeError("HashMap changed size during iteration")
+
+    def keys(self):
+        """
+        Yields every key in the hash map, as items does.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """
+        Yields every value in the hash map, as items does.
+        """
+        for _, value in self.items():
+            yield value
+
+    def hashed_items(self):
+        """
+        Yields a (key, value, hash) tuple for every key/value pair, with the
+        hash cached when the key was added, as items does.
+        """
+        mod_count = self._mod_count
+        for node in self._iter_nodes(self._buckets):
+            yield node.key, node.value, node.hash
+            if self._mod_count != mod_count:
+                raise RuntimeError("HashMap changed size during iteration")
+
+    def __iter__(self):
+        """
+        Return an iterator over the keys of the hash map.
+        """
+        return self.keys()
+
+    # ------------------- STATISTICS --------------------------------------- #
+
+    def stats(self, sample: int = STATS_SAMPLE) -> dict:
+        """
+        Returns statistics of the table's chains, measured on a random
+        sample of buckets so that the cost does not grow with the table.
+        Lookup costs count the nodes compared: a key's position in its
+        chain for hits and the whole chain for misses, or the binary search
+        steps of a SortedBucket. Hits are measured for every key in the
+        sampled buckets. Misses are measured in the sampled buckets, as if
+        absent keys hashed uniformly; a high skew means they do not.
+        :param sample:  integer number of buckets to sample, or None to
+                        measure every bucket
+        :return:        dictionary of size, capacity, load, empty_buckets,
+                        sampled_buckets, sorted_buckets (in the sample),
+                        hit and miss (lookup cost summaries with mean, max,
+                        p50, p90, p99 and histogram), skew (about 1.0 when
+                        keys are spread as by a random hash function),
+                        resizes and resize_seconds
+        """
+        indices = sample_buckets(self._capacity, sample)
+        hits, misses, counts = [], [], []
+        trees = 0
+        for index in indices:
+            bucket = self._buckets[index]
+            length = bucket.length()
+            counts.append(length)
+            if isinstance(bucket, SortedBucket):
+                trees += 1
+                misses.append(length.bit_length())
+                hits.extend([length.bit_length()] * length)
+            else:
+                misses.append(length)
+                hits.extend(range(1, length + 1))
+
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'load': self.table_load(),
+            'empty_buckets': self._empty_count,
+            'sampled_buckets': len(indices),
+            'sorted_buckets': trees,
+            'hit': summarize_lengths(hits),
+            'miss': summarize_lengths(misses),
+            'skew': bucket_skew(counts, self._size, self._capacity),
+            'resizes': self._resize_count,
+            'resize_seconds': self._resize_seconds,
+        }
+
+    # ------------------- SNAPSHOTS ---------------------------------------- #
+
+    def save(self, path: str) -> None:
+        """
+        Writes the hash map to a binary snapshot file. Every node is stored
+        with its bucket index and cached hash, in chain order, together
+        with the indices of sorted buckets, so load restores the same
+        buckets without rehashing.
+        :param path:    file path to write
+        :return:        snapshot file written
+        """
+        layout, hashes, keys, values = [], [], [], []
+        trees = []
+        for index in range(self._capacity):
+            if isinstance(self._buckets[index], SortedBucket):
+                trees.append(index)
+            for node in self._buckets[index]:
+                layout.append(index)
+                hashes.append(node.hash)
+                keys.append(node.key)
+                values.append(node.value)
+
+        options = {'max_load': self._max_load,
+                   'growth_factor': self._growth_factor,
+                   'shrink_load': self._shrink_load,
+                   'power_of_two': self._power_of_two}
+        save_snapshot(path, KIND_SEPARATE_CHAINING, self._capacity,
+                      self._hash_function, options, pack_indices(layout),
+                      hashes, keys, values,
+                      pack_indices([self._min_capacity] + trees))
+
+    @classmethod
+    def load(cls, path: str, function=None) -> "HashMap":
+        """
+        Returns the hash map saved in a snapshot file. The header is
+        validated and the nodes are linked back into their saved buckets.
+        :param path:        file path to read
+        :param function:    hash function, required only if the map was
+                            saved with one not in HASH_FUNCTIONS
+        :return:            HashMap restored from the snapshot
+        """
+        snapshot = load_snapshot(path, KIND_SEPARATE_CHAINING, function)
+        capacity = snapshot['capacity']
+        hash_map = cls(capacity, snapshot['function'], **snapshot['options'])
+        if hash_map._capacity != capacity:
+            raise ValueError("snapshot capacity is not valid for this map")
+        extra = unpack_indices(snapshot['extra'])
+        hash_map._min_capacity, trees = extra[0], extra[1:]
+        if trees and max(trees) >= capacity:
+            raise ValueError("snapshot layout does not match its capacity")
+
+        # Link nodes in reverse so that each chain keeps its saved order
+        layout, hashes = snapshot['layout'], snapshot['hashes']
+        keys, values = snapshot['keys'], snapshot['values']
+        buckets = hash_map._buckets
+        for position in range(len(keys) - 1, -1, -1):
+            node = hash_map._node_class(keys[position], values[position],
+                                        None, hashes[position])
+            buckets[layout[position]].insert_node(node)
+
+        for index in range(capacity):
+            if buckets[index].length() > 0:
+                hash_map._empty_count -= 1
+        for index in trees:
+            hash_map._treeify(index)
+        hash_map._size = len(keys)
+        return hash_map
+
+    # ------------------- BULK OPERATIONS ---------------------------------- #
+
+    @classmethod
+    def from_pairs(cls, pairs, function: callable = hash_function_1,
+                   **options) -> "HashMap":
+        """
+        Returns a new hash map holding the given key/value pairs, sized up
+        front so that loading them does not resize the table.
+        :param pairs:       DynamicArray or sequence of (key, value) tuples
+        :param function:    hash function or registered name
+        :param options:     other constructor arguments
+        :return:            HashMap containing the pairs
+        """
+        count = pairs.length() if isinstance(pairs, DynamicArray) else len(pairs)
+        max_load = options.get('max_load', 1.0) or 1.0
+        hash_map = cls(int(count / max_load) + 1, function, **options)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the table once so that count more entries stay within the
+        maximum load factor.
+        """
+        max_load = self._max_load or 1.0
+        needed = int((self._size + count) / max_load) + 1
+        if needed > self._capacity:
+            self.resize_table(needed)
+
+    def put_many(self, pairs) -> None:
+        """
+        Adds or updates every key/value pair. The table is presized for the
+        whole batch and all keys are hashed up front in one batch_hash call.
+        :param pairs:   DynamicArray or sequence of (key, value) tuples
+        :return:        key/value pairs added or updated in hash map
+        """
+        pairs = as_list(pairs)
+        hashes = batch_hash([pair[0] for pair in pairs], self._hash_function)
+        self._reserve(len(pairs))
+        for index in range(len(pairs)):
+            key, value = pairs[index]
+            self._put(key, value, hashes[index])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns the values of the given keys, None for missing keys.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        DynamicArray of values in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            hash = hashes[index]
+            node = self._buckets[self._index(hash)].contains(keys[index], hash)
+            values.append(None if node is None else node.value)
+        return values
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns whether each of the given keys is in the hash map.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        DynamicArray of booleans in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        found = DynamicArray()
+        for index in range(len(keys)):
+            hash = hashes[index]
+            node = self._buckets[self._index(hash)].contains(keys[index], hash)
+            found.append(node is not None)
+        return found
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every given key that is in the hash map.
+        :param keys:    DynamicArray or sequence of string keys
+        :return:        keys removed from hash map
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        for index in range(len(keys)):
+            self._remove(keys[index], hashes[index])
+
+    def increment_many(self, keys, delta: int = 1) -> DynamicArray:
+        """
+        Adds delta to the value of every given key, as increment does, with
+        all keys hashed up front in one batch_hash call.
+        :param keys:    DynamicArray or sequence of string keys
+        :param delta:   number added to each key's value
+        :return:        DynamicArray of the new values in key order
+        """
+        keys = as_list(keys)
+        hashes = batch_hash(keys, self._hash_function)
+        values = DynamicArray()
+        for index in range(len(keys)):
+            node, _ = self._node_for(keys[index], hashes[index], 0)
+            node.value += delta
+            values.append(node.value)
+        return values
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
@@ -263,17 +738,11 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     # Add key/value pair of first element/frequency to hash map
     map.put(da[0], 1)
 
-    # Iterate through array da elements
-    # If new element, add element/frequency to hash map
-    # Otherwise, update element's frequency value in hash map
+    # Iterate through array da elements, counting each element's frequency
+    # with a single hash and bucket search
     for index in range(1, da.length()):
         key = da[index]
-        if map.contains_key(key) is False:
-            count = 1
-            map.put(key, count)
-        else:
-            count = map.get(key) + 1
-            map.put(key, count)
+        count = map.increment(key)
 
         # Check if element's frequency equals max_frequency
         if count == max_frequency:
@@ -303,7 +772,7 @@ if __name__ == "__main__":
             print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
                   ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
     print("\tNotice how the capacity was adjusted to next prime number: 23")
-    print("\tFor this implementation capacity does not change based on load factor.")
+    print("\tFor this implementation capacity is doubled for load factor > 1.0, so it grew to 47.")
     print("\nResize the capacity to 11: m.resize(11)")
     m.resize_table(11)
     print("\tNotice how the load factor and empty buckets changes.")
@@ -0,0 +1,230 @@
+# Course: CS261 - Data Structures
+# Description: Binary snapshot format shared by the save and load methods
+#              of the hash maps. A snapshot is a fixed header (magic,
+#              format version, map kind, capacity, size, hash function
+#              fingerprint, checksum), the name of the hash function and
+#              the map's options, then a
+#              sequence of length-prefixed sections holding the table
+#              layout, cached hashes, keys and values as packed arrays.
+#              Maps are restored bucket for bucket from the layout, so
+#              loading never calls the hash function.
+
+
+import json
+import pickle
+import struct
+import zlib
+from array import array
+
+from hash_map_include import HASH_FUNCTIONS, get_hash_function
+
+
+MAGIC = b'HASHMAP\x00'
+VERSION = 2
+
+# Map kinds recorded in the header
+KIND_OPEN_ADDRESSING = 1
+KIND_SEPARATE_CHAINING = 2
+
+# Encodings of the hash section: packed unsigned 64-bit integers, or a
+# pickled list for hash functions returning other integers
+_HASHES_PACKED = 0
+_HASHES_PICKLED = 1
+
+# magic, version, kind, hash encoding, capacity, size, hash function
+# fingerprint, length and CRC-32 of everything after the header
+_HEADER = struct.Struct('<8sHBBQQIQI')
+_LENGTH = struct.Struct('<Q')
+
+# Keys hashed by function_fingerprint
+_FINGERPRINT_KEYS = ('', 'a', 'b', 'ab', 'ba', 'snapshot', 'hash map',
+                     '0123456789', 'caf\u00e9')
+
+# Buffer size for snapshot files
+_BUFFER_SIZE = 1 << 20
+
+
+def function_name(function) -> str:
+    """
+    Returns the name under which function is registered in HASH_FUNCTIONS,
+    or an empty string if it is not registered.
+    """
+    for name, registered in HASH_FUNCTIONS.items():
+        if registered is function:
+            return name
+    return ''
+
+
+def function_fingerprint(function) -> int:
+    """
+    Returns a CRC-32 of the hashes the function gives a few fixed keys.
+    Unlike the registered name it identifies any hash function, including
+    seeded and unregistered ones.
+    """
+    checksum = 0
+    for key in _FINGERPRINT_KEYS:
+        checksum = zlib.crc32(str(function(key)).encode('ascii'), checksum)
+    return checksum
+
+
+def pack_indices(indices: list) -> bytes:
+    """
+    Returns a list of non-negative integers packed as unsigned 64-bit.
+    """
+    return array('Q', indices).tobytes()
+
+
+def unpack_indices(data: bytes) -> array:
+    """
+    Returns the integers packed by pack_indices.
+    """
+    indices = array('Q')
+    indices.frombytes(data)
+    return indices
+
+
+def pack_keys(keys: list) -> bytes:
+    """
+    Returns string keys as their packed UTF-8 lengths followed by the
+    concatenated UTF-8 bytes.
+    """
+    encoded = [key.encode('utf-8') for key in keys]
+    lengths = array('Q', [len(data) for data in encoded]).tobytes()
+    return _LENGTH.pack(len(lengths)) + lengths + b''.join(encoded)
+
+
+def unpack_keys(data: bytes) -> list:
+    """
+    Returns the string keys packed by pack_keys.
+    """
+    (length,) = _LENGTH.unpack_from(data)
+    lengths = unpack_indices(data[_LENGTH.size:_LENGTH.size + length])
+    blob = memoryview(data)[_LENGTH.size + length:]
+    keys, offset = [], 0
+    for size in lengths:
+        keys.append(str(blob[offset:offset + size], 'utf-8'))
+        offset += size
+    return keys
+
+
+def save_snapshot(path: str, kind: int, capacity: int, function,
+                  options: dict, layout: bytes, hashes: list, keys: list,
+                  values: list, extra: bytes = b'') -> None:
+    """
+    Writes a snapshot file.
+    :param path:        file path to write
+    :param kind:        KIND_OPEN_ADDRESSING or KIND_SEPARATE_CHAINING
+    :param capacity:    integer capacity of the table
+    :param function:    hash function of the map
+    :param options:     dictionary of constructor options, stored as JSON
+    :param layout:      packed bucket index of each entry
+    :param hashes:      list of the entries' cached hashes
+    :param keys:        list of the entries' string keys
+    :param values:      list of the entries' values, stored with pickle
+    :param extra:       map specific section, such as tombstone positions
+    """
+    try:
+        packed_hashes = array('Q', hashes).tobytes()
+        encoding = _HASHES_PACKED
+    except OverflowError:
+        packed_hashes = pickle.dumps(hashes, pickle.HIGHEST_PROTOCOL)
+        encoding = _HASHES_PICKLED
+
+    sections = (
+        function_name(function).encode('utf-8'),
+        json.dumps(options).encode('utf-8'),
+        layout,
+        packed_hashes,
+        pack_keys(keys),
+        pickle.dumps(values, pickle.HIGHEST_PROTOCOL),
+        extra,
+    )
+    body = []
+    for section in sections:
+        body.append(_LENGTH.pack(len(section)))
+        body.append(section)
+
+    checksum, length = 0, 0
+    for part in body:
+        checksum = zlib.crc32(part, checksum)
+        length += len(part)
+
+    header = _HEADER.pack(MAGIC, VERSION, kind, encoding, capacity,
+                          len(keys), function_fingerprint(function), length,
+                          checksum)
+    with open(path, 'wb', buffering=_BUFFER_SIZE) as file:
+        file.write(header)
+        file.writelines(body)
+
+
+def load_snapshot(path: str, kind: int, function=None) -> dict:
+    """
+    Reads and validates a snapshot file written by save_snapshot.
+    The hash function is looked up by its recorded name; a function
+    must be passed for maps saved with an unregistered hash function.
+    Either way its hashes of a few fixed keys must match the ones saved.
+    Values are unpickled, so only load snapshots from trusted sources.
+    :param path:        file path to read
+    :param kind:        map kind the snapshot must hold
+    :param function:    hash function, if not registered
+    :return:            dictionary with capacity, function, options,
+                        layout, hashes, keys, values and extra
+    """
+    with open(path, 'rb', buffering=_BUFFER_SIZE) as file:
+        data = file.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError("snapshot is truncated")
+    (magic, version, saved_kind, encoding, capacity, size, fingerprint,
+     length, checksum) = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a hash map snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    if saved_kind != kind:
+        raise ValueError("snapshot holds a different kind of hash map")
+
+    body = memoryview(data)[_HEADER.size:]
+    if len(body) != length or zlib.crc32(body) != checksum:
+        raise ValueError("snapshot checksum does not match")
+
+    sections, offset = [], 0
+    while offset < length:
+        (section_length,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        sections.append(body[offset:offset + section_length].tobytes())
+        offset += section_length
+    name, options, layout, hashes, keys, values, extra = sections
+
+    name = name.decode('utf-8')
+    if function is None:
+        if not name:
+            raise ValueError("snapshot was saved with an unregistered hash "
+                             "function, which must be passed to load")
+        function = get_hash_function(name)
+    elif name and get_hash_function(function) is not HASH_FUNCTIONS[name]:
+        raise ValueError(f"snapshot was saved with hash function {name!r}")
+    if function_fingerprint(get_hash_function(function)) != fingerprint:
+        raise ValueError("snapshot was saved with a different hash function")
+
+    if encoding == _HASHES_PACKED:
+        hashes = unpack_indices(hashes)
+    else:
+        hashes = pickle.loads(hashes)
+
+    snapshot = {
+        'capacity': capacity,
+        'function': function,
+        'options': json.loads(options),
+        'layout': unpack_indices(layout),
+        'hashes': hashes,
+        'keys': unpack_keys(keys),
+        'values': pickle.loads(values),
+        'extra': extra,
+    }
+    counts = {len(snapshot[field]) for field in ('layout', 'hashes', 'keys', 'values')}
+    if counts != {size}:
+        raise ValueError("snapshot sections do not match its size")
+    if snapshot['layout'] and max(snapshot['layout']) >= capacity:
+        raise ValueError("snapshot layout does not match its capacity")
+    return snapshot
@@ -0,0 +1,315 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, an open addressing hash map that keeps
+#              keys, values, cached hashes and slot states in parallel flat
+#              arrays (struct-of-arrays) instead of allocating one HashEntry
+#              object per key. Exposes the same methods as the open
+#              addressing map in hash_map_oa.py: put, empty_buckets,
+#              table_load, clear, resize_table, get, contains_key, remove,
+#              get_keys_and_values.
+
+
+from array import array
+
+from hash_map_include import (DynamicArray, hash_function_2, is_prime,
+                              next_prime, grow_prime)
+
+
+# Slot states stored in the state byte array
+_EMPTY = 0
+_FULL = 1
+_TOMBSTONE = 2
+
+# Cached hashes are stored as unsigned 64-bit integers
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing for collision
+        resolution and stores its table as parallel flat arrays
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._allocate(self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            state = self._states[i]
+            if state == _EMPTY:
+                entry = 'None'
+            else:
+                entry = (f"K: {self._keys[i]} V: {self._values[i]} "
+                         f"TS: {state == _TOMBSTONE}")
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the table with empty parallel arrays of the given capacity.
+        :param capacity:    integer representing number of slots
+        :return:            empty table allocated
+        """
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def _hash(self, key: str) -> int:
+        """
+        Returns the hash of the given key, truncated to 64 bits so it fits
+        in the cached hash array.
+        :param key:     string representing key
+        :return:        integer hash of key
+        """
+        return self._hash_function(key) & _HASH_MASK
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Returns the slot index holding the given key, or -1 if the key is
+        not in the hash map. Slots whose cached hash differs are skipped
+        without comparing keys.
+        :param key:     string representing key
+        :param hash:    integer hash of key
+        :return:        integer slot index or -1
+        """
+        states, hashes, keys = self._states, self._hashes, self._keys
+        index = hash % self._capacity
+        new_index = index
+        j = 0
+
+        # Keep probing until an empty slot is reached or key is found. The
+        # probe sequence repeats after capacity steps, so stop there too.
+        while states[new_index] != _EMPTY and j < self._capacity:
+            if (states[new_index] == _FULL and hashes[new_index] == hash
+                    and keys[new_index] == key):
+                return new_index
+            j += 1
+            new_index = (index + j ** 2) % self._capacity
+        return -1
+
+    def _insert_new(self, key: str, value: object, hash: int) -> None:
+        """
+        Stores a key known to be absent from the table in the first empty
+        slot of its probe sequence. Used when rehashing. Raises
+        RuntimeError if no empty slot is found within capacity probes,
+        which only happens if the table is at least half full.
+        """
+        states = self._states
+        index = hash % self._capacity
+        new_index = index
+        j = 0
+        while states[new_index] != _EMPTY:
+            j += 1
+            if j >= self._capacity:
+                raise RuntimeError("no empty slot in probe sequence")
+            new_index = (index + j ** 2) % self._capacity
+
+        states[new_index] = _FULL
+        self._hashes[new_index] = hash
+        self._keys[new_index] = key
+        self._values[new_index] = value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        # Tombstones lengthen probe sequences just like live entries, so
+        # they count towards the 0.5 threshold. Grow when live entries
+        # dominate, otherwise rehash at the same capacity to drop tombstones.
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            if self._size >= self._tombstones:
+                self.resize_table(grow_prime(self._capacity))
+            else:
+                self.resize_table(self._capacity)
+
+        hash = self._hash(key)
+        states, hashes, keys = self._states, self._hashes, self._keys
+        index = hash % self._capacity
+        new_index = index
+        j = 0
+        first_tombstone = -1
+
+        # Probe until an empty slot is reached, remembering the first
+        # tombstone so it can be reused if the key is not found
+        while states[new_index] != _EMPTY:
+            if states[new_index] == _FULL:
+                if hashes[new_index] == hash and keys[new_index] == key:
+                    self._values[new_index] = value
+                    return
+            elif first_tombstone == -1:
+                first_tombstone = new_index
+            j += 1
+            if j >= self._capacity:
+                if first_tombstone == -1:
+                    raise RuntimeError("no empty slot in probe sequence")
+                break
+            new_index = (index + j ** 2) % self._capacity
+
+        if first_tombstone != -1:
+            new_index = first_tombstone
+            self._tombstones -= 1
+
+        states[new_index] = _FULL
+        hashes[new_index] = hash
+        keys[new_index] = key
+        self._values[new_index] = value
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table. Tombstones
+        count as empty, as in the open addressing map.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the hash table's capacity to the given new_capacity or
+        next closest prime number. All key/value pairs remain in table
+        and are rehashed from their cached hashes.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity is changed and links rehashed
+        """
+        # new_capacity cannot be smaller than number of elements in hash map
+        if new_capacity < self._size:
+            return
+
+        # If new_capacity is not prime, find the next closest prime number
+        if is_prime(new_capacity) is False:
+            new_capacity = next_prime(new_capacity)
+
+        # Quadratic probing is only guaranteed to find an empty slot while
+        # the table is less than half full, so keep doubling until it is
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = grow_prime(new_capacity)
+
+        states, hashes = self._states, self._hashes
+        keys, values = self._keys, self._values
+        old_capacity = self._capacity
+
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._allocate(new_capacity)
+
+        # Move every live slot into the new arrays without calling the
+        # hash function again
+        for index in range(old_capacity):
+            if states[index] == _FULL:
+                self._insert_new(keys[index], values[index], hashes[index])
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        index = self._find(key, self._hash(key))
+        if index == -1:
+            return
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._find(key, self._hash(key)) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        index = self._find(key, self._hash(key))
+        if index == -1:
+            return
+
+        # Mark slot as tombstone and release the key and value objects
+        self._states[index] = _TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map without changing its capacity.
+        :return:    Contents of hash map cleared
+        """
+        self._size = 0
+        self._tombstones = 0
+        self._allocate(self._capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        array_key_values = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+        for index in range(self._capacity):
+            if states[index] == _FULL:
+                array_key_values.append((keys[index], values[index]))
+        return array_key_values
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Struct-of-arrays hashmap example")
+    print("----------------------------------")
+    m = HashMap(20, hash_function_2)
+    print("Create a HashMap object m with capacity = 20 using Hash Function 2: m = HashMap(20, hash_function_2)")
+    print("Add 30 key/value pairs with put() method:")
+    for i in range(30):
+        m.put('str' + str(i), i * 100)
+        if i % 10 == 9:
+            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
+            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
+    print("\nRemove 'str10' key: m.remove('str10')")
+    m.remove('str10')
+    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet value of 'str20' key: m.get('str20')")
+    print("\tReturned", m.get('str20'))
+    print("\nGet all key/value pairs: m.get_keys_and_values()")
+    print("\t", m.get_keys_and_values())
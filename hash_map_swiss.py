@@ -0,0 +1,367 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, an open addressing hash map in the
+#              style of a Swiss table. A separate array of control bytes
+#              records for every slot whether it is empty, deleted, or full
+#              along with a 7-bit tag taken from the key's hash. Probing
+#              moves through groups of 16 slots and compares all 16 control
+#              bytes with the tag at once, so most lookups only touch the
+#              compact control array and compare at most one key. Groups
+#              are scanned with bytearray.find, which runs as a C memchr;
+#              NumPy comparisons can be selected instead, but their per-call
+#              overhead outweighs the 16-byte compare from Python. Exposes
+#              the same methods as the open addressing map in hash_map_oa.py:
+#              put, empty_buckets, table_load, clear, resize_table, get,
+#              contains_key, remove, get_keys_and_values.
+
+
+from array import array
+
+from hash_map_include import (DynamicArray, FIBONACCI_MULTIPLIER,
+                              HASH_MASK_64, get_hash_function,
+                              hash_function_1, hash_function_2,
+                              next_power_of_two)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Slots per group; the capacity is always a multiple of this
+GROUP_SIZE = 16
+
+# Control bytes. Full slots store their 7-bit tag (0 to 127).
+_EMPTY = 0x80
+_DELETED = 0xFE
+
+
+class HashMap:
+    def __init__(self, capacity: int, function,
+                 max_load: float = 0.875, vectorized: bool = False) -> None:
+        """
+        Initialize new HashMap with control-byte group probing. The capacity
+        is rounded up to a power of two of at least GROUP_SIZE slots, and the
+        table grows once full and deleted slots would exceed max_load.
+        Groups are matched with NumPy comparisons when vectorized is True,
+        and with bytearray searches otherwise.
+        """
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        if vectorized and np is None:
+            raise ImportError("vectorized group matching requires NumPy")
+
+        self._capacity = self._fit_capacity(capacity)
+        self._hash_function = get_hash_function(function)
+        self._max_load = max_load
+        self._vectorized = vectorized
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            control = self._control[i]
+            if control == _EMPTY:
+                entry = 'None'
+            elif control == _DELETED:
+                entry = 'Deleted'
+            else:
+                entry = f"K: {self._keys[i]} V: {self._values[i]} T: {control}"
+            out += str(i) + ': ' + entry + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _fit_capacity(capacity: int) -> int:
+        """
+        Returns the smallest power of two that is at least capacity and at
+        least one group.
+        """
+        return max(GROUP_SIZE, next_power_of_two(capacity))
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the table with an empty one of the given capacity.
+        """
+        self._control = bytearray([_EMPTY]) * capacity
+        if self._vectorized:
+            self._control_view = np.frombuffer(self._control, dtype=np.uint8)
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._deleted = 0
+
+        # Shifts that split a mixed hash into group number and tag
+        group_bits = (capacity // GROUP_SIZE).bit_length() - 1
+        self._group_shift = 64 - group_bits
+        self._tag_shift = 57 - group_bits
+
+        # Full and deleted slots allowed before the table must be rebuilt
+        self._growth_left = int(capacity * self._max_load) - self._size
+
+    def _split(self, hash: int) -> tuple:
+        """
+        Mixes a hash with Fibonacci hashing and splits it into the first
+        group to probe (top bits) and the 7-bit tag (the bits below them).
+        :param hash:    integer hash of key
+        :return:        tuple of group number and tag
+        """
+        mixed = (hash * FIBONACCI_MULTIPLIER) & HASH_MASK_64
+        return mixed >> self._group_shift, (mixed >> self._tag_shift) & 0x7F
+
+    def _match(self, base: int, control: int) -> list:
+        """
+        Returns the slots of the group starting at base whose control byte
+        equals control, comparing all 16 bytes with one NumPy operation.
+        """
+        group = self._control_view[base:base + GROUP_SIZE]
+        return (np.flatnonzero(group == control) + base).tolist()
+
+    def _has_empty(self, base: int) -> bool:
+        """
+        Returns True if the group starting at base has an empty slot, which
+        ends every probe sequence that reaches it.
+        """
+        return self._control.find(_EMPTY, base, base + GROUP_SIZE) != -1
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Returns the slot index holding the given key, or -1 if the key is
+        not in the hash map. Only slots whose tag matches are compared.
+        :param key:     string representing key
+        :param hash:    integer hash of key
+        :return:        integer slot index or -1
+        """
+        group, tag = self._split(hash)
+        mask = self._capacity // GROUP_SIZE - 1
+        control, hashes, keys = self._control, self._hashes, self._keys
+        vectorized = self._vectorized
+
+        # Visit groups in triangular order, which reaches every group of a
+        # power-of-two table
+        for step in range(mask + 1):
+            base = group * GROUP_SIZE
+            end = base + GROUP_SIZE
+            if vectorized:
+                for index in self._match(base, tag):
+                    if hashes[index] == hash and keys[index] == key:
+                        return index
+            else:
+                index = control.find(tag, base, end)
+                while index != -1:
+                    if hashes[index] == hash and keys[index] == key:
+                        return index
+                    index = control.find(tag, index + 1, end)
+            if control.find(_EMPTY, base, end) != -1:
+                return -1
+            group = (group + step + 1) & mask
+        return -1
+
+    def _free_slot(self, hash: int) -> int:
+        """
+        Returns the first empty or deleted slot in the probe sequence of
+        the given hash.
+        """
+        group, _ = self._split(hash)
+        mask = self._capacity // GROUP_SIZE - 1
+        control = self._control
+        step = 0
+        while True:
+            base = group * GROUP_SIZE
+            end = base + GROUP_SIZE
+            empty = control.find(_EMPTY, base, end)
+            deleted = control.find(_DELETED, base, end)
+            if deleted != -1 and (empty == -1 or deleted < empty):
+                return deleted
+            if empty != -1:
+                return empty
+            step += 1
+            group = (group + step) & mask
+
+    def _insert(self, key: str, value: object, hash: int) -> None:
+        """
+        Stores a key known to be absent from the table.
+        """
+        index = self._free_slot(hash)
+        if self._control[index] == _DELETED:
+            self._deleted -= 1
+        else:
+            self._growth_left -= 1
+
+        self._control[index] = self._split(hash)[1]
+        self._hashes[index] = hash
+        self._keys[index] = key
+        self._values[index] = value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        hash = self._hash_function(key) & HASH_MASK_64
+        index = self._find(key, hash)
+        if index != -1:
+            self._values[index] = value
+            return
+
+        # Rebuild when no empty slots may be used up. Mostly deleted slots
+        # are reclaimed at the same capacity, otherwise the table doubles.
+        if self._growth_left == 0:
+            if self._deleted > self._size:
+                self.resize_table(self._capacity)
+            else:
+                self.resize_table(2 * self._capacity)
+
+        self._insert(key, value, hash)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table. Deleted slots
+        count as empty, as tombstones do in the open addressing map.
+        :return:    integer representing number of empty buckets
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Changes the hash table's capacity to the given new_capacity rounded
+        up to a power of two. All key/value pairs remain in table and are
+        reinserted from their cached hashes.
+        :param new_capacity:    integer representing new capacity
+        :return:                capacity is changed and links rehashed
+        """
+        new_capacity = self._fit_capacity(new_capacity)
+
+        # Every entry must fit within the maximum load factor
+        while self._size > int(new_capacity * self._max_load):
+            new_capacity *= 2
+
+        control, hashes = self._control, self._hashes
+        keys, values = self._keys, self._values
+        old_capacity = self._capacity
+        size = self._size
+
+        self._capacity = new_capacity
+        self._size = 0
+        self._allocate(new_capacity)
+        self._size = size
+
+        for index in range(old_capacity):
+            if control[index] < _EMPTY:
+                self._insert(keys[index], values[index], hashes[index])
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._find(key, self._hash_function(key) & HASH_MASK_64) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map. The slot is
+        marked empty if its group already has an empty slot, since no probe
+        sequence can then have continued past the group; otherwise it is
+        marked deleted.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        index = self._find(key, self._hash_function(key) & HASH_MASK_64)
+        if index == -1:
+            return
+
+        base = index - index % GROUP_SIZE
+        if self._has_empty(base):
+            self._control[index] = _EMPTY
+            self._growth_left += 1
+        else:
+            self._control[index] = _DELETED
+            self._deleted += 1
+
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map without changing its capacity.
+        :return:    Contents of hash map cleared
+        """
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        array_key_values = DynamicArray()
+        control, keys, values = self._control, self._keys, self._values
+        for index in range(self._capacity):
+            if control[index] < _EMPTY:
+                array_key_values.append((keys[index], values[index]))
+        return array_key_values
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\n Swiss table hashmap example")
+    print("-----------------------------")
+    m = HashMap(20, hash_function_2)
+    print("Create a HashMap object m with capacity = 20 using Hash Function 2: m = HashMap(20, hash_function_2)")
+    print("\tCapacity is rounded up to a power of two:", m.get_capacity())
+    print("Add 30 key/value pairs with put() method:")
+    for i in range(30):
+        m.put('str' + str(i), i * 100)
+        if i % 10 == 9:
+            print("\nAfter the " + str(i + 1) + "th entry calling the put() method:")
+            print("\tNumber of empty Buckets:", m.empty_buckets(), ", Load Factor:", round(m.table_load(), 2),
+                  ", Hashmap Size:", m.get_size(), ", Hashmap Capacity:", m.get_capacity())
+    print("\nRemove 'str10' key: m.remove('str10')")
+    m.remove('str10')
+    print("\tVerify key 'str10' was removed: m.contains_key('str10')")
+    print("\tReturned", m.contains_key('str10'))
+    print("\nGet value of 'str20' key: m.get('str20')")
+    print("\tReturned", m.get('str20'))
@@ -0,0 +1,407 @@
+# Course: CS261 - Data Structures
+# Description: Defines class HashMap, a durable hash map that wraps an
+#              existing HashMap (separate chaining by default) with an
+#              append-only write-ahead log. Every put, remove and clear is
+#              appended to the log as a checksummed record before it
+#              returns, and the log is flushed and fsynced once every
+#              sync_every writes. On startup the latest snapshot is loaded
+#              and the log replayed on top of it, stopping at a record torn
+#              by a crash. Once the log holds compact_every records, and at
+#              least one per key, it is compacted: the map is saved as a new
+#              snapshot and the log is emptied.
+
+
+import os
+import pickle
+import struct
+import time
+import zlib
+
+import hash_map_sc
+from hash_map_include import DynamicArray, hash_function_1
+
+
+# Operations recorded in the log
+PUT = 1
+REMOVE = 2
+CLEAR = 3
+
+# A record is the CRC-32 of the rest of the record, then the operation, key
+# length and value length, followed by the UTF-8 key and the pickled value
+_CHECKSUM = struct.Struct('<I')
+_FIELDS = struct.Struct('<BII')
+_RECORD_HEADER = _CHECKSUM.size + _FIELDS.size
+
+# Buffer size of the log file
+_BUFFER_SIZE = 1 << 16
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Makes a rename or a newly created file in the directory of path durable.
+    Directories cannot be opened on every platform, where this does nothing.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)),
+                         os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def encode_record(operation: int, key: str = '', value: object = None) -> bytes:
+    """
+    Returns a log record for an operation.
+    :param operation:   PUT, REMOVE or CLEAR
+    :param key:         string key of a put or remove
+    :param value:       object value of a put, stored with pickle
+    :return:            bytes of the record
+    """
+    key_data = key.encode('utf-8')
+    value_data = b''
+    if operation == PUT:
+        value_data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    body = (_FIELDS.pack(operation, len(key_data), len(value_data))
+            + key_data + value_data)
+    return _CHECKSUM.pack(zlib.crc32(body)) + body
+
+
+def read_records(data: bytes) -> tuple:
+    """
+    Decodes the records of a log up to the end of the data or the first
+    record that is incomplete or fails its checksum, as a record being
+    written during a crash would.
+    :param data:    bytes of the log file
+    :return:        tuple of a list of (operation, key, value) tuples and
+                    the length of the valid part of the log
+    """
+    records, offset = [], 0
+    view = memoryview(data)
+    while offset + _RECORD_HEADER <= len(data):
+        (checksum,) = _CHECKSUM.unpack_from(data, offset)
+        operation, key_length, value_length = \
+            _FIELDS.unpack_from(data, offset + _CHECKSUM.size)
+        start = offset + _RECORD_HEADER
+        end = start + key_length + value_length
+        if (end > len(data)
+                or zlib.crc32(view[offset + _CHECKSUM.size:end]) != checksum):
+            break
+
+        key = str(view[start:start + key_length], 'utf-8')
+        value = None
+        if operation == PUT:
+            value = pickle.loads(view[start + key_length:end])
+        records.append((operation, key, value))
+        offset = end
+    return records, offset
+
+
+class HashMap:
+    def __init__(self, path: str, function=hash_function_1,
+                 sync_every: int = 1, sync_interval: float = None,
+                 compact_every: int = 100000, map_class=None,
+                 **options) -> None:
+        """
+        Opens the durable HashMap stored at path: the log is the file path
+        and the snapshot is path + '.snapshot'. Both are created if absent.
+        The map is a map_class instance (hash_map_sc.HashMap by default, or
+        hash_map_oa.HashMap) built with the hash function and any other
+        options given, and rebuilt from the snapshot and log if they exist.
+        The log is fsynced after every sync_every writes, so that at most
+        the last sync_every - 1 writes are lost in a crash, and also by any
+        write made sync_interval seconds or more after the last fsync.
+        sync_every=0 leaves syncing to the operating system and sync().
+        The log is compacted once it holds compact_every records and at
+        least one record per key, so compaction is amortized over the
+        writes and replay never reads more than about twice the map's size
+        (None disables compaction other than by calling compact()).
+        Options of a map loaded from a snapshot are those it was saved with.
+        """
+        if sync_every < 0:
+            raise ValueError("sync_every must not be negative")
+        if compact_every is not None and compact_every < 1:
+            raise ValueError("compact_every must be at least 1")
+        if map_class is None:
+            map_class = hash_map_sc.HashMap
+
+        self._path = path
+        self._snapshot_path = path + '.snapshot'
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._compact_every = compact_every
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        if os.path.exists(self._snapshot_path):
+            self._map = map_class.load(self._snapshot_path, function)
+        else:
+            self._map = map_class(11, function, **options)
+
+        self._records = self._replay()
+        self._file = open(path, 'ab', buffering=_BUFFER_SIZE)
+        _fsync_directory(path)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def _replay(self) -> int:
+        """
+        Applies the records of the log to the map and cuts off a torn
+        record at its end. Records before the last clear are skipped, and
+        consecutive puts are applied with put_many, so the table is sized
+        once for each run of puts.
+        :return:    integer number of records in the log
+        """
+        if not os.path.exists(self._path):
+            return 0
+        with open(self._path, 'rb') as file:
+            data = file.read()
+        records, length = read_records(data)
+        if length < len(data):
+            with open(self._path, 'r+b') as file:
+                file.truncate(length)
+                os.fsync(file.fileno())
+
+        start = 0
+        for position in range(len(records) - 1, -1, -1):
+            if records[position][0] == CLEAR:
+                self._map.clear()
+                start = position + 1
+                break
+
+        puts = []
+        for operation, key, value in records[start:]:
+            if operation == PUT:
+                puts.append((key, value))
+                continue
+            if puts:
+                self._map.put_many(puts)
+                puts = []
+            self._map.remove(key)
+        if puts:
+            self._map.put_many(puts)
+        return len(records)
+
+    def _append(self, operation: int, key: str = '', value: object = None) -> None:
+        """
+        Writes a record to the log, then syncs it if due. Called before
+        the operation is applied to the map.
+        """
+        self._file.write(encode_record(operation, key, value))
+        self._records += 1
+        self._pending += 1
+
+        if self._sync_every and self._pending >= self._sync_every:
+            self.sync()
+        elif (self._sync_interval is not None
+              and time.monotonic() - self._last_sync >= self._sync_interval):
+            self.sync()
+
+    def _compact_if_due(self) -> None:
+        """
+        Compacts the log if it is due. Called after the logged operation is
+        applied, so that the snapshot includes it.
+        """
+        if (self._compact_every is not None
+                and self._records >= max(self._compact_every,
+                                         self._map.get_size())):
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        Flushes the log and waits until the operating system has written it
+        to disk, making every write so far durable.
+        :return:    log written to disk
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def compact(self) -> None:
+        """
+        Saves the map as a new snapshot and empties the log. The snapshot is
+        written under a temporary name and renamed, and the log is only
+        emptied afterwards, so a crash at any point leaves a snapshot and a
+        log that together hold every synced write. Replaying a log over a
+        snapshot that already includes it gives the same map, since puts,
+        removes and clears only depend on their order.
+        :return:    snapshot written and log emptied
+        """
+        self.sync()
+        temporary = self._snapshot_path + '.tmp'
+        self._map.save(temporary)
+        with open(temporary, 'rb') as file:
+            os.fsync(file.fileno())
+        os.replace(temporary, self._snapshot_path)
+        _fsync_directory(self._snapshot_path)
+
+        self._file.truncate(0)
+        os.fsync(self._file.fileno())
+        self._records = 0
+
+    def close(self) -> None:
+        """
+        Syncs and closes the log. The map cannot be modified afterwards.
+        """
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self) -> "HashMap":
+        """
+        Return the map for use in a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the map at the end of a with statement.
+        """
+        self.close()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Adds a key/value pair to the hash map.  If the given key exists in
+        the map, the value is updated. The put is logged first.
+        :param key:     string to represent key
+        :param value:   object representing value of key
+        :return:        key/value pair added or updated in hash map
+        """
+        self._append(PUT, key, value)
+        self._map.put(key, value)
+        self._compact_if_due()
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Adds delta to the value of the given key, which starts at 0 if the
+        key is absent, and logs the new value as a put.
+        :param key:     string representing key
+        :param delta:   number added to the key's value
+        :return:        new value of key
+        """
+        value = self._map.get(key)
+        value = (0 if value is None else value) + delta
+        self.put(key, value)
+        return value
+
+    def remove(self, key: str) -> None:
+        """
+        Removes the given key and its value from the hash map. Only keys
+        that were in the map are logged.
+        :param key:     string representing key
+        :return:        key/value pair is removed from hash map
+        """
+        self.pop(key)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        Removes the given key and returns its value, or returns default if
+        the key is not in the hash map.
+        :param key:         string representing key
+        :param default:     object returned if key is absent
+        :return:            object representing removed value or default
+        """
+        if not self._map.contains_key(key):
+            return default
+        self._append(REMOVE, key)
+        value = self._map.pop(key, default)
+        self._compact_if_due()
+        return value
+
+    def clear(self) -> None:
+        """
+        Clears contents of the hash map and logs the clear.
+        :return:    Contents of hash map cleared
+        """
+        self._append(CLEAR)
+        self._map.clear()
+        self._compact_if_due()
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the given key.
+        :param key:     string representing key
+        :return:        object representing value of key
+        """
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns True if the given key is in the hash map and False otherwise.
+        :param key:     string representing key
+        :return:        True if key is in hash map, False otherwise.
+        """
+        return self._map.contains_key(key)
+
+    def table_load(self) -> float:
+        """
+        Returns the hash table load factor.
+        :return:    float representing load factor
+        """
+        return self._map.table_load()
+
+    def empty_buckets(self) -> int:
+        """
+        Returns the number of empty buckets in the hash table.
+        :return:    integer representing number of empty buckets
+        """
+        return self._map.empty_buckets()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns an array where each index contains a tuple of a key/value pair
+        in the hash map.
+        :return:        Array of key/value pairs
+        """
+        return self._map.get_keys_and_values()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("\n Write-ahead log hashmap example")
+    print("---------------------------------")
+    path = os.path.join(tempfile.mkdtemp(), 'state.log')
+    m = HashMap(path, hash_function_1, sync_every=10, compact_every=50)
+    print("Open a durable HashMap m: m = HashMap(path, hash_function_1, sync_every=10, compact_every=50)")
+    for i in range(40):
+        m.put('str' + str(i), i * 100)
+    m.remove('str10')
+    print("Put 40 keys and remove 'str10': log holds", os.path.getsize(path), "bytes")
+    m.close()
+
+    m = HashMap(path, hash_function_1, sync_every=10, compact_every=50)
+    print("\nReopen the map, replaying the log")
+    print("\tHashmap Size:", m.get_size(), ", Value of 'str20':", m.get('str20'),
+          ", Contains 'str10':", m.contains_key('str10'))
+    for i in range(40, 60):
+        m.put('str' + str(i), i * 100)
+    print("Put 20 more keys; the log is compacted at 50 records:", os.path.getsize(path), "bytes,",
+          "snapshot", os.path.getsize(path + '.snapshot'), "bytes")
+    m.close()
+
+    with HashMap(path, hash_function_1) as m:
+        print("\nReopen from the snapshot and log")
+        print("\tHashmap Size:", m.get_size(), ", Value of 'str55':", m.get('str55'))
@@ -0,0 +1,41 @@
+# Randomized differential checks of the hash maps against a dict.
+
+import random
+
+
+def contents(m) -> dict:
+    """Returns the key/value pairs of a map as a dict."""
+    pairs = m.get_keys_and_values()
+    return dict(pairs[index] for index in range(pairs.length()))
+
+
+def check_against_dict(m, seed: int, operations: int = 3000,
+                       keys: int = 400, resize=None) -> dict:
+    """
+    Applies random puts, removes and lookups to the map and to a dict and
+    checks that they always agree. If resize is given, it is called with
+    the map, the random generator and the dict on about 2% of operations.
+    Returns the final dict.
+    """
+    rng = random.Random(seed)
+    expected = {}
+    for i in range(operations):
+        key = 'k' + str(rng.randrange(keys))
+        op = rng.random()
+        if op < 0.45:
+            m.put(key, i)
+            expected[key] = i
+        elif op < 0.75:
+            m.remove(key)
+            expected.pop(key, None)
+        elif op < 0.77 and resize is not None:
+            resize(m, rng, expected)
+        else:
+            assert m.get(key) == expected.get(key)
+            assert m.contains_key(key) == (key in expected)
+        assert m.get_size() == len(expected)
+
+    for key, value in expected.items():
+        assert m.get(key) == value
+    assert contents(m) == expected
+    return expected
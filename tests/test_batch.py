@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+import hash_map_batch
+from hash_map_include import (DynamicArray, HASH_FUNCTIONS, fibonacci_index,
+                              make_seeded_hash)
+
+
+def sample_keys() -> list:
+    rng = random.Random(8)
+    alphabet = 'abcxyz0189 é€😀'
+    keys = ['', 'a', 'key', 'x' * 100]
+    keys += [''.join(rng.choice(alphabet) for _ in range(rng.randrange(30)))
+             for _ in range(300)]
+    return keys
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'scalar'])
+def numpy_or_not(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(hash_map_batch, 'np', None)
+
+
+@pytest.mark.parametrize('function', list(HASH_FUNCTIONS.values())
+                         + [make_seeded_hash(b'batch')])
+def test_batch_hash_matches_scalar(numpy_or_not, function):
+    keys = sample_keys()
+    hashes = hash_map_batch.batch_hash(DynamicArray(keys), function)
+    assert hash_map_batch.as_list(hashes) == [function(key) for key in keys]
+
+
+@pytest.mark.parametrize('capacity', [1, 11, 97, 1024])
+def test_batch_index_matches_scalar(numpy_or_not, capacity):
+    hashes = [HASH_FUNCTIONS['mix_hash'](key) for key in sample_keys()]
+    indices = hash_map_batch.batch_index(hashes, capacity)
+    assert hash_map_batch.as_list(indices) == [hash % capacity for hash in hashes]
+    indices = hash_map_batch.batch_index(hashes, capacity, power_of_two=True)
+    assert hash_map_batch.as_list(indices) == \
+        [fibonacci_index(hash, capacity) for hash in hashes]
+
+
+def test_batch_of_no_keys(numpy_or_not):
+    assert hash_map_batch.batch_hash([], HASH_FUNCTIONS['mix_hash']).length() == 0
+    assert hash_map_batch.batch_index([], 11).length() == 0
@@ -0,0 +1,53 @@
+import copy
+import json
+
+import hash_map_bench
+
+
+def small_suite() -> dict:
+    return hash_map_bench.bench_suite([50], ['mix_hash'], ['uniform', 'churn'],
+                                      ['sc', 'oa'], 0.5, 0)
+
+
+def test_suite_report_shape():
+    report = small_suite()
+    assert report['meta']['seed'] == 0
+    cases = {(result['map'], result['workload']) for result in report['results']}
+    assert cases == {('sc', 'uniform'), ('sc', 'churn'),
+                     ('oa', 'uniform'), ('oa', 'churn')}
+    for result in report['results']:
+        assert result['ops'] > 0
+        assert result['ops_per_sec'] > 0
+        assert result['p50_ns'] <= result['p99_ns'] <= result['max_ns']
+    json.dumps(report)
+
+
+def test_compare_finds_regressions():
+    baseline = small_suite()
+    assert hash_map_bench.compare_suites(baseline, baseline) == []
+
+    current = copy.deepcopy(baseline)
+    slower = current['results'][0]
+    slower['ops_per_sec'] /= 2
+    slower['p99_ns'] *= 2
+    metrics = [metric for _, metric, _, _ in
+               hash_map_bench.compare_suites(baseline, current)]
+    assert metrics == ['ops_per_sec', 'p99_ns']
+
+
+def test_command_line(tmp_path, capsys):
+    baseline = str(tmp_path / 'baseline.json')
+    arguments = ['suite', '--sizes', '50', '--functions', 'mix_hash',
+                 '--workloads', 'uniform', '--maps', 'sc', '--budget', '0.5']
+    assert hash_map_bench.main(arguments + ['-o', baseline]) == 0
+    with open(baseline) as file:
+        report = json.load(file)
+    report['results'][0]['ops_per_sec'] *= 10
+    current = str(tmp_path / 'current.json')
+    with open(current, 'w') as file:
+        json.dump(report, file)
+    capsys.readouterr()
+
+    assert hash_map_bench.main(['compare', current, baseline]) == 1
+    assert 'ops_per_sec' in capsys.readouterr().out
+    assert hash_map_bench.main(['compare', baseline, baseline]) == 0
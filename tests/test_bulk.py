@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from dict_model import contents
+from hash_map_batch import as_list
+from hash_map_include import hash_function_2, mix_hash
+
+
+MAP_CLASSES = [hash_map_sc.HashMap, hash_map_oa.HashMap]
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+@pytest.mark.parametrize('function', [hash_function_2, mix_hash])
+def test_bulk_operations_match_dict(map_class, function):
+    rng = random.Random(9)
+    m = map_class(11, function)
+    expected = {}
+    for round in range(20):
+        keys = ['k' + str(rng.randrange(1000)) for _ in range(rng.randrange(200))]
+        pairs = [(key, round) for key in keys]
+        m.put_many(pairs)
+        expected.update(pairs)
+
+        probes = ['k' + str(rng.randrange(1200)) for _ in range(100)]
+        assert as_list(m.get_many(probes)) == [expected.get(key) for key in probes]
+        assert as_list(m.contains_many(probes)) == [key in expected for key in probes]
+
+        removed = probes[:rng.randrange(50)]
+        m.remove_many(removed)
+        for key in removed:
+            expected.pop(key, None)
+        assert m.get_size() == len(expected)
+    assert contents(m) == expected
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+def test_increment_many_counts_duplicates(map_class):
+    m = map_class(11, mix_hash)
+    values = as_list(m.increment_many(['a', 'b', 'a', 'a', 'c', 'b']))
+    assert values == [1, 1, 2, 3, 1, 2]
+    assert as_list(m.increment_many(['c'], 10)) == [11]
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+def test_from_pairs_presizes_once(map_class):
+    pairs = [('key' + str(i), i) for i in range(5000)]
+    m = map_class.from_pairs(pairs, mix_hash)
+    assert contents(m) == dict(pairs)
+    assert m.stats()['resizes'] <= 1
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+def test_bulk_operations_on_nothing(map_class):
+    m = map_class(11, mix_hash)
+    m.put_many([])
+    m.remove_many([])
+    assert m.get_many([]).length() == 0
+    assert m.get_size() == 0
@@ -0,0 +1,133 @@
+import random
+from collections import OrderedDict
+
+import pytest
+
+from hash_map_cache import Cache, CacheNode
+from hash_map_include import mix_hash
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def cached(cache: Cache) -> list:
+    pairs = cache.get_keys_and_values()
+    return [pairs[index] for index in range(pairs.length())]
+
+
+# A constant hash sends every key to one bucket, which is converted to a
+# SortedBucket and back as the cache fills and evicts
+@pytest.mark.parametrize('function', [mix_hash, lambda key: 0])
+def test_lru_matches_ordered_dict(function):
+    rng = random.Random(23)
+    cache = Cache(20, function)
+    model = OrderedDict()
+    for i in range(5000):
+        key = 'k' + str(rng.randrange(60))
+        if rng.random() < 0.5:
+            cache.put(key, i)
+            model[key] = i
+            model.move_to_end(key)
+            if len(model) > 20:
+                model.popitem(last=False)
+        else:
+            assert cache.get(key) == model.get(key)
+            if key in model:
+                model.move_to_end(key)
+    assert cached(cache) == list(model.items())
+
+
+@pytest.mark.parametrize('policy', ['lru', 'slru', 'lfu'])
+def test_chain_nodes_are_eviction_nodes(policy):
+    cache = Cache(50, mix_hash, policy=policy)
+    for i in range(200):
+        cache.put('k' + str(i % 80), i)
+        cache.get('k' + str(i % 7))
+    chained = list(cache._map._iter_nodes(cache._map._buckets))
+    assert all(isinstance(node, CacheNode) for node in chained)
+    assert {id(node) for node in chained} == {id(node) for node in cache._nodes()}
+
+
+def test_lfu_evicts_least_frequent_then_least_recent():
+    cache = Cache(3, mix_hash, policy='lfu')
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('c', 3)
+    cache.get('a')
+    cache.get('a')
+    cache.get('b')
+    cache.put('d', 4)       # c was used least
+    assert not cache.contains_key('c')
+    cache.get('d')
+    cache.put('e', 5)       # b and d were used twice; b less recently
+    assert not cache.contains_key('b')
+    assert sorted(key for key, _ in cached(cache)) == ['a', 'd', 'e']
+
+
+def test_slru_protects_reused_keys_from_a_scan():
+    cache = Cache(10, mix_hash, policy='slru')
+    for key in ('hot0', 'hot1', 'hot2'):
+        cache.put(key, key)
+        cache.get(key)
+    for i in range(100):
+        cache.put('scan' + str(i), i)
+    assert all(cache.get(key) == key for key in ('hot0', 'hot1', 'hot2'))
+    assert cache.get_size() == 10
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = Cache(10, mix_hash, ttl=5, clock=clock)
+    cache.put('short', 1, ttl=1)
+    cache.put('default', 2)
+    clock.now = 2
+    assert cache.get('short') is None
+    assert cache.get('default') == 2
+    clock.now = 6
+    assert not cache.contains_key('default')
+    cache.put('later', 3)
+    cache.put('long', 4, ttl=100)
+    clock.now = 20
+    assert cache.remove_expired() == 1
+    assert cached(cache) == [('long', 4)]
+    assert cache.stats()['expirations'] == 3
+
+
+def test_entries_without_ttl_never_expire():
+    clock = FakeClock()
+    cache = Cache(10, mix_hash, clock=clock)
+    cache.put('key', 1)
+    clock.now = 1e9
+    assert cache.get('key') == 1
+    assert cache.remove_expired() == 0
+
+
+def test_get_or_load_and_stats():
+    cache = Cache(2, mix_hash)
+    loads = []
+    assert cache.get_or_load('a', lambda key: loads.append(key) or key * 2) == 'aa'
+    assert cache.get_or_load('a', lambda key: loads.append(key) or key * 2) == 'aa'
+    assert loads == ['a']
+    cache.put('b', 1)
+    cache.put('c', 1)
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Cache(0)
+    with pytest.raises(ValueError):
+        Cache(10, policy='fifo')
+    with pytest.raises(ValueError):
+        Cache(10, policy='slru', protected_ratio=1.0)
@@ -0,0 +1,54 @@
+import math
+import threading
+
+import pytest
+
+import hash_map_concurrent
+import hash_map_oa
+import hash_map_sc
+from dict_model import check_against_dict
+from hash_map_include import hash_function_2, mix_hash
+
+
+@pytest.mark.parametrize('map_class', [hash_map_sc.HashMap, hash_map_oa.HashMap])
+def test_shard_buckets_are_all_used(map_class):
+    m = hash_map_concurrent.HashMap(256, mix_hash, shards=16,
+                                    map_class=map_class, power_of_two=True)
+    for i in range(4000):
+        m.put('key' + str(i), i)
+
+    for shard in m._shards:
+        inner = shard.map
+        used = inner.get_capacity() - inner.empty_buckets()
+        if map_class is hash_map_sc.HashMap:
+            # Occupied buckets expected for uniformly spread keys
+            expected = inner.get_capacity() * (1 - math.exp(-inner.table_load()))
+            assert used > 0.8 * expected
+        else:
+            assert used == inner.get_size()
+            assert inner.stats()['hit']['mean'] < 3
+
+
+@pytest.mark.parametrize('map_class', [hash_map_sc.HashMap, hash_map_oa.HashMap])
+def test_matches_dict(map_class):
+    m = hash_map_concurrent.HashMap(8, hash_function_2, shards=4,
+                                    map_class=map_class)
+    expected = check_against_dict(m, 18)
+    sizes = m.shard_sizes()
+    assert sum(sizes[i] for i in range(sizes.length())) == len(expected)
+
+
+def test_concurrent_increments():
+    m = hash_map_concurrent.HashMap(8, mix_hash, shards=4)
+
+    def work():
+        for i in range(2000):
+            m.increment('k' + str(i % 50))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert m.get_size() == 50
+    assert all(m.get('k' + str(i)) == 160 for i in range(50))
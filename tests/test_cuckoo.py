@@ -0,0 +1,54 @@
+import pytest
+
+import hash_map_cuckoo
+from dict_model import check_against_dict, contents
+from hash_map_cuckoo import BUCKET_SIZE
+from hash_map_include import hash_function_1, hash_function_2, mix_hash
+
+
+def check_positions(m) -> None:
+    """Every key is in its first bucket, its second bucket or the stash,
+    which are the only slots a lookup examines."""
+    for index in range(m.get_capacity()):
+        key = m._keys[index]
+        if key is None:
+            continue
+        first = m._first_bucket(m._hashes[index])
+        second = m._second_bucket(key)
+        assert (first <= index < first + BUCKET_SIZE
+                or second <= index < second + BUCKET_SIZE)
+
+
+@pytest.mark.parametrize('function', [hash_function_1, hash_function_2, mix_hash])
+@pytest.mark.parametrize('max_load', [0.5, 0.9, 0.97])
+def test_matches_dict(function, max_load):
+    m = hash_map_cuckoo.HashMap(1, function, max_load)
+    check_against_dict(m, 13, operations=4000, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(0, 3 * len(expected) + 5)))
+    check_positions(m)
+    assert m.table_load() <= max_load
+
+
+def test_colliding_keys_use_second_table_and_stash():
+    # hash_function_1 gives every anagram the same first bucket
+    m = hash_map_cuckoo.HashMap(64, hash_function_1)
+    keys = ['abcdef', 'abcdfe', 'abcedf', 'abcefd', 'abcfde', 'abcfed',
+            'abdcef', 'abdcfe', 'abdecf', 'abdefc', 'abdfce', 'abdfec']
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    check_positions(m)
+    assert contents(m) == {key: i for i, key in enumerate(keys)}
+    for key in keys[::2]:
+        m.remove(key)
+    assert contents(m) == {key: i for i, key in enumerate(keys) if i % 2}
+
+
+def test_clear_and_empty_map():
+    m = hash_map_cuckoo.HashMap(8, mix_hash)
+    assert m.get('missing') is None
+    m.remove('missing')
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.clear()
+    assert m.get_size() == 0
+    assert m.get('key1') is None
@@ -0,0 +1,99 @@
+import pytest
+
+import hash_map_frozen
+import hash_map_oa
+import hash_map_sc
+from hash_map_include import hash_function_1, make_seeded_hash, mix_hash
+
+
+def source_map(map_class=hash_map_sc.HashMap, function=mix_hash):
+    m = map_class(11, function)
+    for i in range(500):
+        m.put('key' + str(i), i if i % 3 else 'value' + str(i))
+    m.put('unicode é', {'nested': [1, 2]})
+    return m
+
+
+@pytest.mark.parametrize('map_class', [hash_map_sc.HashMap, hash_map_oa.HashMap])
+def test_round_trip(tmp_path, map_class):
+    source = source_map(map_class)
+    path = str(tmp_path / 'table.frozen')
+    with hash_map_frozen.HashMap.build(source, path) as table:
+        assert table.get_size() == source.get_size()
+        assert table.table_load() <= 0.5
+        for key, value in table.items():
+            assert source.get(key) == value
+    with hash_map_frozen.HashMap(path) as table:
+        for i in range(500):
+            assert table.get('key' + str(i)) == source.get('key' + str(i))
+        assert table.get('unicode é') == {'nested': [1, 2]}
+        assert table.get('missing') is None
+        assert not table.contains_key('key500')
+
+
+def test_empty_table(tmp_path):
+    path = str(tmp_path / 'table.frozen')
+    with hash_map_frozen.HashMap.build(hash_map_sc.HashMap(11, mix_hash), path) as table:
+        assert table.get_size() == 0
+        assert table.get('missing') is None
+        assert list(table.items()) == []
+
+
+def test_hash_function_must_match(tmp_path):
+    function = make_seeded_hash(b'frozen')
+    path = str(tmp_path / 'table.frozen')
+    hash_map_frozen.HashMap.build(source_map(function=function), path).close()
+
+    with pytest.raises(ValueError):
+        hash_map_frozen.HashMap(path)
+    with pytest.raises(ValueError):
+        hash_map_frozen.HashMap(path, make_seeded_hash(b'other'))
+    with pytest.raises(ValueError):
+        hash_map_frozen.HashMap(path, hash_function_1)
+    with hash_map_frozen.HashMap(path, function) as table:
+        assert table.get('key7') == 7
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / 'table.frozen'
+    hash_map_frozen.HashMap.build(source_map(), str(path)).close()
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        hash_map_frozen.HashMap(str(path))
+
+
+def test_lookup_in_table_without_empty_slots(tmp_path):
+    path = tmp_path / 'table.frozen'
+    hash_map_frozen.HashMap.build(source_map(), str(path)).close()
+    with hash_map_frozen.HashMap(str(path)) as table:
+        capacity, slots = table.get_capacity(), table._slots
+    # Mark every empty slot as holding a zero-length key
+    data = bytearray(path.read_bytes())
+    for index in range(capacity):
+        offset = slots + index * hash_map_frozen._SLOT.size
+        fields = list(hash_map_frozen._SLOT.unpack_from(data, offset))
+        if fields[3] == hash_map_frozen._EMPTY:
+            fields[3] = 0
+            hash_map_frozen._SLOT.pack_into(data, offset, *fields)
+    path.write_bytes(bytes(data))
+    with hash_map_frozen.HashMap(str(path)) as table:
+        assert table.get('key7') == 7
+        assert table.get('missing') is None
+
+
+@pytest.mark.parametrize('map_class', [hash_map_sc.HashMap, hash_map_oa.HashMap])
+def test_build_reuses_cached_hashes(tmp_path, map_class):
+    calls = []
+
+    def function(key):
+        calls.append(key)
+        return mix_hash(key)
+
+    source = map_class(11, function)
+    for i in range(100):
+        source.put('key' + str(i), i)
+    del calls[:]
+    path = str(tmp_path / 'table.frozen')
+    with hash_map_frozen.HashMap.build(source, path, max_load=0.99) as table:
+        assert not [key for key in calls if key.startswith('key')]
+        assert all(table.get('key' + str(i)) == i for i in range(100))
@@ -0,0 +1,89 @@
+import pytest
+
+from hash_map_include import (HASH_FUNCTIONS, HASH_MASK_64, PRIME_CAPACITIES,
+                              fibonacci_index, fnv1a_hash, get_hash_function,
+                              grow_prime, is_prime, make_seeded_hash,
+                              mix_hash, next_power_of_two, next_prime)
+
+
+def slow_is_prime(n: int) -> bool:
+    return n > 1 and all(n % factor for factor in range(2, int(n ** 0.5) + 1))
+
+
+def test_is_prime_matches_trial_division():
+    assert [n for n in range(2000) if is_prime(n)] == \
+        [n for n in range(2000) if slow_is_prime(n)]
+    assert is_prime(1726217406467)
+    assert not is_prime(3215031751)     # strong pseudoprime to bases 2, 3, 5, 7
+
+
+def test_prime_ladder():
+    for previous, prime in zip(PRIME_CAPACITIES, PRIME_CAPACITIES[1:]):
+        assert is_prime(prime)
+        assert prime == next_prime(2 * previous)
+        assert grow_prime(previous) == prime
+    assert grow_prime(13) == next_prime(26)
+
+
+@pytest.mark.parametrize('capacity', [0, 1, 2, 3, 5, 16, 17, 1000])
+def test_next_power_of_two(capacity):
+    power = next_power_of_two(capacity)
+    assert power & (power - 1) == 0
+    assert power >= capacity
+    assert power == 1 or power // 2 < capacity
+
+
+@pytest.mark.parametrize('capacity', [1, 2, 64, 1 << 20])
+def test_fibonacci_index_in_range(capacity):
+    indices = {fibonacci_index(hash, capacity) for hash in range(5000)}
+    assert min(indices) >= 0
+    assert max(indices) < capacity
+    # Consecutive hashes spread over the whole table
+    assert len(indices) == min(capacity, 5000)
+
+
+def test_fnv1a_known_values():
+    assert fnv1a_hash('') == 0xCBF29CE484222325
+    assert fnv1a_hash('a') == 0xAF63DC4C8601EC8C
+    assert fnv1a_hash('foobar') == 0x85944171F73967E8
+
+
+@pytest.mark.parametrize('function', [fnv1a_hash, mix_hash,
+                                      make_seeded_hash(b'seed')])
+def test_hashes_are_64_bit_and_spread(function):
+    keys = ['key' + str(i) for i in range(4096)]
+    hashes = [function(key) for key in keys]
+    assert all(0 <= hash <= HASH_MASK_64 for hash in hashes)
+    assert len(set(hashes)) == len(keys)
+    # Low bits alone spread keys over a small table
+    buckets = [0] * 64
+    for hash in hashes:
+        buckets[hash % 64] += 1
+    assert max(buckets) < 2 * len(keys) / 64
+
+
+def test_mix_hash_known_values():
+    # Words are decoded little-endian, so these hold on any host
+    assert mix_hash('a') == 0x7E62BF5A809AAF88
+    assert mix_hash('abcdefghi') == 0x0CD4857915337780
+
+
+def test_mix_hash_separates_padding_and_anagrams():
+    assert mix_hash('ab') != mix_hash('ba')
+    assert mix_hash('a') != mix_hash('a\x00')
+    assert mix_hash('é') == mix_hash('é')
+
+
+def test_seeded_hashes():
+    first, second = make_seeded_hash(b'one'), make_seeded_hash(b'two')
+    assert first('key') == make_seeded_hash(b'one')('key')
+    assert first('key') != second('key')
+    assert make_seeded_hash().seed != make_seeded_hash().seed
+
+
+def test_get_hash_function():
+    for name, function in HASH_FUNCTIONS.items():
+        assert get_hash_function(name) is function
+    assert get_hash_function(mix_hash) is mix_hash
+    with pytest.raises(ValueError):
+        get_hash_function('no_such_hash')
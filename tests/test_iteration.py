@@ -0,0 +1,89 @@
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from hash_map_include import hash_function_1, mix_hash
+
+
+MAKERS = [
+    lambda: hash_map_sc.HashMap(11, hash_function_1),
+    lambda: hash_map_sc.HashMap(11, mix_hash, power_of_two=True),
+    lambda: hash_map_oa.HashMap(11, mix_hash),
+    lambda: hash_map_oa.HashMap(11, mix_hash, incremental=True),
+]
+
+
+def filled(make_map, count: int = 300):
+    m = make_map()
+    for i in range(count):
+        m.put('key' + str(i), i)
+    return m
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_iterators_match_contents(make_map):
+    m = filled(make_map)
+    for i in range(0, 300, 4):
+        m.remove('key' + str(i))
+    expected = {'key' + str(i): i for i in range(300) if i % 4}
+    assert dict(m.items()) == expected
+    assert sorted(m.keys()) == sorted(expected)
+    assert sorted(m.values()) == sorted(expected.values())
+    assert sorted(m) == sorted(expected)
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_iterators_of_empty_map(make_map):
+    m = make_map()
+    assert list(m.items()) == []
+    assert list(m) == []
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_updating_values_during_iteration(make_map):
+    m = filled(make_map)
+    for key, value in m.items():
+        m.put(key, value + 1)
+    assert dict(m.items()) == {'key' + str(i): i + 1 for i in range(300)}
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_adding_keys_during_iteration_raises(make_map):
+    m = filled(make_map, 10)
+    with pytest.raises(RuntimeError):
+        for i, key in enumerate(m):
+            m.put('new' + str(i), i)
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_removing_keys_during_iteration_raises(make_map):
+    m = filled(make_map, 10)
+    with pytest.raises(RuntimeError):
+        for key in m.keys():
+            m.remove(key)
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_resize_during_iteration_raises(make_map):
+    m = filled(make_map, 50)
+    with pytest.raises(RuntimeError):
+        for key in m:
+            m.resize_table(4 * m.get_capacity())
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_updating_values_at_resize_threshold(incremental):
+    # Six keys in eleven buckets: the next new key would grow the table
+    m = hash_map_oa.HashMap(11, mix_hash, incremental=incremental)
+    for i in range(6):
+        m.put('key' + str(i), i)
+    capacity = m.get_capacity()
+    for key, value in m.items():
+        m.put(key, value + 1)
+        m.increment(key, 10)
+        m.update_with(key, lambda value: value * 2)
+        assert m.setdefault(key) == 2 * (value + 11)
+    assert m.get_capacity() == capacity
+    assert dict(m.items()) == {'key' + str(i): 2 * (i + 11) for i in range(6)}
+    m.put('key6', 6)
+    assert m.get_capacity() > capacity
@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+
+import pytest
+
+import hash_map_mode
+from hash_map_include import DynamicArray
+from hash_map_sc import find_mode
+
+
+def as_list(array: DynamicArray) -> list:
+    return [array[index] for index in range(array.length())]
+
+
+def sample_values(count: int = 5000, seed: int = 16) -> list:
+    rng = random.Random(seed)
+    return ['v' + str(int(rng.paretovariate(1.2))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_top_k_without_values(k):
+    assert hash_map_mode.top_k(sample_values(), k).length() == 0
+    summary = hash_map_mode.SpaceSaving(10)
+    summary.update(sample_values())
+    assert summary.top(k).length() == 0
+
+
+def test_top_k_matches_counter():
+    values = sample_values()
+    counts = Counter(values)
+    result = as_list(hash_map_mode.top_k(values, 10, chunk_size=64))
+    assert [count for _, count in result] == \
+        sorted(counts.values(), reverse=True)[:10]
+    assert all(counts[value] == count for value, count in result)
+
+
+def test_top_k_of_empty_input():
+    assert hash_map_mode.top_k([], 3).length() == 0
+
+
+def test_stream_mode_matches_counter():
+    values = sample_values()
+    mode, frequency = hash_map_mode.stream_mode(iter(values), chunk_size=100)
+    counts = Counter(values)
+    assert frequency == max(counts.values())
+    assert sorted(as_list(mode)) == sorted(
+        value for value, count in counts.items() if count == frequency)
+    assert hash_map_mode.stream_mode([])[1] == 0
+
+
+def test_space_saving_bounds():
+    values = sample_values()
+    counts = Counter(values)
+    summary = hash_map_mode.SpaceSaving(50)
+    summary.update(values)
+    for value, count, error in as_list(summary.top()):
+        assert counts[value] <= count <= counts[value] + error
+        assert error <= summary.error_bound()
+
+
+def test_count_min_never_underestimates():
+    values = sample_values()
+    sketch = hash_map_mode.CountMinSketch(256, 4)
+    for value in values:
+        sketch.add(value)
+    for value, count in Counter(values).items():
+        assert sketch.estimate(value) >= count
+
+
+@pytest.mark.parametrize('partition', ['hash', 'range'])
+def test_parallel_mode_matches_find_mode(partition):
+    # Several values tie for the mode, so the order of the result matters
+    values = sample_values(3000) + ['tie' + str(i % 4) for i in range(8000)]
+    random.Random(17).shuffle(values)
+    mode, frequency = find_mode(DynamicArray(values))
+    result = hash_map_mode.parallel_mode(values, workers=2, partition=partition,
+                                         chunk_size=500)
+    assert result[1] == frequency
+    assert as_list(result[0]) == as_list(mode)
+
+
+def test_parallel_mode_of_nothing():
+    mode, frequency = hash_map_mode.parallel_mode([], workers=2)
+    assert mode.length() == 0
+    assert frequency == 0
+    with pytest.raises(ValueError):
+        hash_map_mode.parallel_mode(['a'], partition='other')
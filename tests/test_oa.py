@@ -0,0 +1,82 @@
+import pytest
+
+import hash_map_oa
+from dict_model import check_against_dict, contents
+from hash_map_include import hash_function_1, hash_function_2, mix_hash
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_incremental_matches_dict(seed):
+    function = (hash_function_1, hash_function_2, mix_hash)[seed % 3]
+    m = hash_map_oa.HashMap(3, function, incremental=True)
+    check_against_dict(m, seed, operations=5000, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(1, 3 * len(expected) + 5)))
+
+
+def test_incremental_resize_is_spread_over_operations():
+    m = hash_map_oa.HashMap(11, mix_hash, incremental=True)
+    in_progress = 0
+    for i in range(5000):
+        m.put('key' + str(i), i)
+        if m._old_buckets is not None:
+            in_progress += 1
+            # Keys still in the old table are found as well
+            assert m.get('key0') == 0
+            assert m.get_size() == i + 1
+    assert in_progress > 0
+    assert contents(m) == {'key' + str(i): i for i in range(5000)}
+
+
+@pytest.mark.parametrize('options', [{}, {'incremental': True},
+                                     {'power_of_two': True}])
+def test_resize_reuses_cached_hashes(options):
+    calls = []
+
+    def function(key):
+        calls.append(key)
+        return mix_hash(key)
+
+    m = hash_map_oa.HashMap(3, function, **options)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    m.resize_table(5000)
+    # One call per put, none while growing or resizing
+    assert len(calls) == 1000
+    assert m.get('key999') == 999
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_churn_compacts_tombstones_in_place(incremental):
+    m = hash_map_oa.HashMap(53, mix_hash, incremental=incremental)
+    for i in range(20000):
+        m.put('key' + str(i), i)
+        if i >= 10:
+            m.remove('key' + str(i - 10))
+        # The load is checked before each insert, which may add one more
+        assert m.get_size() + m.get_tombstone_count() <= m.get_capacity() // 2 + 1
+    # Ten live keys never need more than the initial table
+    assert m.get_capacity() == 53
+    assert contents(m) == {'key' + str(i): i for i in range(19990, 20000)}
+
+
+def test_tombstones_are_reused():
+    m = hash_map_oa.HashMap(11, mix_hash)
+    for i in range(4):
+        m.put('key' + str(i), i)
+    m.remove('key1')
+    assert m.get_tombstone_count() == 1
+    assert m.empty_buckets() == m.get_capacity() - 3
+    m.put('key1', 'again')
+    assert m.get_tombstone_count() <= 1
+    assert m.get('key1') == 'again'
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+@pytest.mark.parametrize('function', [hash_function_1, mix_hash])
+def test_power_of_two_matches_dict(function, incremental):
+    m = hash_map_oa.HashMap(4, function, incremental=incremental,
+                            power_of_two=True)
+    check_against_dict(m, 6, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(1, 3 * len(expected) + 5)))
+    capacity = m.get_capacity()
+    assert capacity & (capacity - 1) == 0
@@ -0,0 +1,51 @@
+import pytest
+
+import hash_map_rh
+from dict_model import check_against_dict, contents
+from hash_map_include import hash_function_1, hash_function_2, mix_hash
+
+
+def check_invariant(m) -> None:
+    """Every key is stored at its recorded distance from home, and no key
+    is further from home than the key before it plus one."""
+    capacity = m.get_capacity()
+    for index in range(capacity):
+        distance = m._distances[index]
+        if distance == hash_map_rh._EMPTY:
+            continue
+        assert (m._hashes[index] + distance) % capacity == index
+        previous = m._distances[index - 1]
+        assert distance <= previous + 1
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_dict(seed):
+    function = (hash_function_1, hash_function_2, mix_hash)[seed % 3]
+    max_load = (0.5, 0.875, 0.95)[seed % 3]
+    m = hash_map_rh.HashMap(3, function, max_load)
+    check_against_dict(m, seed, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(0, 3 * len(expected) + 5)))
+    assert m.table_load() <= max_load
+    check_invariant(m)
+
+
+def test_backward_shift_keeps_invariant():
+    m = hash_map_rh.HashMap(97, hash_function_2)
+    for i in range(80):
+        m.put('key' + str(i), i)
+    for i in range(0, 80, 3):
+        m.remove('key' + str(i))
+        check_invariant(m)
+    assert contents(m) == {'key' + str(i): i for i in range(80) if i % 3}
+
+
+def test_max_probe_length_stays_short():
+    m = hash_map_rh.HashMap(11, mix_hash)
+    for i in range(20000):
+        m.put('key' + str(i), i)
+    assert m.max_probe_length() < 40
+
+
+def test_invalid_max_load():
+    with pytest.raises(ValueError):
+        hash_map_rh.HashMap(11, mix_hash, 1.0)
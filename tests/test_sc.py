@@ -0,0 +1,153 @@
+import itertools
+import random
+
+import pytest
+
+import hash_map_sc
+from dict_model import check_against_dict, contents
+from hash_map_include import (SortedBucket, UNTREEIFY_THRESHOLD, hash_function_1,
+                              hash_function_2, mix_hash)
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'power_of_two': True},
+    {'growth_factor': 1.5, 'shrink_load': 0.25},
+    {'max_load': None},
+])
+@pytest.mark.parametrize('function', [hash_function_1, hash_function_2, mix_hash])
+def test_matches_dict(function, options):
+    m = hash_map_sc.HashMap(7, function, **options)
+    check_against_dict(m, 5, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(1, 600)))
+
+
+@pytest.mark.parametrize('power_of_two', [False, True])
+def test_small_growth_factor_always_grows(power_of_two):
+    m = hash_map_sc.HashMap(11, mix_hash, growth_factor=1.05,
+                            power_of_two=power_of_two)
+    capacity = m.get_capacity()
+    for i in range(200):
+        m.put('key' + str(i), i)
+        assert m.table_load() <= 1.0
+        assert m.get_capacity() >= capacity
+        capacity = m.get_capacity()
+    # One resize per step up, not one per put
+    assert m.stats()['resizes'] < 60
+
+
+def test_shrink_only_to_smaller_capacity():
+    m = hash_map_sc.HashMap(11, mix_hash, growth_factor=1.05,
+                            shrink_load=0.5, power_of_two=True)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    resizes = m.stats()['resizes']
+    capacity = m.get_capacity()
+    for i in range(90):
+        m.remove('key' + str(i))
+    # 128 / 1.05 rounds back up to 128, so the table is never rehashed
+    assert m.get_capacity() == capacity
+    assert m.stats()['resizes'] == resizes
+
+
+def test_invalid_growth_factor():
+    with pytest.raises(ValueError):
+        hash_map_sc.HashMap(11, mix_hash, growth_factor=1.0)
+
+
+def test_empty_map():
+    m = hash_map_sc.HashMap(11, mix_hash)
+    assert m.get('missing') is None
+    assert m.remove('missing') is None
+    assert m.get_keys_and_values().length() == 0
+    assert m.empty_buckets() == m.get_capacity()
+
+
+def test_resize_reuses_cached_hashes():
+    calls = []
+
+    def function(key):
+        calls.append(key)
+        return mix_hash(key)
+
+    m = hash_map_sc.HashMap(3, function)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    m.resize_table(5000)
+    assert len(calls) == 1000
+    assert m.get('key999') == 999
+
+
+def test_load_stays_between_shrink_and_max_load():
+    m = hash_map_sc.HashMap(11, mix_hash, max_load=0.75, shrink_load=0.2)
+    for i in range(3000):
+        m.put('key' + str(i), i)
+        assert m.table_load() <= 0.75
+    for i in range(2990):
+        m.remove('key' + str(i))
+    assert m.get_capacity() < 100
+    assert all(m.get('key' + str(i)) == i for i in range(2990, 3000))
+
+
+def test_empty_bucket_count_is_maintained():
+    rng = random.Random(10)
+    m = hash_map_sc.HashMap(11, hash_function_1, shrink_load=0.2)
+    for i in range(3000):
+        key = 'k' + str(rng.randrange(300))
+        op = rng.randrange(6)
+        if op == 0:
+            m.put(key, i)
+        elif op == 1:
+            m.remove(key)
+        elif op == 2:
+            m.increment(key)
+        elif op == 3:
+            m.pop(key)
+        elif op == 4:
+            m.put_many([(key + str(j), j) for j in range(rng.randrange(5))])
+        elif rng.random() < 0.05:
+            m.resize_table(rng.randrange(1, 400))
+        counted = sum(m._buckets[index].length() == 0
+                      for index in range(m.get_capacity()))
+        assert m.empty_buckets() == counted
+    m.clear()
+    assert m.empty_buckets() == m.get_capacity()
+
+
+def anagrams(count: int) -> list:
+    """Distinct keys that all share one hash_function_1 hash."""
+    return [''.join(key) for key in itertools.islice(
+        itertools.permutations('abcdefgh'), count)]
+
+
+def test_long_chains_are_treeified_and_restored():
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    keys = anagrams(200)
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    index = hash_function_1(keys[0]) % m.get_capacity()
+    assert isinstance(m._buckets[index], SortedBucket)
+    assert all(m.get(key) == i for i, key in enumerate(keys))
+    assert m.get('hgfedcbaa') is None
+
+    for key in keys[UNTREEIFY_THRESHOLD:]:
+        m.remove(key)
+    index = hash_function_1(keys[0]) % m.get_capacity()
+    assert not isinstance(m._buckets[index], SortedBucket)
+    assert contents(m) == {key: i for i, key in enumerate(keys[:UNTREEIFY_THRESHOLD])}
+
+
+def test_colliding_keys_match_dict():
+    keys = anagrams(300)
+    rng = random.Random(14)
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    expected = {}
+    for i in range(5000):
+        key = rng.choice(keys)
+        if rng.random() < 0.6:
+            m.put(key, i)
+            expected[key] = i
+        else:
+            assert m.pop(key) == expected.pop(key, None)
+        assert m.get_size() == len(expected)
+    assert contents(m) == expected
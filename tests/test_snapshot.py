@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from dict_model import contents
+from hash_map_include import hash_function_1, make_seeded_hash, mix_hash
+
+
+MAP_CLASSES = [hash_map_sc.HashMap, hash_map_oa.HashMap]
+
+
+def filled_map(map_class, function=mix_hash, **options):
+    rng = random.Random(20)
+    m = map_class(11, function, **options)
+    for i in range(2000):
+        key = 'k' + str(rng.randrange(800))
+        if rng.random() < 0.7:
+            m.put(key, [i, key])
+        else:
+            m.remove(key)
+    return m
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+@pytest.mark.parametrize('options', [{}, {'power_of_two': True}])
+def test_round_trip(tmp_path, map_class, options):
+    m = filled_map(map_class, **options)
+    path = str(tmp_path / 'map.snapshot')
+    m.save(path)
+    loaded = map_class.load(path)
+    assert contents(loaded) == contents(m)
+    assert loaded.get_capacity() == m.get_capacity()
+    if map_class is hash_map_sc.HashMap:
+        assert str(loaded) == str(m)
+    loaded.put('new', 1)
+    assert loaded.get('new') == 1
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+def test_round_trip_of_empty_map(tmp_path, map_class):
+    path = str(tmp_path / 'map.snapshot')
+    map_class(11, hash_function_1).save(path)
+    loaded = map_class.load(path)
+    assert loaded.get_size() == 0
+    assert loaded.get('missing') is None
+
+
+def test_sorted_buckets_survive(tmp_path):
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    # Anagrams share a hash under hash_function_1 and fill one chain
+    for key in ('abcdefgh', 'bacdefgh', 'cabdefgh', 'dabcefgh', 'eabcdfgh',
+                'fabcdegh', 'gabcdefh', 'habcdefg', 'hgfedcba', 'ghfedcba'):
+        m.put(key, key)
+    path = str(tmp_path / 'map.snapshot')
+    m.save(path)
+    assert str(hash_map_sc.HashMap.load(path)) == str(m)
+
+
+@pytest.mark.parametrize('map_class', MAP_CLASSES)
+def test_unregistered_function_must_match(tmp_path, map_class):
+    function = make_seeded_hash(b'first')
+    m = filled_map(map_class, function)
+    path = str(tmp_path / 'map.snapshot')
+    m.save(path)
+
+    with pytest.raises(ValueError):
+        map_class.load(path)
+    with pytest.raises(ValueError):
+        map_class.load(path, make_seeded_hash(b'second'))
+    with pytest.raises(ValueError):
+        map_class.load(path, hash_function_1)
+    assert contents(map_class.load(path, function)) == contents(m)
+
+
+def test_registered_function_must_match(tmp_path):
+    m = filled_map(hash_map_oa.HashMap, mix_hash)
+    path = str(tmp_path / 'map.snapshot')
+    m.save(path)
+    with pytest.raises(ValueError):
+        hash_map_oa.HashMap.load(path, hash_function_1)
+
+
+def test_corrupt_and_mismatched_files(tmp_path):
+    path = tmp_path / 'map.snapshot'
+    filled_map(hash_map_sc.HashMap).save(str(path))
+
+    with pytest.raises(ValueError):
+        hash_map_oa.HashMap.load(str(path))
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        hash_map_sc.HashMap.load(str(path))
+
+    path.write_bytes(bytes(data[:20]))
+    with pytest.raises(ValueError):
+        hash_map_sc.HashMap.load(str(path))
@@ -0,0 +1,42 @@
+import pytest
+
+import hash_map_soa
+from dict_model import check_against_dict, contents
+from hash_map_include import hash_function_1, hash_function_2, mix_hash
+
+
+def resize_anywhere(m, rng, expected):
+    # Includes capacities below the size and ones leaving the table over
+    # half full, which resize_table must grow past
+    m.resize_table(rng.randrange(0, 2 * len(expected) + 3))
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_matches_dict(seed):
+    function = (hash_function_1, hash_function_2, mix_hash)[seed % 3]
+    m = hash_map_soa.HashMap((1, 5, 11)[seed % 3], function)
+    check_against_dict(m, seed, resize=resize_anywhere)
+    assert m.table_load() < 0.5 or m.get_size() == 0
+
+
+def test_resize_keeps_load_below_half():
+    m = hash_map_soa.HashMap(53, mix_hash)
+    for i in range(20):
+        m.put('key' + str(i), i)
+    m.resize_table(23)
+    assert m.get_capacity() > 38
+    assert all(m.get('key' + str(i)) == i for i in range(20))
+    assert m.get('missing') is None
+
+
+def test_clear_and_empty_map():
+    m = hash_map_soa.HashMap(11, mix_hash)
+    assert m.get('missing') is None
+    m.remove('missing')
+    for i in range(30):
+        m.put('key' + str(i), i)
+    m.clear()
+    assert m.get_size() == 0
+    assert contents(m) == {}
+    m.put('again', 1)
+    assert m.get('again') == 1
@@ -0,0 +1,82 @@
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from hash_map_include import hash_function_1, mix_hash
+
+
+def test_oa_stats_leaves_resize_in_progress():
+    m = hash_map_oa.HashMap(11, mix_hash, incremental=True)
+    i = 0
+    while m._old_buckets is None or m._migrate_index == 0:
+        m.put('key' + str(i), i)
+        i += 1
+
+    migrate_index = m._migrate_index
+    stats = m.stats(sample=None, max_probes=None)
+    assert m._old_buckets is not None
+    assert m._migrate_index == migrate_index
+    # Every key is found exactly once, in the active or the old table
+    assert sum(stats['hit']['histogram'].values()) == m.get_size()
+    assert 0.8 < stats['skew'] < 1.2
+
+
+def test_oa_stats_caps_probe_walks():
+    m = hash_map_oa.HashMap(11, hash_function_1)
+    for i in range(5000):
+        m.put('key' + str(i), i)
+    stats = m.stats(sample=None, max_probes=8)
+    assert stats['miss']['max'] <= 8
+    assert stats['hit']['max'] <= 8
+    assert stats['truncated'] > 0
+    assert m.stats(sample=None, max_probes=None)['truncated'] == 0
+
+
+def test_stats_of_empty_maps():
+    for m in (hash_map_sc.HashMap(11, mix_hash), hash_map_oa.HashMap(11, mix_hash)):
+        stats = m.stats()
+        assert stats['size'] == 0
+        assert stats['hit']['mean'] == 0.0
+        assert stats['skew'] == 0.0
+
+
+def test_stats_measure_every_key_when_not_sampled():
+    for m in (hash_map_sc.HashMap(11, mix_hash), hash_map_oa.HashMap(11, mix_hash)):
+        for i in range(500):
+            m.put('key' + str(i), i)
+        stats = m.stats(sample=None)
+        assert sum(stats['hit']['histogram'].values()) == 500
+        assert stats['sampled_buckets'] == m.get_capacity()
+
+
+def test_skew_separates_good_and_bad_hash_functions():
+    for map_class in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        good, bad = map_class(11, mix_hash), map_class(11, hash_function_1)
+        for i in range(5000):
+            good.put('key' + str(i), i)
+            bad.put('key' + str(i), i)
+        assert 0.8 < good.stats(sample=None)['skew'] < 1.2
+        assert bad.stats(sample=None)['skew'] > 20
+
+
+def test_sc_stats_count_sorted_buckets_and_resizes():
+    m = hash_map_sc.HashMap(11, hash_function_1)
+    for i in range(2000):
+        m.put('key' + str(i), i)
+    stats = m.stats(sample=None)
+    assert stats['sorted_buckets'] > 0
+    assert stats['resizes'] > 0
+    assert stats['resize_seconds'] > 0
+    # Binary search keeps hits short even in long chains
+    assert stats['hit']['max'] <= 12
+
+
+def test_oa_stats_rejects_empty_probe_walks():
+    m = hash_map_oa.HashMap(11, mix_hash)
+    m.put('key', 1)
+    for max_probes in (0, -1):
+        with pytest.raises(ValueError):
+            m.stats(max_probes=max_probes)
+    stats = m.stats(sample=None, max_probes=1)
+    assert stats['miss']['max'] == 1
+    assert stats['hit']['histogram'] == {1: 1}
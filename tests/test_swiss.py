@@ -0,0 +1,51 @@
+import pytest
+
+import hash_map_swiss
+from dict_model import check_against_dict, contents
+from hash_map_include import hash_function_1, hash_function_2, mix_hash
+
+
+def check_control_bytes(m) -> None:
+    """Control bytes agree with the size and deleted counts, and every full
+    slot holds the tag of its key's hash."""
+    control = m._control
+    full = [index for index in range(m.get_capacity()) if control[index] < 0x80]
+    assert len(full) == m.get_size()
+    assert control.count(hash_map_swiss._DELETED) == m._deleted
+    for index in full:
+        assert m._split(m._hashes[index])[1] == control[index]
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+@pytest.mark.parametrize('function', [hash_function_1, hash_function_2, mix_hash])
+def test_matches_dict(function, vectorized):
+    if vectorized:
+        pytest.importorskip('numpy')
+    m = hash_map_swiss.HashMap(1, function, vectorized=vectorized)
+    check_against_dict(m, 12, operations=4000, resize=lambda m, rng, expected:
+                       m.resize_table(rng.randrange(0, 3 * len(expected) + 5)))
+    check_control_bytes(m)
+    assert m.get_capacity() % hash_map_swiss.GROUP_SIZE == 0
+
+
+def test_churn_reuses_deleted_slots():
+    m = hash_map_swiss.HashMap(64, mix_hash)
+    for i in range(20000):
+        m.put('key' + str(i), i)
+        if i >= 20:
+            m.remove('key' + str(i - 20))
+    assert m.get_capacity() == 64
+    check_control_bytes(m)
+    assert contents(m) == {'key' + str(i): i for i in range(19980, 20000)}
+
+
+def test_clear_and_empty_map():
+    m = hash_map_swiss.HashMap(16, mix_hash)
+    assert m.get('missing') is None
+    m.remove('missing')
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.clear()
+    assert m.get_size() == 0
+    assert m.empty_buckets() == m.get_capacity()
+    check_control_bytes(m)
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+import hash_map_oa
+import hash_map_sc
+from dict_model import contents
+from hash_map_include import hash_function_1, mix_hash
+
+
+MAKERS = [
+    lambda: hash_map_sc.HashMap(3, hash_function_1),
+    lambda: hash_map_sc.HashMap(3, mix_hash, power_of_two=True),
+    lambda: hash_map_oa.HashMap(3, hash_function_1),
+    lambda: hash_map_oa.HashMap(3, mix_hash, incremental=True),
+]
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_upserts_match_dict(make_map):
+    rng = random.Random(15)
+    m = make_map()
+    expected = {}
+    for i in range(4000):
+        key = 'k' + str(rng.randrange(300))
+        op = rng.randrange(5)
+        if op == 0:
+            delta = rng.randrange(-3, 4)
+            expected[key] = expected.get(key, 0) + delta
+            assert m.increment(key, delta) == expected[key]
+        elif op == 1:
+            assert m.setdefault(key, i) == expected.setdefault(key, i)
+        elif op == 2:
+            expected[key] = expected.get(key, 0) * 2 + 1
+            assert m.update_with(key, lambda value: value * 2 + 1, 0) == expected[key]
+        elif op == 3:
+            assert m.pop(key, 'absent') == expected.pop(key, 'absent')
+        else:
+            m.put(key, i)
+            expected[key] = i
+        assert m.get_size() == len(expected)
+    assert contents(m) == expected
+
+
+@pytest.mark.parametrize('make_map', MAKERS)
+def test_upserts_hash_once(make_map):
+    m = make_map()
+    calls = []
+    function = m._hash_function
+    m._hash_function = lambda key: calls.append(key) or function(key)
+    m.increment('a')
+    m.setdefault('b', 1)
+    m.update_with('a', str)
+    m.pop('b')
+    assert calls == ['a', 'b', 'a', 'b']
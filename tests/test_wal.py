@@ -0,0 +1,104 @@
+import os
+import random
+
+import pytest
+
+import hash_map_oa
+import hash_map_wal
+from dict_model import contents
+from hash_map_include import mix_hash
+
+
+def apply_random(m, expected: dict, seed: int, operations: int = 1000) -> None:
+    rng = random.Random(seed)
+    for i in range(operations):
+        key = 'k' + str(rng.randrange(200))
+        op = rng.random()
+        if op < 0.5:
+            m.put(key, [i, key])
+            expected[key] = [i, key]
+        elif op < 0.7:
+            m.remove(key)
+            expected.pop(key, None)
+        elif op < 0.8:
+            assert m.pop(key, 'absent') == expected.pop(key, 'absent')
+        elif op < 0.999:
+            m.increment('count:' + key)
+            expected['count:' + key] = expected.get('count:' + key, 0) + 1
+        else:
+            m.clear()
+            expected.clear()
+
+
+@pytest.mark.parametrize('map_class', [None, hash_map_oa.HashMap])
+@pytest.mark.parametrize('compact_every', [None, 50])
+def test_replay_restores_map(tmp_path, map_class, compact_every):
+    path = str(tmp_path / 'map.log')
+    expected = {}
+    with hash_map_wal.HashMap(path, mix_hash, sync_every=0,
+                              compact_every=compact_every,
+                              map_class=map_class) as m:
+        apply_random(m, expected, 22)
+        assert contents(m) == expected
+    if compact_every is not None:
+        assert os.path.exists(path + '.snapshot')
+
+    with hash_map_wal.HashMap(path, mix_hash, sync_every=0,
+                              compact_every=compact_every,
+                              map_class=map_class) as m:
+        assert contents(m) == expected
+        apply_random(m, expected, 23)
+    with hash_map_wal.HashMap(path, mix_hash, map_class=map_class) as m:
+        assert contents(m) == expected
+
+
+def test_torn_record_is_cut_off(tmp_path):
+    path = str(tmp_path / 'map.log')
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        for i in range(10):
+            m.put('key' + str(i), i)
+    length = os.path.getsize(path)
+    with open(path, 'r+b') as file:
+        file.truncate(length - 3)
+
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        assert contents(m) == {'key' + str(i): i for i in range(9)}
+        m.put('after', 'tear')
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        assert m.get('after') == 'tear'
+        assert m.get_size() == 10
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path = str(tmp_path / 'map.log')
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        for i in range(10):
+            m.put('key' + str(i), i)
+    with open(path, 'r+b') as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last[0] ^ 0xFF]))
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        assert m.get_size() == 9
+        assert m.get('key9') is None
+
+
+def test_compaction_empties_log(tmp_path):
+    path = str(tmp_path / 'map.log')
+    with hash_map_wal.HashMap(path, mix_hash, compact_every=None) as m:
+        for i in range(100):
+            m.put('key' + str(i % 10), i)
+        m.compact()
+        assert os.path.getsize(path) == 0
+        assert contents(m) == {'key' + str(i): 90 + i for i in range(10)}
+    with hash_map_wal.HashMap(path, mix_hash) as m:
+        assert contents(m) == {'key' + str(i): 90 + i for i in range(10)}
+
+
+def test_invalid_options(tmp_path):
+    path = str(tmp_path / 'map.log')
+    with pytest.raises(ValueError):
+        hash_map_wal.HashMap(path, sync_every=-1)
+    with pytest.raises(ValueError):
+        hash_map_wal.HashMap(path, compact_every=0)